@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+
+from fastapi import Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import get_async_db, get_db
+from app.services.data_versions import get_month_versions, make_etag
+from app.services.month_locks import is_month_locked, locked_months
+from app.services.reference_data import get_reference_data
+
+LOCKED_MONTH_MAX_AGE = int(os.getenv("LOCKED_MONTH_MAX_AGE", "86400"))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def conditional_get(request: Request, response: Response, etag: str, locked: bool = False) -> dict[str, str]:
+    cache_control = f"private, max-age={LOCKED_MONTH_MAX_AGE}" if locked else "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
+def _month_version(db: Session, year: int, month: int) -> int:
+    return get_month_versions(db, year, month).get((year, month), 0)
+
+
+def _year_is_locked(db: Session, year: int) -> bool:
+    locked = locked_months(db)
+    return all((year, month) in locked for month in range(1, 13))
+
+
+async def year_summary_etag(
+    year: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> dict[str, str]:
+    versions = await db.run_sync(get_month_versions, year)
+    locked = await db.run_sync(_year_is_locked, year)
+    etag = make_etag("summary-year", request.url.path, year, sorted(versions.items()))
+    return conditional_get(request, response, etag, locked=locked)
+
+
+def _category_names(db: Session) -> list[tuple[int, str]]:
+    return sorted(get_reference_data(db).category_names.items())
+
+
+def _reference_names(db: Session) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    refs = get_reference_data(db)
+    return sorted(refs.account_names.items()), sorted(refs.category_names.items())
+
+
+async def category_matrix_etag(
+    year: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> dict[str, str]:
+    versions = await db.run_sync(get_month_versions, year)
+    names = await db.run_sync(_category_names)
+    locked = await db.run_sync(_year_is_locked, year)
+    etag = make_etag("category-matrix", year, sorted(versions.items()), names)
+    return conditional_get(request, response, etag, locked=locked)
+
+
+async def month_summary_etag(
+    year: int, month: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> dict[str, str]:
+    version = await db.run_sync(_month_version, year, month)
+    locked = await db.run_sync(is_month_locked, year, month)
+    etag = make_etag("summary-month", year, month, version)
+    return conditional_get(request, response, etag, locked=locked)
+
+
+async def transactions_etag(
+    year: int,
+    month: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    q: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict[str, str]:
+    version = await db.run_sync(_month_version, year, month)
+    locked = await db.run_sync(is_month_locked, year, month)
+    # q also matches account and category names, which can be renamed without touching the month.
+    names = await db.run_sync(_reference_names) if q else None
+    etag = make_etag("transactions", year, month, version, limit, offset, q, names)
+    return conditional_get(request, response, etag, locked=locked)
+
+
+def export_etag(
+    request: Request,
+    response: Response,
+    year: int | None = None,
+    month: int | None = None,
+    db: Session = Depends(get_db),
+) -> dict[str, str]:
+    etag = make_etag("export", year, month, sorted(get_month_versions(db, year, month).items()), *_reference_names(db))
+    locked = year is not None and month is not None and (year, month) in locked_months(db)
+    return conditional_get(request, response, etag, locked=locked)
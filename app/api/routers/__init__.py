@@ -1,7 +1,9 @@
 from app.api.routers import (
     accounts,
+    analytics,
     categories,
     csv_io,
+    debug,
     liabilities,
     month_locks,
     monthly_balances,
@@ -11,8 +13,10 @@ from app.api.routers import (
 
 __all__ = [
     "accounts",
+    "analytics",
     "categories",
     "csv_io",
+    "debug",
     "liabilities",
     "month_locks",
     "monthly_balances",
@@ -5,18 +5,34 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Account, MonthlyBalance, Transaction
-from app.db.session import get_db
-from app.schemas import AccountCreate, AccountRead, AccountUpdate
+from app.db.models import Account
+from app.db.session import get_async_db, get_db
+from app.profiling import ProfiledRoute
+from app.schemas import AccountBalanceRead, AccountCreate, AccountRead, AccountUpdate
+from app.services.account_balances import list_account_balances
+from app.services.reference_cascades import delete_accounts
+from app.services.reference_data import invalidate_reference_data
 
-router = APIRouter(prefix="/api/accounts", tags=["accounts"])
+router = APIRouter(prefix="/api/accounts", tags=["accounts"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[AccountRead])
-def list_accounts(db: Session = Depends(get_db)) -> list[Account]:
-    return db.scalars(select(Account).order_by(Account.is_active.desc(), Account.name.asc())).all()
+async def list_accounts(db: AsyncSession = Depends(get_async_db)) -> list[Account]:
+    return (await db.scalars(select(Account).order_by(Account.is_active.desc(), Account.name.asc()))).all()
+
+
+@router.get("/balances", response_model=list[AccountBalanceRead])
+async def list_balances(
+    year: int | None = None, month: int | None = None, db: AsyncSession = Depends(get_async_db)
+) -> list[dict[str, Any]]:
+    if month is not None and year is None:
+        raise HTTPException(status_code=422, detail="month requires year")
+    if month is not None and not 1 <= month <= 12:
+        raise HTTPException(status_code=422, detail="month must be 1-12")
+    return await db.run_sync(list_account_balances, year, month)
 
 
 @router.post("", response_model=AccountRead)
@@ -28,6 +44,7 @@ def create_account(payload: AccountCreate, db: Session = Depends(get_db)) -> Acc
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=409, detail="account name must be unique") from exc
+    invalidate_reference_data(db)
     db.refresh(account)
     return account
 
@@ -50,6 +67,7 @@ def import_accounts_json(payload: Any, db: Session = Depends(get_db)) -> dict[st
             existing_names.add(name)
             created += 1
         db.commit()
+        invalidate_reference_data(db)
         return {"created": created}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"invalid json payload: {exc}") from exc
@@ -69,6 +87,7 @@ def update_account(account_id: int, payload: AccountUpdate, db: Session = Depend
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=409, detail="account name must be unique") from exc
+    invalidate_reference_data(db)
 
     db.refresh(account)
     return account
@@ -76,15 +95,8 @@ def update_account(account_id: int, payload: AccountUpdate, db: Session = Depend
 
 @router.delete("/{account_id}")
 def delete_account(account_id: int, db: Session = Depends(get_db)) -> dict[str, str]:
-    account = db.get(Account, account_id)
-    if not account:
+    if not delete_accounts(db, [account_id]):
         raise HTTPException(status_code=404, detail="account not found")
-    for tx in db.scalars(select(Transaction).where(Transaction.account_id == account_id)).all():
-        tx.account_id = None
-    for tx in db.scalars(select(Transaction).where(Transaction.to_account_id == account_id)).all():
-        tx.to_account_id = None
-    for bal in db.scalars(select(MonthlyBalance).where(MonthlyBalance.account_id == account_id)).all():
-        db.delete(bal)
-    db.delete(account)
     db.commit()
+    invalidate_reference_data(db)
     return {"status": "ok"}
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.profiling import ProfiledRoute
+from app.schemas import DailySpendRead, ExpenseOutlierRead, MonthlyDeltaRead
+from app.services.analytics import daily_spend, expense_outliers, get_year_arrays, monthly_deltas
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"], route_class=ProfiledRoute)
+
+
+@router.get("/{year}/daily", response_model=DailySpendRead)
+async def analytics_daily(
+    year: int, window: int = Query(default=7, ge=1, le=90), db: AsyncSession = Depends(get_async_db)
+) -> dict[str, Any]:
+    arrays = await db.run_sync(get_year_arrays, year)
+    return daily_spend(arrays, window)
+
+
+@router.get("/{year}/monthly", response_model=MonthlyDeltaRead)
+async def analytics_monthly(year: int, db: AsyncSession = Depends(get_async_db)) -> dict[str, Any]:
+    arrays = await db.run_sync(get_year_arrays, year)
+    return monthly_deltas(arrays)
+
+
+@router.get("/{year}/outliers", response_model=list[ExpenseOutlierRead])
+async def analytics_outliers(
+    year: int, threshold: float = Query(default=3.5, gt=0), db: AsyncSession = Depends(get_async_db)
+) -> list[dict[str, Any]]:
+    arrays = await db.run_sync(get_year_arrays, year)
+    return expense_outliers(arrays, threshold)
@@ -3,18 +3,22 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Category, Transaction
-from app.db.session import get_db
+from app.db.models import Category
+from app.db.session import get_async_db, get_db
+from app.profiling import ProfiledRoute
 from app.schemas import CategoryCreate, CategoryRead, CategoryUpdate
+from app.services.reference_cascades import delete_categories
+from app.services.reference_data import invalidate_reference_data
 
-router = APIRouter(prefix="/api/categories", tags=["categories"])
+router = APIRouter(prefix="/api/categories", tags=["categories"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[CategoryRead])
-def list_categories(db: Session = Depends(get_db)) -> list[Category]:
-    return db.scalars(select(Category).order_by(Category.is_active.desc(), Category.name.asc())).all()
+async def list_categories(db: AsyncSession = Depends(get_async_db)) -> list[Category]:
+    return (await db.scalars(select(Category).order_by(Category.is_active.desc(), Category.name.asc()))).all()
 
 
 @router.post("", response_model=CategoryRead)
@@ -26,6 +30,7 @@ def create_category(payload: CategoryCreate, db: Session = Depends(get_db)) -> C
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=409, detail="category name must be unique") from exc
+    invalidate_reference_data(db)
     db.refresh(category)
     return category
 
@@ -44,6 +49,7 @@ def update_category(category_id: int, payload: CategoryUpdate, db: Session = Dep
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=409, detail="category name must be unique") from exc
+    invalidate_reference_data(db)
 
     db.refresh(category)
     return category
@@ -51,11 +57,8 @@ def update_category(category_id: int, payload: CategoryUpdate, db: Session = Dep
 
 @router.delete("/{category_id}")
 def delete_category(category_id: int, db: Session = Depends(get_db)) -> dict[str, str]:
-    category = db.get(Category, category_id)
-    if not category:
+    if not delete_categories(db, [category_id]):
         raise HTTPException(status_code=404, detail="category not found")
-    for tx in db.scalars(select(Transaction).where(Transaction.category_id == category_id)).all():
-        tx.category_id = None
-    db.delete(category)
     db.commit()
+    invalidate_reference_data(db)
     return {"status": "ok"}
@@ -1,46 +1,73 @@
 from __future__ import annotations
 
-import csv
-import io
-from datetime import date
-
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.api.conditional import export_etag
 from app.db.session import get_db
-from app.services.month_locks import is_month_locked
-from app.services.csv_io import export_transactions_csv, import_transactions_csv
+from app.profiling import ProfiledRoute, profiled_iterator
+from app.schemas import ImportJobRead
+from app.services.csv_io import MonthLockedError, import_transactions_stream, iter_transactions_csv
+from app.services import import_jobs
 
-router = APIRouter(prefix="/api/csv", tags=["csv"])
+router = APIRouter(prefix="/api/csv", tags=["csv"], route_class=ProfiledRoute)
 
 
 @router.post("/import")
-async def import_csv(file: UploadFile = File(...), db: Session = Depends(get_db)) -> dict[str, int]:
-    data = await file.read()
+def import_csv(file: UploadFile = File(...), db: Session = Depends(get_db)) -> dict[str, int]:
     try:
-        reader = csv.DictReader(io.StringIO(data.decode("utf-8")))
-        for row in reader:
-            tx_date = date.fromisoformat((row.get("date") or "").strip())
-            if is_month_locked(db, tx_date.year, tx_date.month):
-                raise HTTPException(status_code=423, detail=f"month is locked: {tx_date.year}-{tx_date.month:02d}")
-        count = import_transactions_csv(db, data)
+        count = import_transactions_stream(db, file.file)
+    except MonthLockedError as exc:
+        db.rollback()
+        raise HTTPException(status_code=423, detail=str(exc)) from exc
     except Exception as exc:
-        if isinstance(exc, HTTPException):
-            raise
+        db.rollback()
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"imported": count}
 
 
+@router.post("/import-jobs", response_model=ImportJobRead, status_code=202)
+def create_import_job(file: UploadFile = File(...)) -> dict:
+    job = import_jobs.submit_import_job(file.file, file.filename)
+    return job.to_dict()
+
+
+@router.get("/import-jobs", response_model=list[ImportJobRead])
+def list_import_jobs() -> list[dict]:
+    return [job.to_dict() for job in import_jobs.list_import_jobs()]
+
+
+@router.get("/import-jobs/{job_id}", response_model=ImportJobRead)
+def get_import_job(job_id: str) -> dict:
+    job = import_jobs.get_import_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="import job not found")
+    return job.to_dict()
+
+
+@router.delete("/import-jobs/{job_id}", response_model=ImportJobRead)
+def cancel_import_job(job_id: str) -> dict:
+    job = import_jobs.cancel_import_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="import job not found")
+    return job.to_dict()
+
+
 @router.get("/export")
-def export_csv(year: int | None = None, month: int | None = None, db: Session = Depends(get_db)) -> StreamingResponse:
-    content = export_transactions_csv(db, year=year, month=month)
+def export_csv(
+    year: int | None = None,
+    month: int | None = None,
+    cache_headers: dict[str, str] = Depends(export_etag),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    chunks = iter_transactions_csv(db, year=year, month=month)
     filename = "transactions.csv"
     if year and month:
         filename = f"transactions_{year}_{month:02d}.csv"
 
     return StreamingResponse(
-        iter([content.encode("utf-8")]),
+        profiled_iterator(chunk.encode("utf-8") for chunk in chunks),
         media_type="text/csv",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **cache_headers},
     )
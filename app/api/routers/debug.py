@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Query
+
+from app.db.slow_queries import slow_query_log
+from app.profiling import ProfiledRoute
+from app.schemas import SlowQueryRead
+
+router = APIRouter(prefix="/api/debug", tags=["debug"], route_class=ProfiledRoute)
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryRead])
+async def list_slow_queries(limit: int = Query(default=50, ge=1, le=1000)) -> list[dict[str, Any]]:
+    return slow_query_log.recent(limit)
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries() -> dict[str, str]:
+    slow_query_log.clear()
+    return {"status": "ok"}
@@ -3,18 +3,21 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import Liability
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.profiling import ProfiledRoute
 from app.schemas import LiabilityCreate, LiabilityRead, LiabilityUpdate
+from app.services.reference_data import invalidate_reference_data
 
-router = APIRouter(prefix="/api/liabilities", tags=["liabilities"])
+router = APIRouter(prefix="/api/liabilities", tags=["liabilities"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[LiabilityRead])
-def list_liabilities(db: Session = Depends(get_db)) -> list[Liability]:
-    return db.scalars(select(Liability).order_by(Liability.is_active.desc(), Liability.name.asc())).all()
+async def list_liabilities(db: AsyncSession = Depends(get_async_db)) -> list[Liability]:
+    return (await db.scalars(select(Liability).order_by(Liability.is_active.desc(), Liability.name.asc()))).all()
 
 
 @router.post("", response_model=LiabilityRead)
@@ -26,6 +29,7 @@ def create_liability(payload: LiabilityCreate, db: Session = Depends(get_db)) ->
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=409, detail="liability name must be unique") from exc
+    invalidate_reference_data(db)
     db.refresh(liability)
     return liability
 
@@ -44,6 +48,7 @@ def update_liability(liability_id: int, payload: LiabilityUpdate, db: Session =
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=409, detail="liability name must be unique") from exc
+    invalidate_reference_data(db)
 
     db.refresh(liability)
     return liability
@@ -56,4 +61,5 @@ def delete_liability(liability_id: int, db: Session = Depends(get_db)) -> dict[s
         raise HTTPException(status_code=404, detail="liability not found")
     db.delete(liability)
     db.commit()
+    invalidate_reference_data(db)
     return {"status": "ok"}
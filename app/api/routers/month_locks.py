@@ -4,10 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.profiling import ProfiledRoute
 from app.schemas import MonthlyLockRead, MonthlyLockUpsert
 from app.services.month_locks import is_month_locked, set_month_lock
 
-router = APIRouter(prefix="/api/month-lock", tags=["month-lock"])
+router = APIRouter(prefix="/api/month-lock", tags=["month-lock"], route_class=ProfiledRoute)
 
 
 @router.get("/{year}/{month}", response_model=MonthlyLockRead)
@@ -6,10 +6,13 @@ from sqlalchemy.orm import Session
 
 from app.db.models import Account, MonthlyBalance
 from app.db.session import get_db
+from app.profiling import ProfiledRoute
 from app.schemas import MonthlyBalanceRead, MonthlyBalanceUpsert
+from app.services.account_balances import record_opening_changes
+from app.services.data_versions import bump_month_versions
 from app.services.month_locks import is_month_locked
 
-router = APIRouter(prefix="/api/monthly-balance", tags=["monthly-balance"])
+router = APIRouter(prefix="/api/monthly-balance", tags=["monthly-balance"], route_class=ProfiledRoute)
 
 
 @router.get("/{year}/{month}", response_model=list[MonthlyBalanceRead])
@@ -33,7 +36,7 @@ def upsert_monthly_balance(
         raise HTTPException(status_code=422, detail="month must be 1-12")
     if not db.get(Account, payload.account_id):
         raise HTTPException(status_code=404, detail="account not found")
-    if is_month_locked(db, year, month):
+    if is_month_locked(db, year, month, fresh=True):
         raise HTTPException(status_code=423, detail="month is locked")
 
     balance = db.scalar(
@@ -56,6 +59,8 @@ def upsert_monthly_balance(
     else:
         balance.opening_balance = payload.opening_balance
         balance.note = payload.note
+    record_opening_changes(db, [(payload.account_id, year, month)])
+    bump_month_versions(db, [(year, month)])
 
     db.commit()
     db.refresh(balance)
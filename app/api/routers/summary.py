@@ -1,22 +1,45 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import category_matrix_etag, month_summary_etag, year_summary_etag
+from app.db.session import get_async_db
+from app.profiling import ProfiledRoute
+from app.schemas import CategoryMatrixRead, MonthlySummaryItemRead, MonthlySummaryRead, SummaryRead
+from app.services.summary import (
+    get_month_summary,
+    get_year_category_matrix,
+    get_year_month_summaries,
+    get_year_summary,
+)
+
+router = APIRouter(prefix="/api/summary", tags=["summary"], route_class=ProfiledRoute)
+
+
+@router.get("/year/{year}", response_model=SummaryRead, dependencies=[Depends(year_summary_etag)])
+async def summary_year(year: int, db: AsyncSession = Depends(get_async_db)) -> dict[str, int]:
+    return await db.run_sync(get_year_summary, year)
 
-from app.db.session import get_db
-from app.schemas import MonthlySummaryRead, SummaryRead
-from app.services.summary import get_month_summary, get_year_summary
 
-router = APIRouter(prefix="/api/summary", tags=["summary"])
+@router.get(
+    "/year/{year}/months", response_model=list[MonthlySummaryItemRead], dependencies=[Depends(year_summary_etag)]
+)
+async def summary_year_months(year: int, db: AsyncSession = Depends(get_async_db)) -> list[dict[str, int]]:
+    return await db.run_sync(get_year_month_summaries, year)
 
 
-@router.get("/year/{year}", response_model=SummaryRead)
-def summary_year(year: int, db: Session = Depends(get_db)) -> dict[str, int]:
-    return get_year_summary(db, year)
+@router.get(
+    "/year/{year}/categories", response_model=CategoryMatrixRead, dependencies=[Depends(category_matrix_etag)]
+)
+async def summary_year_categories(year: int, db: AsyncSession = Depends(get_async_db)) -> dict[str, Any]:
+    return await db.run_sync(get_year_category_matrix, year)
 
 
-@router.get("/month/{year}/{month}", response_model=MonthlySummaryRead)
-def summary_month(year: int, month: int, db: Session = Depends(get_db)) -> dict[str, int]:
+@router.get("/month/{year}/{month}", response_model=MonthlySummaryRead, dependencies=[Depends(month_summary_etag)])
+async def summary_month(year: int, month: int, db: AsyncSession = Depends(get_async_db)) -> dict[str, int]:
     if not 1 <= month <= 12:
         raise HTTPException(status_code=422, detail="month must be 1-12")
-    return get_month_summary(db, year, month)
+    return await db.run_sync(get_month_summary, year, month)
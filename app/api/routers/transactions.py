@@ -1,65 +1,96 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Account, Category, Transaction
-from app.db.session import get_db
-from app.schemas import TransactionCreate, TransactionRead, TransactionUpdate
+from app.api.conditional import transactions_etag
+from app.db.models import Transaction
+from app.db.session import get_async_db, get_db
+from app.profiling import ProfiledRoute
+from app.schemas import (
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionPage,
+    TransactionRead,
+    TransactionSearchHit,
+    TransactionUpdate,
+)
 from app.services.month_locks import is_month_locked
-from app.services.transactions import ValidationError, validate_transaction_input
-
-router = APIRouter(prefix="/api/transactions", tags=["transactions"])
+from app.services.monthly_totals import record_transaction_changes, snapshot
+from app.services.search import search_transactions
+from app.services.transactions import (
+    TRANSACTION_BATCH_LIMIT,
+    ValidationError,
+    insert_transaction_batch,
+    list_month_transactions,
+    missing_reference,
+    page_transactions,
+    validate_transaction_batch,
+    validate_transaction_input,
+)
+
+router = APIRouter(prefix="/api/transactions", tags=["transactions"], route_class=ProfiledRoute)
 
 
 def _validate_refs(db: Session, payload: TransactionCreate | TransactionUpdate) -> None:
-    if payload.account_id and not db.get(Account, payload.account_id):
-        raise HTTPException(status_code=404, detail="account not found")
-    if payload.to_account_id and not db.get(Account, payload.to_account_id):
-        raise HTTPException(status_code=404, detail="to_account not found")
-    if payload.category_id and not db.get(Category, payload.category_id):
-        raise HTTPException(status_code=404, detail="category not found")
+    missing = missing_reference(db, payload)
+    if missing:
+        raise HTTPException(status_code=404, detail=missing)
 
 
-@router.get("", response_model=list[TransactionRead])
-def list_transactions(
+@router.get("", response_model=list[TransactionRead], dependencies=[Depends(transactions_etag)])
+async def list_transactions(
     year: int,
     month: int,
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
     q: str | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> list[Transaction]:
     if not 1 <= month <= 12:
         raise HTTPException(status_code=422, detail="month must be 1-12")
+    return await db.run_sync(list_month_transactions, year, month, limit, offset, q)
+
 
-    query = select(Transaction).where(Transaction.year == year, Transaction.month == month)
-    if q:
-        like = f"%{q}%"
-        query = query.outerjoin(Account, Transaction.account_id == Account.id).outerjoin(
-            Category, Transaction.category_id == Category.id
-        ).where(
-            or_(
-                Transaction.description.ilike(like),
-                Transaction.note.ilike(like),
-                Transaction.category_free.ilike(like),
-                Account.name.ilike(like),
-                Category.name.ilike(like),
-            )
-        )
-
-    query = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit).offset(offset)
-    return db.scalars(query).all()
+@router.get("/page", response_model=TransactionPage)
+async def page_transactions_api(
+    year: int | None = None,
+    month: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    q: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    try:
+        return await db.run_sync(page_transactions, year, month, date_from, date_to, cursor, limit, q)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.get("/search", response_model=list[TransactionSearchHit])
+async def search_transactions_api(
+    q: str = Query(min_length=1),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[TransactionSearchHit]:
+    hits = await db.run_sync(search_transactions, q, date_from, date_to, limit, offset)
+    return [TransactionSearchHit.model_validate(tx).model_copy(update={"rank": score}) for tx, score in hits]
 
 
 @router.post("", response_model=TransactionRead)
 def create_transaction(payload: TransactionCreate, db: Session = Depends(get_db)) -> Transaction:
     if payload.date > date.today():
         raise HTTPException(status_code=422, detail="future date is not allowed")
-    if is_month_locked(db, payload.date.year, payload.date.month):
+    if is_month_locked(db, payload.date.year, payload.date.month, fresh=True):
         raise HTTPException(status_code=423, detail="month is locked")
     try:
         validate_transaction_input(payload)
@@ -70,11 +101,26 @@ def create_transaction(payload: TransactionCreate, db: Session = Depends(get_db)
     tx_date = payload.date
     tx = Transaction(**payload.model_dump(), year=tx_date.year, month=tx_date.month, user_id=1)
     db.add(tx)
+    record_transaction_changes(db, added=[snapshot(tx)])
     db.commit()
     db.refresh(tx)
     return tx
 
 
+@router.post("/batch", response_model=TransactionBatchResult)
+def create_transactions_batch(
+    items: list[dict[str, Any]] = Body(...), db: Session = Depends(get_db)
+) -> dict[str, Any]:
+    if len(items) > TRANSACTION_BATCH_LIMIT:
+        raise HTTPException(status_code=413, detail=f"at most {TRANSACTION_BATCH_LIMIT} items per batch")
+    rows, errors = validate_transaction_batch(db, items)
+    if errors:
+        raise HTTPException(status_code=422, detail={"rejected": len(errors), "errors": errors})
+    ids = insert_transaction_batch(db, rows)
+    db.commit()
+    return {"created": len(ids), "ids": ids}
+
+
 @router.put("/{transaction_id}", response_model=TransactionRead)
 def update_transaction(
     transaction_id: int, payload: TransactionUpdate, db: Session = Depends(get_db)
@@ -83,15 +129,16 @@ def update_transaction(
     if not tx:
         raise HTTPException(status_code=404, detail="transaction not found")
 
+    before = snapshot(tx)
     merged = tx
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(merged, key, value)
     if merged.date and merged.date > date.today():
         raise HTTPException(status_code=422, detail="future date is not allowed")
-    if is_month_locked(db, tx.year, tx.month):
+    if is_month_locked(db, tx.year, tx.month, fresh=True):
         raise HTTPException(status_code=423, detail="month is locked")
     if merged.date and (merged.date.year != tx.year or merged.date.month != tx.month):
-        if is_month_locked(db, merged.date.year, merged.date.month):
+        if is_month_locked(db, merged.date.year, merged.date.month, fresh=True):
             raise HTTPException(status_code=423, detail="target month is locked")
 
     try:
@@ -104,6 +151,7 @@ def update_transaction(
         merged.year = merged.date.year
         merged.month = merged.date.month
 
+    record_transaction_changes(db, removed=[before], added=[snapshot(merged)])
     db.commit()
     db.refresh(merged)
     return merged
@@ -114,8 +162,9 @@ def delete_transaction(transaction_id: int, db: Session = Depends(get_db)) -> di
     tx = db.get(Transaction, transaction_id)
     if not tx:
         raise HTTPException(status_code=404, detail="transaction not found")
-    if is_month_locked(db, tx.year, tx.month):
+    if is_month_locked(db, tx.year, tx.month, fresh=True):
         raise HTTPException(status_code=423, detail="month is locked")
+    record_transaction_changes(db, removed=[snapshot(tx)])
     db.delete(tx)
     db.commit()
     return {"status": "ok"}
@@ -0,0 +1,4 @@
+from app.bench.datagen import DatasetSpec, generate_dataset
+from app.bench.suite import bench_cases, run_suite
+
+__all__ = ["DatasetSpec", "bench_cases", "generate_dataset", "run_suite"]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import calendar
+import random
+from datetime import date
+from typing import Any, NamedTuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models import DEFAULT_CATEGORIES, Account, Category, MonthlyBalance, Transaction, User
+from app.services.account_balances import rebuild_account_balances
+from app.services.data_versions import bump_month_versions
+from app.services.monthly_totals import rebuild_monthly_totals
+
+INSERT_CHUNK = 5000
+ACCOUNT_KINDS = (("銀行", "bank"), ("現金", "cash"), ("カード", "card"), ("電子マネー", "emoney"))
+TYPE_WEIGHTS = {"expense": 90, "income": 3, "transfer": 5, "adjust": 2}
+# Relative frequency and median amount (yen) of everyday expenses per category.
+CATEGORY_PROFILES = {
+    "食費": (30, 900),
+    "日用品": (12, 700),
+    "交通": (12, 400),
+    "娯楽": (8, 2500),
+    "交際": (6, 4000),
+    "服飾": (4, 5000),
+    "医療": (3, 2000),
+    "教育": (2, 3000),
+    "通信": (1, 3000),
+    "光熱費": (1, 6000),
+    "税・保険": (1, 10000),
+    "その他": (4, 1500),
+}
+MERCHANTS = {
+    "食費": ("スーパー", "コンビニ", "ランチ", "パン屋", "弁当"),
+    "日用品": ("ドラッグストア", "ホームセンター", "100円ショップ"),
+    "交通": ("電車", "バス", "タクシー", "駐車場"),
+    "娯楽": ("映画", "書籍", "ゲーム", "カラオケ"),
+    "交際": ("飲み会", "贈り物", "結婚祝い"),
+    "服飾": ("衣料品店", "靴", "クリーニング"),
+    "医療": ("病院", "薬局", "歯科"),
+    "教育": ("参考書", "オンライン講座"),
+    "通信": ("携帯電話", "インターネット"),
+    "光熱費": ("電気", "ガス", "水道"),
+    "税・保険": ("住民税", "医療保険"),
+    "その他": ("手数料", "寄付", "雑費"),
+}
+FREE_CATEGORIES = ("ペット", "趣味", "旅行")
+
+
+class DatasetSpec(NamedTuple):
+    years: int = 3
+    accounts: int = 3
+    per_month: int = 100
+    seed: int = 42
+    end_year: int | None = None
+
+    @property
+    def first_year(self) -> int:
+        return self.last_year - self.years + 1
+
+    @property
+    def last_year(self) -> int:
+        return self.end_year if self.end_year is not None else date.today().year - 1
+
+
+def _account_rows(count: int) -> list[dict[str, Any]]:
+    rows = []
+    for index in range(count):
+        name, kind = ACCOUNT_KINDS[index % len(ACCOUNT_KINDS)]
+        suffix = "" if index < len(ACCOUNT_KINDS) else str(index // len(ACCOUNT_KINDS) + 1)
+        rows.append({"name": f"{name}{suffix}", "kind": kind, "is_active": True, "user_id": 1})
+    return rows
+
+
+def _ensure_refs(db: Session, spec: DatasetSpec) -> tuple[list[int], dict[str, int]]:
+    if db.get(User, 1) is None:
+        db.add(User(id=1, name="default"))
+        db.flush()
+    accounts = []
+    for row in _account_rows(spec.accounts):
+        account = db.query(Account).filter_by(name=row["name"]).first()
+        if account is None:
+            account = Account(**row)
+            db.add(account)
+            db.flush()
+        accounts.append(account.id)
+    categories = {}
+    for name in DEFAULT_CATEGORIES:
+        category = db.query(Category).filter_by(name=name).first()
+        if category is None:
+            category = Category(name=name, is_fixed=True, is_active=True, user_id=1)
+            db.add(category)
+            db.flush()
+        categories[name] = category.id
+    return accounts, categories
+
+
+class _MonthGenerator:
+    def __init__(self, spec: DatasetSpec, accounts: list[int], categories: dict[str, int]) -> None:
+        self.rng = random.Random(spec.seed)
+        self.spec = spec
+        self.accounts = accounts
+        self.categories = categories
+        self.types = list(TYPE_WEIGHTS)
+        self.type_weights = list(TYPE_WEIGHTS.values())
+        self.category_names = list(CATEGORY_PROFILES)
+        self.category_weights = [weight for weight, _ in CATEGORY_PROFILES.values()]
+
+    def _row(self, day: date, tx_type: str, amount: int, account_id: int | None, **extra: Any) -> dict[str, Any]:
+        return {
+            "date": day,
+            "year": day.year,
+            "month": day.month,
+            "type": tx_type,
+            "amount": max(int(amount), 1),
+            "account_id": account_id,
+            "to_account_id": None,
+            "category_id": None,
+            "category_free": None,
+            "description": None,
+            "note": None,
+            "user_id": 1,
+            **extra,
+        }
+
+    def _expense(self, day: date, account_id: int) -> dict[str, Any]:
+        rng = self.rng
+        name = rng.choices(self.category_names, self.category_weights)[0]
+        median = CATEGORY_PROFILES[name][1]
+        amount = round(rng.lognormvariate(0, 0.6) * median, -1)
+        extra: dict[str, Any] = {"description": rng.choice(MERCHANTS[name])}
+        if rng.random() < 0.05:
+            extra["category_free"] = rng.choice(FREE_CATEGORIES)
+        else:
+            extra["category_id"] = self.categories[name]
+        return self._row(day, "expense", amount, account_id, **extra)
+
+    def month(self, year: int, month: int) -> list[dict[str, Any]]:
+        rng = self.rng
+        days = calendar.monthrange(year, month)[1]
+        bank = self.accounts[0]
+        rows = [
+            self._row(
+                date(year, month, min(25, days)),
+                "income",
+                280000 + rng.randrange(0, 40000, 1000),
+                bank,
+                description="給与",
+            ),
+            self._row(
+                date(year, month, min(27, days)),
+                "expense",
+                85000,
+                bank,
+                category_id=self.categories["家賃"],
+                description="家賃",
+            ),
+        ]
+        for account_id in self.accounts:
+            for _ in range(self.spec.per_month):
+                day = date(year, month, rng.randint(1, days))
+                tx_type = rng.choices(self.types, self.type_weights)[0]
+                if tx_type == "expense":
+                    rows.append(self._expense(day, account_id))
+                elif tx_type == "income":
+                    rows.append(
+                        self._row(
+                            day,
+                            "income",
+                            round(rng.lognormvariate(0, 1) * 3000, -1),
+                            account_id,
+                            description="臨時収入",
+                        )
+                    )
+                elif tx_type == "transfer" and len(self.accounts) > 1:
+                    target = rng.choice([other for other in self.accounts if other != account_id])
+                    rows.append(
+                        self._row(
+                            day,
+                            "transfer",
+                            rng.randrange(1000, 50000, 1000),
+                            account_id,
+                            to_account_id=target,
+                            description="口座間移動",
+                        )
+                    )
+                else:
+                    rows.append(self._row(day, "adjust", rng.randrange(10, 2000, 10), account_id, note="残高調整"))
+        rows.sort(key=lambda row: row["date"])
+        return rows
+
+
+def generate_dataset(db: Session, spec: DatasetSpec = DatasetSpec()) -> dict[str, int]:
+    accounts, categories = _ensure_refs(db, spec)
+    generator = _MonthGenerator(spec, accounts, categories)
+    pending: list[dict[str, Any]] = []
+    count = 0
+    for year in range(spec.first_year, spec.last_year + 1):
+        for month in range(1, 13):
+            pending.extend(generator.month(year, month))
+            if len(pending) >= INSERT_CHUNK:
+                db.execute(insert(Transaction), pending)
+                count += len(pending)
+                pending = []
+    if pending:
+        db.execute(insert(Transaction), pending)
+        count += len(pending)
+
+    opened = set(
+        db.scalars(
+            select(MonthlyBalance.account_id).where(MonthlyBalance.year == spec.first_year, MonthlyBalance.month == 1)
+        )
+    )
+    db.add_all(
+        MonthlyBalance(
+            year=spec.first_year,
+            month=1,
+            account_id=account_id,
+            opening_balance=generator.rng.randrange(10000, 1000000, 1000),
+            user_id=1,
+        )
+        for account_id in accounts
+        if account_id not in opened
+    )
+    db.flush()
+    bump_month_versions(
+        db, [(year, month) for year in range(spec.first_year, spec.last_year + 1) for month in range(1, 13)]
+    )
+    rebuild_monthly_totals(db)
+    rebuild_account_balances(db)
+    db.commit()
+    return {"transactions": count, "accounts": len(accounts), "categories": len(categories)}
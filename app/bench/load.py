@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.bench.suite import percentile
+from app.db.models import Account, Category
+from app.web.auth_cookie import AUTH_COOKIE_NAME
+
+DEFAULT_MIX = {"month_page": 80, "transaction_post": 15, "csv_export": 5}
+
+
+class LoadTargets(NamedTuple):
+    year: int
+    account_ids: list[int]
+    category_ids: list[int]
+
+
+class Scenario(NamedTuple):
+    method: str
+    route: str
+    expected: int
+    build: Callable[[random.Random, LoadTargets], dict[str, Any]]
+
+
+def _month_page(rng: random.Random, targets: LoadTargets) -> dict[str, Any]:
+    return {"url": f"/month/{targets.year}/{rng.randint(1, 12)}"}
+
+
+def _transaction_post(rng: random.Random, targets: LoadTargets) -> dict[str, Any]:
+    data = {"day": rng.randint(1, 28), "type": "expense", "amount": rng.randrange(100, 5000, 10)}
+    if targets.account_ids:
+        data["account_id"] = rng.choice(targets.account_ids)
+    if targets.category_ids:
+        data["category_id"] = rng.choice(targets.category_ids)
+    data["description"] = "負荷試験"
+    return {"url": f"/month/{targets.year}/{rng.randint(1, 12)}/transactions", "data": data}
+
+
+def _csv_export(rng: random.Random, targets: LoadTargets) -> dict[str, Any]:
+    return {"url": "/api/csv/export"}
+
+
+def _index_page(rng: random.Random, targets: LoadTargets) -> dict[str, Any]:
+    return {"url": "/", "params": {"year": targets.year}}
+
+
+def _month_summary(rng: random.Random, targets: LoadTargets) -> dict[str, Any]:
+    return {"url": f"/api/summary/month/{targets.year}/{rng.randint(1, 12)}"}
+
+
+def _transaction_search(rng: random.Random, targets: LoadTargets) -> dict[str, Any]:
+    q = rng.choice(("コンビニ", "スーパー", "ランチ", "電車"))
+    return {"url": "/api/transactions", "params": {"year": targets.year, "month": rng.randint(1, 12), "q": q}}
+
+
+SCENARIOS = {
+    "month_page": Scenario("GET", "/month/{year}/{month}", 200, _month_page),
+    "transaction_post": Scenario("POST", "/month/{year}/{month}/transactions", 303, _transaction_post),
+    "csv_export": Scenario("GET", "/api/csv/export", 200, _csv_export),
+    "index_page": Scenario("GET", "/", 200, _index_page),
+    "month_summary": Scenario("GET", "/api/summary/month/{year}/{month}", 200, _month_summary),
+    "transaction_search": Scenario("GET", "/api/transactions", 200, _transaction_search),
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario: {name}")
+        try:
+            mix[name] = int(weight) if sep else 1
+        except ValueError as exc:
+            raise ValueError(f"invalid weight for {name}: {weight}") from exc
+        if mix[name] < 0:
+            raise ValueError(f"invalid weight for {name}: {weight}")
+    if not any(mix.values()):
+        raise ValueError("scenario mix is empty")
+    return mix
+
+
+def load_targets(db: Session, year: int) -> LoadTargets:
+    accounts = list(db.scalars(select(Account.id).where(Account.is_active.is_(True)).order_by(Account.id)))
+    categories = list(db.scalars(select(Category.id).where(Category.is_active.is_(True)).order_by(Category.id)))
+    return LoadTargets(year, accounts, categories)
+
+
+def _stats(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3) if ordered else 0.0,
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3) if ordered else 0.0,
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def run_load(
+    app: Any,
+    targets: LoadTargets,
+    mix: dict[str, int] = DEFAULT_MIX,
+    concurrency: int = 16,
+    requests: int = 1000,
+    seed: int = 0,
+    request_timeout: float = 30.0,
+) -> dict[str, Any]:
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors = dict.fromkeys(names, 0)
+    remaining = requests
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://load", limits=limits, cookies={AUTH_COOKIE_NAME: "1"}
+    ) as client:
+
+        async def worker(index: int) -> None:
+            nonlocal remaining
+            rng = random.Random(seed * 1000003 + index)
+            while remaining > 0:
+                remaining -= 1
+                name = rng.choices(names, weights)[0]
+                scenario = SCENARIOS[name]
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(
+                        client.request(scenario.method, **scenario.build(rng, targets)), request_timeout
+                    )
+                except TimeoutError:
+                    response = None
+                latencies[name].append(time.perf_counter() - started)
+                if response is None or response.status_code != scenario.expected:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    routes = {
+        name: {
+            "method": SCENARIOS[name].method,
+            "route": SCENARIOS[name].route,
+            **_stats(latencies[name], errors[name], elapsed),
+        }
+        for name in names
+    }
+    overall = _stats([value for values in latencies.values() for value in values], sum(errors.values()), elapsed)
+    return {"elapsed_seconds": round(elapsed, 3), "total": overall, "routes": routes}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.services.csv_io import export_transactions_csv, import_transactions_csv, iter_transactions_csv
+from app.services.summary import get_month_summary, get_year_summary
+from app.services.transactions import list_month_transactions, page_transactions
+from app.web.routes import _month_context
+
+DEFAULT_QUERY = "コンビニ"
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _timings(run: Callable[[], Any], repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(samples)
+    return {
+        "runs": repeat,
+        "first_ms": round(samples[0], 3),
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+def _import_rolled_back(engine: Engine, content: bytes) -> int:
+    with engine.connect() as conn:
+        trans = conn.begin()
+        # pysqlite defers BEGIN until the first write, which would make the import's SAVEPOINT the outermost
+        # transaction and its RELEASE a real commit.
+        conn.exec_driver_sql("BEGIN")
+        try:
+            with Session(bind=conn, join_transaction_mode="create_savepoint") as db:
+                return import_transactions_csv(db, content)
+        finally:
+            trans.rollback()
+
+
+def bench_cases(engine: Engine, year: int, month: int, query: str = DEFAULT_QUERY) -> dict[str, Callable[[], Any]]:
+    session_factory = sessionmaker(bind=engine, autoflush=False, future=True)
+
+    def in_session(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Callable[[], Any]:
+        def run() -> Any:
+            with session_factory() as db:
+                return fn(db, *args, **kwargs)
+
+        return run
+
+    with session_factory() as db:
+        content = export_transactions_csv(db, year=year).encode("utf-8")
+
+    return {
+        "month_summary": in_session(get_month_summary, year, month),
+        "year_summary": in_session(get_year_summary, year),
+        "list_transactions": in_session(list_month_transactions, year, month),
+        "list_transactions_q": in_session(list_month_transactions, year, month, q=query),
+        "page_transactions_q": in_session(page_transactions, year=year, q=query),
+        "month_context": in_session(_month_context, year, month),
+        "csv_export": in_session(lambda db: sum(len(chunk) for chunk in iter_transactions_csv(db, year=year))),
+        "csv_import": lambda: _import_rolled_back(engine, content),
+    }
+
+
+def run_suite(
+    engine: Engine,
+    year: int,
+    month: int,
+    repeat: int = 5,
+    query: str = DEFAULT_QUERY,
+    only: list[str] | None = None,
+) -> dict[str, dict[str, float]]:
+    cases = bench_cases(engine, year, month, query=query)
+    return {name: _timings(run, repeat) for name, run in cases.items() if not only or name in only}
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+FTS_TABLE = "transactions_fts"
+
+_ROW_VALUES = """
+    new.id,
+    new.description,
+    new.note,
+    new.category_free,
+    (SELECT name FROM accounts WHERE id = new.account_id),
+    (SELECT name FROM categories WHERE id = new.category_id)
+"""
+
+FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, note, category_free, account_name, category_name,
+        tokenize = 'trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, description, note, category_free, account_name, category_name)
+        VALUES ({_ROW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_update
+    AFTER UPDATE OF description, note, category_free, account_id, category_id ON transactions BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE} (rowid, description, note, category_free, account_name, category_name)
+        VALUES ({_ROW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS accounts_fts_rename AFTER UPDATE OF name ON accounts BEGIN
+        UPDATE {FTS_TABLE} SET account_name = new.name
+        WHERE rowid IN (SELECT id FROM transactions WHERE account_id = new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS categories_fts_rename AFTER UPDATE OF name ON categories BEGIN
+        UPDATE {FTS_TABLE} SET category_name = new.name
+        WHERE rowid IN (SELECT id FROM transactions WHERE category_id = new.id);
+    END
+    """,
+]
+
+FTS_DROP = [
+    "DROP TRIGGER IF EXISTS categories_fts_rename",
+    "DROP TRIGGER IF EXISTS accounts_fts_rename",
+    "DROP TRIGGER IF EXISTS transactions_fts_delete",
+    "DROP TRIGGER IF EXISTS transactions_fts_update",
+    "DROP TRIGGER IF EXISTS transactions_fts_insert",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+FTS_POPULATE = f"""
+    INSERT INTO {FTS_TABLE} (rowid, description, note, category_free, account_name, category_name)
+    SELECT t.id, t.description, t.note, t.category_free, a.name, c.name
+    FROM transactions AS t
+    LEFT JOIN accounts AS a ON a.id = t.account_id
+    LEFT JOIN categories AS c ON c.id = t.category_id
+"""
+
+
+def create_search_index(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first()
+    for statement in FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        connection.exec_driver_sql(FTS_POPULATE)
+
+
+def drop_search_index(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in FTS_DROP:
+        connection.exec_driver_sql(statement)
+
+
+def rebuild_search_index(connection: Connection) -> int:
+    connection.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+    connection.exec_driver_sql(FTS_POPULATE)
+    return connection.exec_driver_sql(f"SELECT count(*) FROM {FTS_TABLE}").scalar_one()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
-from app.db.models import Category, DEFAULT_CATEGORIES, User
+from app.db.models import AccountBalance, Category, DEFAULT_CATEGORIES, MonthlyBalance, MonthlyTotal, Transaction, User
+from app.services.account_balances import rebuild_account_balances
 from app.services.auth import hash_password
+from app.services.monthly_totals import rebuild_monthly_totals
 
 
 def ensure_seed_data(db: Session) -> None:
@@ -26,3 +28,14 @@ def ensure_seed_data(db: Session) -> None:
             db.add(Category(name=name, is_fixed=True, is_active=True, user_id=1))
 
     db.commit()
+
+
+def ensure_rollups(db: Session) -> None:
+    # create_all adds missing rollup tables empty; fill them once so an existing database keeps its summaries.
+    has_transactions = db.scalar(select(exists().where(Transaction.id.isnot(None))))
+    if has_transactions and not db.scalar(select(exists().where(MonthlyTotal.tx_count > 0))):
+        rebuild_monthly_totals(db)
+    has_balances = has_transactions or db.scalar(select(exists().where(MonthlyBalance.id.isnot(None))))
+    if has_balances and not db.scalar(select(exists().where(AccountBalance.id.isnot(None)))):
+        rebuild_account_balances(db)
+    db.commit()
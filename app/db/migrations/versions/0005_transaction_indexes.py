@@ -0,0 +1,35 @@
+"""transaction indexes"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_transaction_indexes"
+down_revision = "0004_user_password_hash"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_transactions_year_month_date_id": ["year", "month", sa.text("date DESC"), sa.text("id DESC")],
+    "ix_transactions_year_month_type_amount": ["year", "month", "type", "amount"],
+    "ix_transactions_account_id": ["account_id"],
+    "ix_transactions_to_account_id": ["to_account_id"],
+    "ix_transactions_category_id": ["category_id"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {ix["name"] for ix in inspector.get_indexes("transactions")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "transactions", columns)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {ix["name"] for ix in inspector.get_indexes("transactions")}
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="transactions")
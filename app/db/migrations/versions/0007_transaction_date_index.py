@@ -0,0 +1,27 @@
+"""transaction date keyset index"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_transaction_date_index"
+down_revision = "0006_monthly_totals"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_transactions_date_id"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {ix["name"] for ix in inspector.get_indexes("transactions")}
+    if INDEX_NAME not in existing:
+        op.create_index(INDEX_NAME, "transactions", [sa.text("date DESC"), sa.text("id DESC")])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {ix["name"] for ix in inspector.get_indexes("transactions")}
+    if INDEX_NAME in existing:
+        op.drop_index(INDEX_NAME, table_name="transactions")
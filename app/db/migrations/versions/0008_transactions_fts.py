@@ -0,0 +1,18 @@
+"""transactions full-text search index"""
+
+from alembic import op
+
+from app.db.fts import create_search_index, drop_search_index
+
+revision = "0008_transactions_fts"
+down_revision = "0007_transaction_date_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    drop_search_index(op.get_bind())
@@ -0,0 +1,31 @@
+"""per-month data versions"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_month_versions"
+down_revision = "0008_transactions_fts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "month_versions" in inspector.get_table_names():
+        return
+    op.create_table(
+        "month_versions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.UniqueConstraint("year", "month", name="uq_month_versions"),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "month_versions" in inspector.get_table_names():
+        op.drop_table("month_versions")
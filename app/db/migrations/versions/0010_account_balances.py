@@ -0,0 +1,90 @@
+"""account month-end balance snapshots"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_account_balances"
+down_revision = "0009_month_versions"
+branch_labels = None
+depends_on = None
+
+MONTHS_SQL = """
+WITH legs AS (
+    SELECT account_id, year, month, CASE WHEN type = 'income' THEN amount ELSE -amount END AS amount
+    FROM transactions
+    WHERE type IN ('income', 'expense', 'transfer') AND account_id IS NOT NULL
+    UNION ALL
+    SELECT to_account_id, year, month, amount
+    FROM transactions
+    WHERE type = 'transfer' AND to_account_id IS NOT NULL
+),
+flows AS (
+    SELECT account_id, year, month, SUM(amount) AS net_flow, COUNT(*) AS tx_count
+    FROM legs
+    GROUP BY account_id, year, month
+),
+months AS (
+    SELECT account_id, year, month FROM flows
+    UNION
+    SELECT account_id, year, month FROM monthly_balances
+)
+"""
+
+# Each opening balance starts a new segment; the closing balance is that opening plus the running net flow.
+BACKFILL_SQL = f"""
+INSERT INTO account_balances (account_id, year, month, net_flow, tx_count, closing_balance)
+{MONTHS_SQL},
+segments AS (
+    SELECT
+        m.account_id,
+        m.year,
+        m.month,
+        COALESCE(f.net_flow, 0) AS net_flow,
+        COALESCE(f.tx_count, 0) AS tx_count,
+        b.opening_balance,
+        COUNT(b.id) OVER (PARTITION BY m.account_id ORDER BY m.year, m.month) AS segment
+    FROM months AS m
+    LEFT JOIN flows AS f ON f.account_id = m.account_id AND f.year = m.year AND f.month = m.month
+    LEFT JOIN monthly_balances AS b ON b.account_id = m.account_id AND b.year = m.year AND b.month = m.month
+)
+SELECT
+    account_id,
+    year,
+    month,
+    net_flow,
+    tx_count,
+    FIRST_VALUE(COALESCE(opening_balance, 0)) OVER running + SUM(net_flow) OVER running
+FROM segments
+WINDOW running AS (PARTITION BY account_id, segment ORDER BY year, month)
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "account_balances" not in inspector.get_table_names():
+        op.create_table(
+            "account_balances",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("account_id", sa.Integer(), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column("month", sa.Integer(), nullable=False),
+            sa.Column("net_flow", sa.Integer(), nullable=False),
+            sa.Column("tx_count", sa.Integer(), nullable=False),
+            sa.Column("closing_balance", sa.Integer(), nullable=False),
+            sa.UniqueConstraint("account_id", "year", "month", name="uq_account_balances_month"),
+        )
+    # create_all may already have made the table empty, so backfill whenever it is behind the transactions.
+    stored = bind.exec_driver_sql("SELECT COUNT(*) FROM account_balances").scalar_one()
+    expected = bind.exec_driver_sql(f"{MONTHS_SQL} SELECT COUNT(*) FROM months").scalar_one()
+    if stored >= expected:
+        return
+    op.execute("DELETE FROM account_balances")
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "account_balances" in inspector.get_table_names():
+        op.drop_table("account_balances")
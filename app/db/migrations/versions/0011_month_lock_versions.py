@@ -0,0 +1,28 @@
+"""month lock change marker"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_month_lock_versions"
+down_revision = "0010_account_balances"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "month_lock_versions" in inspector.get_table_names():
+        return
+    op.create_table(
+        "month_lock_versions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "month_lock_versions" in inspector.get_table_names():
+        op.drop_table("month_lock_versions")
@@ -2,9 +2,22 @@ from __future__ import annotations
 
 from datetime import UTC, date, datetime
 
-from sqlalchemy import Boolean, CheckConstraint, Date, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db.fts import create_search_index, drop_search_index
 from app.db.session import Base
 
 TRANSACTION_TYPES = ("income", "expense", "transfer", "adjust")
@@ -117,6 +130,74 @@ class Transaction(TimestampMixin, Base):
     category: Mapped[Category | None] = relationship("Category")
 
 
+Index(
+    "ix_transactions_year_month_date_id",
+    Transaction.year,
+    Transaction.month,
+    Transaction.date.desc(),
+    Transaction.id.desc(),
+)
+Index(
+    "ix_transactions_year_month_type_amount",
+    Transaction.year,
+    Transaction.month,
+    Transaction.type,
+    Transaction.amount,
+)
+Index("ix_transactions_date_id", Transaction.date.desc(), Transaction.id.desc())
+Index("ix_transactions_account_id", Transaction.account_id)
+Index("ix_transactions_to_account_id", Transaction.to_account_id)
+Index("ix_transactions_category_id", Transaction.category_id)
+
+
+class MonthlyTotal(Base):
+    __tablename__ = "monthly_totals"
+    __table_args__ = (
+        UniqueConstraint("year", "month", "type", "account_id", "category_id", name="uq_monthly_totals_key"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    type: Mapped[str] = mapped_column(String(20), nullable=False)
+    # 0 stands for "no account/category" so that the unique key also covers unassigned rows.
+    account_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    category_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class AccountBalance(Base):
+    __tablename__ = "account_balances"
+    __table_args__ = (UniqueConstraint("account_id", "year", "month", name="uq_account_balances_month"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    account_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    net_flow: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    closing_balance: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class MonthVersion(Base):
+    __tablename__ = "month_versions"
+    __table_args__ = (UniqueConstraint("year", "month", name="uq_month_versions"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class MonthLockVersion(Base):
+    # Single row bumped on every lock change so each process can cheaply tell whether its lock cache is current.
+    __tablename__ = "month_lock_versions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class Liability(TimestampMixin, Base):
     __tablename__ = "liabilities"
 
@@ -142,3 +223,13 @@ class Card(TimestampMixin, Base):
     closing_day: Mapped[int | None] = mapped_column(Integer)
     payment_day: Mapped[int | None] = mapped_column(Integer)
     note: Mapped[str | None] = mapped_column(Text)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw) -> None:
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw) -> None:
+    drop_search_index(connection)
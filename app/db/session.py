@@ -1,25 +1,64 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+from weakref import WeakKeyDictionary
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from app.db.query_counter import install_query_counter
+from app.db.slow_queries import SLOW_QUERY_MS, install_slow_query_log
+from app.db.storage import apply_storage_profile, engine_options, get_storage_profile
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./kakeibo.db")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+STORAGE_PROFILE = os.getenv("DB_STORAGE_PROFILE")
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, future=True, connect_args=connect_args)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+_engine_aliases: WeakKeyDictionary[Engine, Engine] = WeakKeyDictionary()
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def share_engine_caches(async_engine: AsyncEngine, engine: Engine) -> None:
+    _engine_aliases[async_engine.sync_engine] = engine
+
+
+def cache_engine(bind: Engine | Connection) -> Engine:
+    return _engine_aliases.get(bind.engine, bind.engine)
+
+
+def create_engines(url: str, async_url: str, profile: dict[str, Any]) -> tuple[Engine, AsyncEngine]:
+    engine = create_engine(url, future=True, **engine_options(url, profile))
+    async_engine = create_async_engine(async_url, **engine_options(async_url, profile))
+    for sync_engine in (engine, async_engine.sync_engine):
+        apply_storage_profile(sync_engine, profile)
+        install_query_counter(sync_engine)
+        if SLOW_QUERY_MS > 0:
+            install_slow_query_log(sync_engine)
+    share_engine_caches(async_engine, engine)
+    return engine, async_engine
+
+
+storage_profile = get_storage_profile(STORAGE_PROFILE)
+engine, async_engine = create_engines(DATABASE_URL, ASYNC_DATABASE_URL, storage_profile)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
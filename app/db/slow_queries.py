@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", str(Path(tempfile.gettempdir()) / "kakeibo_slow_queries.log"))
+SLOW_QUERY_LOG_BYTES = int(os.getenv("SLOW_QUERY_LOG_BYTES", str(1024 * 1024)))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "3"))
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))
+
+EXPLAIN_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+MAX_PARAMETER_SHAPES = 20
+# Virtual tables report "INDEX idxNum:idxStr"; FTS5 leaves both empty only when no constraint reaches the module.
+_VIRTUAL_INDEX = re.compile(r" VIRTUAL TABLE INDEX (\d+):(.*)$")
+
+_request_scope: ContextVar[dict | None] = ContextVar("slow_query_request_scope", default=None)
+
+
+@contextmanager
+def track_request(scope: dict) -> Iterator[None]:
+    token = _request_scope.set(scope)
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+def _shape(value: Any) -> str:
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: _shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        shapes = [_shape(value) for value in parameters[:MAX_PARAMETER_SHAPES]]
+        if len(parameters) > MAX_PARAMETER_SHAPES:
+            shapes.append(f"... {len(parameters) - MAX_PARAMETER_SHAPES} more")
+        return shapes
+    return _shape(parameters)
+
+
+def _is_full_scan(detail: str) -> bool:
+    if not detail.startswith("SCAN ") or " USING " in detail:
+        return False
+    virtual = _VIRTUAL_INDEX.search(detail)
+    return virtual is None or (virtual.group(1) == "0" and not virtual.group(2))
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    return [detail.split()[1] for detail in plan if _is_full_scan(detail)]
+
+
+def _explain(conn, statement: str, parameters: Any) -> list[str] | None:
+    if not statement.lstrip().upper().startswith(EXPLAIN_PREFIXES):
+        return None
+    # A raw DBAPI cursor keeps the EXPLAIN out of the engine events (and the per-request query counts).
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:
+        return [f"EXPLAIN failed: {exc}"]
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float,
+        path: str,
+        max_bytes: int,
+        backups: int,
+        buffer: int,
+        logger_name: str = "kakeibo.slow_queries",
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self._records: deque[dict[str, Any]] = deque(maxlen=buffer)
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(logger_name)
+        self._logger.propagate = False
+        if not self._logger.handlers:
+            if path:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(
+                    path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+            else:
+                handler = logging.NullHandler()
+            self._logger.addHandler(handler)
+            self._logger.setLevel(logging.WARNING)
+
+    def record(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._records.append(entry)
+        self._logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            records = list(reversed(self._records))
+        return records[:limit] if limit is not None else records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+slow_query_log = SlowQueryLog(
+    SLOW_QUERY_MS, SLOW_QUERY_LOG, SLOW_QUERY_LOG_BYTES, SLOW_QUERY_LOG_BACKUPS, SLOW_QUERY_BUFFER
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("slow_query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if elapsed < slow_query_log.threshold:
+        return
+
+    sample = parameters[0] if executemany and parameters else parameters
+    plan = _explain(conn, statement, sample)
+    scope = _request_scope.get()
+    slow_query_log.record(
+        {
+            "recorded_at": datetime.now().isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "parameters": parameter_shapes(sample),
+            "executemany": len(parameters) if executemany else None,
+            "method": scope.get("method") if scope else None,
+            "route": (getattr(scope.get("route"), "path", None) or scope.get("path")) if scope else None,
+            "plan": plan,
+            "full_scans": full_scans(plan or []),
+        }
+    )
+
+
+def _handle_error(context) -> None:
+    if context.execution_context is None or context.connection is None:
+        return
+    started = context.connection.info.get("slow_query_started")
+    if started:
+        started.pop()
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+STORAGE_PROFILES: dict[str, dict[str, Any]] = {
+    "durable": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "busy_timeout": 10000,
+            "foreign_keys": "ON",
+            "cache_size": -16000,
+            "temp_store": "DEFAULT",
+            "mmap_size": 0,
+        },
+        "cached_statements": 128,
+        "pool_size": 10,
+        "max_overflow": 10,
+    },
+    "balanced": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "foreign_keys": "ON",
+            "cache_size": -32000,
+            "temp_store": "MEMORY",
+            "mmap_size": 134217728,
+        },
+        "cached_statements": 256,
+        "pool_size": 20,
+        "max_overflow": 20,
+    },
+    "fast": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "busy_timeout": 5000,
+            "foreign_keys": "ON",
+            "cache_size": -65536,
+            "temp_store": "MEMORY",
+            "mmap_size": 268435456,
+        },
+        "cached_statements": 512,
+        "pool_size": 20,
+        "max_overflow": 20,
+    },
+}
+
+
+def get_storage_profile(name: str | None) -> dict[str, Any]:
+    key = (name or DEFAULT_STORAGE_PROFILE).strip().lower()
+    if key not in STORAGE_PROFILES:
+        raise ValueError(f"unknown storage profile: {name} (choose from {', '.join(STORAGE_PROFILES)})")
+    return STORAGE_PROFILES[key]
+
+
+def _is_memory_url(url: str) -> bool:
+    return url in {"sqlite://", "sqlite:///:memory:"} or "mode=memory" in url
+
+
+def engine_options(url: str, profile: dict[str, Any]) -> dict[str, Any]:
+    if not url.startswith("sqlite"):
+        return {}
+    connect_args = {"check_same_thread": False, "cached_statements": profile["cached_statements"]}
+    if _is_memory_url(url):
+        return {"connect_args": connect_args}
+    return {
+        "connect_args": connect_args,
+        "pool_size": profile["pool_size"],
+        "max_overflow": profile["max_overflow"],
+        "pool_pre_ping": False,
+    }
+
+
+def apply_storage_profile(engine: Engine, profile: dict[str, Any]) -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = dict(profile["pragmas"])
+    if _is_memory_url(str(engine.url)):
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
@@ -1,21 +1,28 @@
 from __future__ import annotations
 
+import time
+
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routers import (
     accounts,
+    analytics,
     categories,
     csv_io,
+    debug,
     liabilities,
     month_locks,
     monthly_balances,
     summary,
     transactions,
 )
-from app.db.init_db import ensure_seed_data
+from app import metrics, profiling
+from app.db.init_db import ensure_rollups, ensure_seed_data
+from app.db.query_counter import track_queries
 from app.db.session import Base, SessionLocal, engine
+from app.db.slow_queries import track_request
 from app.web.auth_cookie import get_auth_user_id
 from app.web.routes import router as web_router
 
@@ -29,15 +36,24 @@ app.include_router(monthly_balances.router)
 app.include_router(liabilities.router)
 app.include_router(csv_io.router)
 app.include_router(month_locks.router)
+app.include_router(analytics.router)
+app.include_router(debug.router)
 app.include_router(web_router)
 
 app.mount("/static", StaticFiles(directory="app/web/static"), name="static")
 
 
+@app.middleware("http")
+async def profile_request(request, call_next):
+    if not profiling.wants_profile(request):
+        return await call_next(request)
+    return await profiling.profile_request(request, call_next)
+
+
 @app.middleware("http")
 async def auth_guard(request, call_next):
     path = request.url.path
-    public_paths = {"/login", "/health", "/openapi.json", "/docs", "/redoc", "/favicon.ico"}
+    public_paths = {"/login", "/health", "/metrics", "/openapi.json", "/docs", "/redoc", "/favicon.ico"}
     if path in public_paths or path.startswith("/static"):
         return await call_next(request)
 
@@ -50,13 +66,37 @@ async def auth_guard(request, call_next):
     return RedirectResponse(url=f"/login?next={path}", status_code=302)
 
 
+@app.middleware("http")
+async def instrument_request(request, call_next):
+    metrics.note_threadpool_pressure()
+    started = time.perf_counter()
+    with track_queries() as stats, track_request(request.scope):
+        response = await call_next(request)
+    metrics.record_request(
+        request.method,
+        metrics.route_label(request.scope),
+        response.status_code,
+        time.perf_counter() - started,
+        stats.count,
+        stats.duration,
+    )
+    response.headers["X-Query-Count"] = str(stats.count)
+    return response
+
+
 @app.on_event("startup")
 def startup() -> None:
     Base.metadata.create_all(bind=engine)
     with SessionLocal() as db:
         ensure_seed_data(db)
+        ensure_rollups(db)
 
 
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
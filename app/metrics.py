@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable
+
+import anyio
+import anyio.to_thread
+
+from app.services.auth import password_hasher
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[LabelValues, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 3))
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels: str) -> float:
+        state = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return state[-1] if state else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for bound, hits in zip((*self.buckets, math.inf), state[:-2]):
+                cumulative += hits
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(state[-1])}")
+        return lines
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def samples(self) -> list[str]:
+        return [f"{self.name} {_format_value(self.callback())}"]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram | Gauge] = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> Gauge:
+        metric = Gauge(name, documentation, callback)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests_total = REGISTRY.counter(
+    "kakeibo_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = REGISTRY.histogram(
+    "kakeibo_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+)
+db_statements_per_request = REGISTRY.histogram(
+    "kakeibo_db_statements_per_request",
+    "SQL statements executed per request.",
+    ("route",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+db_duration_per_request_seconds = REGISTRY.histogram(
+    "kakeibo_db_duration_per_request_seconds", "Time spent in SQL per request.", ("route",)
+)
+db_statements_total = REGISTRY.counter("kakeibo_db_statements_total", "SQL statements executed.", ("route",))
+threadpool_saturated_total = REGISTRY.counter(
+    "kakeibo_threadpool_saturated_total", "Requests that arrived while every threadpool slot was busy."
+)
+
+login_duration_seconds = REGISTRY.histogram(
+    "kakeibo_login_duration_seconds", "Login latency including password verification.", ("outcome",)
+)
+login_rejected_total = REGISTRY.counter(
+    "kakeibo_login_rejected_total", "Logins rejected because the password hasher queue was full."
+)
+REGISTRY.gauge(
+    "kakeibo_password_hash_pending", "Password verifications running or queued.", lambda: password_hasher.pending
+)
+REGISTRY.gauge(
+    "kakeibo_password_hash_capacity", "Password verifications admitted before rejecting.", lambda: password_hasher.capacity
+)
+
+
+def _threadpool_limiter() -> anyio.CapacityLimiter | None:
+    try:
+        return anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return None
+
+
+def threadpool_busy() -> float:
+    limiter = _threadpool_limiter()
+    return limiter.borrowed_tokens if limiter else 0
+
+
+def threadpool_limit() -> float:
+    limiter = _threadpool_limiter()
+    return limiter.total_tokens if limiter else 0
+
+
+REGISTRY.gauge("kakeibo_threadpool_busy_threads", "Threadpool slots in use for sync routes.", threadpool_busy)
+REGISTRY.gauge("kakeibo_threadpool_max_threads", "Threadpool size for sync routes.", threadpool_limit)
+
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def record_request(method: str, route: str, status: int, elapsed: float, query_count: int, query_time: float) -> None:
+    http_requests_total.inc(method=method, route=route, status=str(status))
+    http_request_duration_seconds.observe(elapsed, method=method, route=route)
+    db_statements_per_request.observe(query_count, route=route)
+    db_duration_per_request_seconds.observe(query_time, route=route)
+    db_statements_total.inc(query_count, route=route)
+
+
+def note_threadpool_pressure() -> None:
+    limiter = _threadpool_limiter()
+    if limiter is not None and limiter.borrowed_tokens >= limiter.total_tokens:
+        threadpool_saturated_total.inc()
+
+
+def record_login(outcome: str, elapsed: float) -> None:
+    login_duration_seconds.observe(elapsed, outcome=outcome)
+    if outcome == "rejected":
+        login_rejected_total.inc()
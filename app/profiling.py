@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+import anyio.to_thread
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app import metrics
+from app.db.query_counter import current_query_stats, track_queries
+
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "").lower() in {"1", "true", "yes", "on"}
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", Path(tempfile.gettempdir()) / "kakeibo_profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_TOP_FUNCTIONS = 30
+
+T = TypeVar("T")
+
+_PROFILE_ID = re.compile(r"^[0-9]{8}-[0-9]{12}-[0-9a-f]{4}$")
+# Self time is attributed to the first matching path fragment, so the more specific prefixes come first.
+_LAYERS = (
+    ("sqlalchemy/orm/", "orm"),
+    ("sqlalchemy/", "sqlalchemy"),
+    ("aiosqlite/", "driver"),
+    ("sqlite3/", "driver"),
+    ("pydantic", "serialization"),
+    ("fastapi/encoders", "serialization"),
+    ("jinja2/", "jinja"),
+    ("markupsafe/", "jinja"),
+    ("/app/", "app"),
+)
+
+
+class RequestProfile:
+    def __init__(self) -> None:
+        self._profilers: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread through one global hook, which the request's loop profiler holds.
+            profiler = None
+        if profiler is None:
+            yield
+            return
+        with self._lock:
+            self._profilers.append(profiler)
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            profilers = list(self._profilers)
+        stats = pstats.Stats(*profilers[:1])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+# The loop-thread profiler sees every request interleaved on the event loop, so only one profile runs at a time.
+_loop_profile = threading.Lock()
+
+
+def wants_profile(request: Request) -> bool:
+    if not REQUEST_PROFILING:
+        return False
+    return request.headers.get(PROFILE_HEADER) == "1" or request.query_params.get(PROFILE_QUERY_PARAM) == "1"
+
+
+def _profiled_call(call: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(call)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        profile = _current.get()
+        if profile is None:
+            return call(*args, **kwargs)
+        with profile.thread():
+            return call(*args, **kwargs)
+
+    # Resolved here because older FastAPI versions evaluate string annotations against the wrapper's globals.
+    run.__signature__ = inspect.signature(call, eval_str=True)
+    return run
+
+
+def profiled_iterator(iterator: Iterable[T]) -> Iterable[T]:
+    # Sync streaming bodies are pulled chunk by chunk in the threadpool after the endpoint has returned.
+    profile = _current.get()
+    if profile is None:
+        return iterator
+
+    def run() -> Iterator[T]:
+        source = iter(iterator)
+        while True:
+            with profile.thread():
+                try:
+                    chunk = next(source)
+                except StopIteration:
+                    return
+            yield chunk
+
+    return run()
+
+
+class ProfiledRoute(APIRoute):
+    # Sync endpoints run in the threadpool, out of sight of the middleware's profiler on the event loop thread;
+    # they start their own profiler while a profiled request is active.
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _profiled_call(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _layer(filename: str) -> str:
+    normalized = filename.replace("\\", "/")
+    for fragment, layer in _LAYERS:
+        if fragment in normalized:
+            return layer
+    return "other"
+
+
+def _function_label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def summarize(stats: pstats.Stats, elapsed: float, sql_count: int, sql_time: float) -> dict[str, Any]:
+    layers: dict[str, float] = {}
+    rows = []
+    for func, (_, calls, tottime, cumtime, _) in stats.stats.items():
+        layer = _layer(func[0])
+        layers[layer] = layers.get(layer, 0.0) + tottime
+        rows.append((tottime, cumtime, calls, func))
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return {
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "sql_count": sql_count,
+        "sql_ms": round(sql_time * 1000, 3),
+        "sql_share": round(sql_time / elapsed, 4) if elapsed else 0.0,
+        "profiled_ms": round(stats.total_tt * 1000, 3),
+        "layers_ms": {layer: round(value * 1000, 3) for layer, value in sorted(layers.items(), key=lambda i: -i[1])},
+        "top_functions": [
+            {
+                "function": _function_label(func),
+                "calls": calls,
+                "self_ms": round(tottime * 1000, 3),
+                "cumulative_ms": round(cumtime * 1000, 3),
+            }
+            for tottime, cumtime, calls, func in rows[:PROFILE_TOP_FUNCTIONS]
+        ],
+    }
+
+
+def _prune(directory: Path, keep: int) -> None:
+    for path in sorted(directory.glob("*.json"), reverse=True)[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def save_profile(profile: RequestProfile, meta: dict[str, Any], summary: dict[str, Any]) -> str:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    now = datetime.now()
+    profile_id = f"{now.strftime('%Y%m%d-%H%M%S%f')}-{uuid.uuid4().hex[:4]}"
+    profile.stats().dump_stats(PROFILE_DIR / f"{profile_id}.prof")
+    record = {"id": profile_id, "created_at": now.isoformat(timespec="seconds"), **meta, **summary}
+    (PROFILE_DIR / f"{profile_id}.json").write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+    _prune(PROFILE_DIR, PROFILE_KEEP)
+    return profile_id
+
+
+def list_profiles(limit: int = PROFILE_KEEP) -> list[dict[str, Any]]:
+    if not PROFILE_DIR.is_dir():
+        return []
+    records = []
+    for path in sorted(PROFILE_DIR.glob("*.json"), reverse=True)[:limit]:
+        try:
+            records.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+def profile_path(profile_id: str) -> Path | None:
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = PROFILE_DIR / f"{profile_id}.prof"
+    return path if path.is_file() else None
+
+
+async def profile_request(request: Request, call_next: Callable[[Request], Any]) -> Response:
+    if not _loop_profile.acquire(blocking=False):
+        response = await call_next(request)
+        response.headers["X-Profile-Skipped"] = "busy"
+        return response
+    try:
+        return await _profile_request(request, call_next)
+    finally:
+        _loop_profile.release()
+
+
+async def _profile_request(request: Request, call_next: Callable[[Request], Any]) -> Response:
+    profile = RequestProfile()
+    token = _current.set(profile)
+    outer = current_query_stats()
+    started = time.perf_counter()
+    try:
+        with nullcontext(outer) if outer is not None else track_queries() as stats:
+            count, duration = stats.count, stats.duration
+            with profile.thread():
+                response = await call_next(request)
+                # Drain the body inside the profile so streamed work (CSV export) is included.
+                chunks = [chunk async for chunk in response.body_iterator]
+            sql_count, sql_time = stats.count - count, stats.duration - duration
+    finally:
+        _current.reset(token)
+    elapsed = time.perf_counter() - started
+
+    async def replay() -> Any:
+        for chunk in chunks:
+            yield chunk
+
+    response.body_iterator = replay()
+    meta = {
+        "method": request.method,
+        "path": request.url.path,
+        "route": metrics.route_label(request.scope),
+        "status": response.status_code,
+    }
+    summary = summarize(profile.stats(), elapsed, sql_count, sql_time)
+    response.headers["X-Profile-Id"] = await anyio.to_thread.run_sync(save_profile, profile, meta, summary)
+    return response
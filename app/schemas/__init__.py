@@ -1,41 +1,63 @@
 from app.schemas.common import (
+    AccountBalanceRead,
     AccountCreate,
     AccountRead,
     AccountUpdate,
     CategoryCreate,
+    CategoryMatrixRead,
     CategoryRead,
     CategoryUpdate,
+    DailySpendRead,
+    ExpenseOutlierRead,
+    ImportJobRead,
     LiabilityCreate,
     LiabilityRead,
     LiabilityUpdate,
     MonthlyBalanceRead,
     MonthlyBalanceUpsert,
+    MonthlyDeltaRead,
     MonthlyLockRead,
     MonthlyLockUpsert,
+    MonthlySummaryItemRead,
     MonthlySummaryRead,
+    SlowQueryRead,
     SummaryRead,
+    TransactionBatchResult,
     TransactionCreate,
+    TransactionPage,
     TransactionRead,
+    TransactionSearchHit,
     TransactionUpdate,
 )
 
 __all__ = [
+    "AccountBalanceRead",
     "AccountCreate",
     "AccountRead",
     "AccountUpdate",
     "CategoryCreate",
+    "CategoryMatrixRead",
     "CategoryRead",
     "CategoryUpdate",
+    "DailySpendRead",
+    "ExpenseOutlierRead",
+    "ImportJobRead",
     "LiabilityCreate",
     "LiabilityRead",
     "LiabilityUpdate",
     "MonthlyBalanceRead",
     "MonthlyBalanceUpsert",
+    "MonthlyDeltaRead",
     "MonthlyLockRead",
     "MonthlyLockUpsert",
+    "MonthlySummaryItemRead",
     "MonthlySummaryRead",
+    "SlowQueryRead",
     "SummaryRead",
+    "TransactionBatchResult",
     "TransactionCreate",
+    "TransactionPage",
     "TransactionRead",
+    "TransactionSearchHit",
     "TransactionUpdate",
 ]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -33,6 +33,16 @@ class AccountRead(AccountBase):
         from_attributes = True
 
 
+class AccountBalanceRead(BaseModel):
+    account_id: int
+    name: str
+    kind: str
+    is_active: bool
+    balance: int
+    as_of_year: int | None = None
+    as_of_month: int | None = None
+
+
 class CategoryBase(BaseModel):
     name: str = Field(min_length=1, max_length=120)
     is_fixed: bool = False
@@ -116,6 +126,20 @@ class TransactionRead(TransactionBase):
         from_attributes = True
 
 
+class TransactionSearchHit(TransactionRead):
+    rank: float | None = None
+
+
+class TransactionBatchResult(BaseModel):
+    created: int
+    ids: list[int]
+
+
+class TransactionPage(BaseModel):
+    items: list[TransactionRead]
+    next_cursor: str | None = None
+
+
 class LiabilityBase(BaseModel):
     name: str = Field(min_length=1, max_length=120)
     balance: int
@@ -162,6 +186,51 @@ class MonthlySummaryRead(SummaryRead):
     adjust_total: int
 
 
+class MonthlySummaryItemRead(MonthlySummaryRead):
+    month: int
+
+
+class CategoryMatrixRead(BaseModel):
+    year: int
+    months: list[int]
+    category_ids: list[int | None]
+    category_frees: list[str | None]
+    labels: list[str]
+    values: list[list[int]]
+    month_totals: list[int]
+    column_totals: list[int]
+
+
+class DailySpendRead(BaseModel):
+    year: int
+    start: dt.date
+    end: dt.date
+    window: int
+    expense: list[int]
+    rolling_mean: list[float | None]
+    percentiles: dict[str, float]
+    mean: float
+
+
+class MonthlyDeltaRead(BaseModel):
+    year: int
+    months: list[int]
+    income: list[int]
+    expense: list[int]
+    net: list[int]
+    expense_delta: list[int]
+    expense_change_pct: list[float | None]
+
+
+class ExpenseOutlierRead(BaseModel):
+    id: int
+    date: dt.date
+    amount: int
+    category_id: int | None = None
+    median: float
+    score: float
+
+
 class MonthlyLockRead(BaseModel):
     year: int
     month: int
@@ -173,3 +242,34 @@ class MonthlyLockRead(BaseModel):
 
 class MonthlyLockUpsert(BaseModel):
     is_locked: bool
+
+
+class ImportJobError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportJobRead(BaseModel):
+    id: str
+    filename: str
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    rows_processed: int
+    rows_imported: int
+    rows_per_sec: float
+    error_count: int
+    errors: list[ImportJobError]
+    detail: str | None = None
+    created_at: dt.datetime
+    finished_at: dt.datetime | None = None
+
+
+class SlowQueryRead(BaseModel):
+    recorded_at: dt.datetime
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    executemany: int | None = None
+    method: str | None = None
+    route: str | None = None
+    plan: list[str] | None = None
+    full_scans: list[str] = Field(default_factory=list)
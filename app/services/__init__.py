@@ -1,11 +1,19 @@
-from app.services.csv_io import export_transactions_csv, import_transactions_csv
+from app.services.csv_io import (
+    export_transactions_csv,
+    import_transactions_csv,
+    import_transactions_stream,
+    iter_transactions_csv,
+)
 from app.services.month_locks import is_month_locked, set_month_lock
-from app.services.summary import get_month_summary, get_year_summary
+from app.services.summary import get_month_summary, get_year_month_summaries, get_year_summary
 
 __all__ = [
     "export_transactions_csv",
     "import_transactions_csv",
+    "import_transactions_stream",
+    "iter_transactions_csv",
     "get_month_summary",
+    "get_year_month_summaries",
     "get_year_summary",
     "is_month_locked",
     "set_month_lock",
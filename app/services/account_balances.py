@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import case, delete, func, literal, select, tuple_, union_all
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import AccountBalance, MonthlyBalance, Transaction
+from app.services.reference_data import get_reference_data
+
+if TYPE_CHECKING:
+    from app.services.monthly_totals import TxSnapshot
+
+Month = tuple[int, int]
+FlowKey = tuple[int, int, int]
+Snapshot = tuple[int, int, int, int, int, int]
+
+
+class BalanceRow(NamedTuple):
+    account_id: int
+    year: int
+    month: int
+    balance: int
+
+
+def _legs(snap: TxSnapshot) -> list[tuple[int, int]]:
+    if snap.type == "income" and snap.account_id:
+        return [(snap.account_id, snap.amount)]
+    if snap.type == "expense" and snap.account_id:
+        return [(snap.account_id, -snap.amount)]
+    if snap.type == "transfer":
+        legs = []
+        if snap.account_id:
+            legs.append((snap.account_id, -snap.amount))
+        if snap.to_account_id:
+            legs.append((snap.to_account_id, snap.amount))
+        return legs
+    return []
+
+
+def _chain(
+    account_id: int, previous: int, flows: dict[Month, tuple[int, int]], openings: dict[Month, int]
+) -> list[Snapshot]:
+    rows = []
+    closing = previous
+    for year, month in sorted(flows.keys() | openings.keys()):
+        net, count = flows.get((year, month), (0, 0))
+        if count <= 0 and (year, month) not in openings:
+            continue
+        closing = openings.get((year, month), closing) + net
+        rows.append((account_id, year, month, net, count, closing))
+    return rows
+
+
+def _insert_rows(db: Session, rows: list[Snapshot]) -> None:
+    if rows:
+        db.execute(
+            insert(AccountBalance),
+            [
+                {
+                    "account_id": account_id,
+                    "year": year,
+                    "month": month,
+                    "net_flow": net,
+                    "tx_count": count,
+                    "closing_balance": closing,
+                }
+                for account_id, year, month, net, count, closing in rows
+            ],
+        )
+
+
+def _recompute_account(db: Session, account_id: int, start: Month) -> None:
+    in_range = (AccountBalance.account_id == account_id, tuple_(AccountBalance.year, AccountBalance.month) >= start)
+    previous = db.scalar(
+        select(AccountBalance.closing_balance)
+        .where(AccountBalance.account_id == account_id, tuple_(AccountBalance.year, AccountBalance.month) < start)
+        .order_by(AccountBalance.year.desc(), AccountBalance.month.desc())
+        .limit(1)
+    )
+    flows = {
+        (year, month): (net, count)
+        for year, month, net, count in db.execute(
+            select(AccountBalance.year, AccountBalance.month, AccountBalance.net_flow, AccountBalance.tx_count).where(
+                *in_range
+            )
+        ).all()
+    }
+    openings = {
+        (year, month): opening
+        for year, month, opening in db.execute(
+            select(MonthlyBalance.year, MonthlyBalance.month, MonthlyBalance.opening_balance).where(
+                MonthlyBalance.account_id == account_id,
+                tuple_(MonthlyBalance.year, MonthlyBalance.month) >= start,
+            )
+        ).all()
+    }
+    db.execute(delete(AccountBalance).where(*in_range))
+    _insert_rows(db, _chain(account_id, previous or 0, flows, openings))
+
+
+def _recompute(db: Session, keys: Iterable[FlowKey]) -> None:
+    starts: dict[int, Month] = {}
+    for account_id, year, month in keys:
+        starts[account_id] = min(starts.get(account_id, (year, month)), (year, month))
+    if not starts:
+        return
+    db.flush()
+    for account_id, start in sorted(starts.items()):
+        _recompute_account(db, account_id, start)
+
+
+def record_balance_changes(
+    db: Session, removed: Iterable[TxSnapshot] = (), added: Iterable[TxSnapshot] = ()
+) -> None:
+    deltas: dict[FlowKey, list[int]] = {}
+    for sign, snaps in ((-1, removed), (1, added)):
+        for snap in snaps:
+            for account_id, amount in _legs(snap):
+                delta = deltas.setdefault((account_id, snap.year, snap.month), [0, 0])
+                delta[0] += sign * amount
+                delta[1] += sign
+    rows = [
+        {
+            "account_id": account_id,
+            "year": year,
+            "month": month,
+            "net_flow": net,
+            "tx_count": count,
+            "closing_balance": 0,
+        }
+        for (account_id, year, month), (net, count) in deltas.items()
+        if net or count
+    ]
+    if not rows:
+        return
+
+    stmt = insert(AccountBalance)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["account_id", "year", "month"],
+        set_={
+            "net_flow": AccountBalance.net_flow + stmt.excluded.net_flow,
+            "tx_count": AccountBalance.tx_count + stmt.excluded.tx_count,
+        },
+    )
+    db.execute(stmt, rows)
+    _recompute(db, ((row["account_id"], row["year"], row["month"]) for row in rows))
+
+
+def record_opening_changes(db: Session, keys: Iterable[FlowKey]) -> None:
+    _recompute(db, keys)
+
+
+def drop_account_balances(db: Session, account_ids: Collection[int]) -> None:
+    db.execute(delete(AccountBalance).where(AccountBalance.account_id.in_(account_ids)))
+
+
+def get_account_balances(db: Session, year: int | None = None, month: int | None = None) -> dict[int, BalanceRow]:
+    # SQLite takes the bare columns from the row that holds max(), i.e. the latest snapshot per account.
+    query = select(
+        AccountBalance.account_id,
+        AccountBalance.year,
+        AccountBalance.month,
+        AccountBalance.closing_balance,
+        func.max(AccountBalance.year * 100 + AccountBalance.month),
+    ).group_by(AccountBalance.account_id)
+    if year is not None:
+        query = query.where(tuple_(AccountBalance.year, AccountBalance.month) <= (year, month or 12))
+    return {row[0]: BalanceRow(*row[:4]) for row in db.execute(query).all()}
+
+
+def list_account_balances(db: Session, year: int | None = None, month: int | None = None) -> list[dict[str, Any]]:
+    balances = get_account_balances(db, year, month)
+    items = []
+    for account in get_reference_data(db).accounts:
+        row = balances.get(account.id)
+        items.append(
+            {
+                "account_id": account.id,
+                "name": account.name,
+                "kind": account.kind,
+                "is_active": account.is_active,
+                "balance": row.balance if row else 0,
+                "as_of_year": row.year if row else None,
+                "as_of_month": row.month if row else None,
+            }
+        )
+    return items
+
+
+def _expected_balances(db: Session) -> list[Snapshot]:
+    db.flush()
+    signed = case((Transaction.type == "income", Transaction.amount), else_=-Transaction.amount)
+    legs = union_all(
+        select(
+            Transaction.account_id.label("account_id"),
+            Transaction.year.label("year"),
+            Transaction.month.label("month"),
+            signed.label("amount"),
+        ).where(Transaction.type.in_(("income", "expense", "transfer")), Transaction.account_id.is_not(None)),
+        select(Transaction.to_account_id, Transaction.year, Transaction.month, Transaction.amount).where(
+            Transaction.type == "transfer", Transaction.to_account_id.is_not(None)
+        ),
+    ).subquery()
+    flows: dict[int, dict[Month, tuple[int, int]]] = {}
+    for account_id, year, month, net, count in db.execute(
+        select(legs.c.account_id, legs.c.year, legs.c.month, func.sum(legs.c.amount), func.count(literal(1))).group_by(
+            legs.c.account_id, legs.c.year, legs.c.month
+        )
+    ).all():
+        flows.setdefault(account_id, {})[(year, month)] = (int(net), int(count))
+    openings: dict[int, dict[Month, int]] = {}
+    for account_id, year, month, opening in db.execute(
+        select(MonthlyBalance.account_id, MonthlyBalance.year, MonthlyBalance.month, MonthlyBalance.opening_balance)
+    ).all():
+        openings.setdefault(account_id, {})[(year, month)] = opening
+
+    rows = []
+    for account_id in sorted(flows.keys() | openings.keys()):
+        rows.extend(_chain(account_id, 0, flows.get(account_id, {}), openings.get(account_id, {})))
+    return rows
+
+
+def verify_account_balances(db: Session) -> list[dict[str, Any]]:
+    expected = {row[:3]: row[3:] for row in _expected_balances(db)}
+    stored = {
+        (account_id, year, month): (net, count, closing)
+        for account_id, year, month, net, count, closing in db.execute(
+            select(
+                AccountBalance.account_id,
+                AccountBalance.year,
+                AccountBalance.month,
+                AccountBalance.net_flow,
+                AccountBalance.tx_count,
+                AccountBalance.closing_balance,
+            )
+        ).all()
+    }
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys()):
+        if expected.get(key) != stored.get(key):
+            account_id, year, month = key
+            mismatches.append(
+                {
+                    "account_id": account_id,
+                    "year": year,
+                    "month": month,
+                    "expected": expected.get(key, (0, 0, 0)),
+                    "stored": stored.get(key, (0, 0, 0)),
+                }
+            )
+    return mismatches
+
+
+def rebuild_account_balances(db: Session) -> int:
+    db.execute(delete(AccountBalance))
+    rows = _expected_balances(db)
+    _insert_rows(db, rows)
+    return len(rows)
@@ -0,0 +1,14 @@
+from app.services.analytics.arrays import TYPE_CODES, YearArrays, get_year_arrays, load_year_arrays
+from app.services.analytics.stats import daily_expenses, daily_spend, expense_outliers, monthly_deltas, rolling_mean
+
+__all__ = [
+    "TYPE_CODES",
+    "YearArrays",
+    "daily_expenses",
+    "daily_spend",
+    "expense_outliers",
+    "get_year_arrays",
+    "load_year_arrays",
+    "monthly_deltas",
+    "rolling_mean",
+]
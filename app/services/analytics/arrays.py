@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from sqlalchemy import Integer, case, cast, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Transaction
+from app.db.session import cache_engine
+from app.services.data_versions import get_month_versions
+from app.services.monthly_totals import NO_REF
+
+TYPE_CODES = {"income": 0, "expense": 1, "transfer": 2, "adjust": 3}
+INCOME, EXPENSE, TRANSFER, ADJUST = range(4)
+# julianday('0001-01-01') - 1, so that julianday(date) - offset equals date.toordinal().
+JULIAN_ORDINAL_OFFSET = 1721424.5
+
+
+class YearArrays:
+    def __init__(self, year: int, rows: np.ndarray) -> None:
+        self.year = year
+        self.ids = rows[:, 0]
+        self.ordinals = rows[:, 1]
+        self.types = rows[:, 2]
+        self.amounts = rows[:, 3]
+        self.account_ids = rows[:, 4]
+        self.category_ids = rows[:, 5]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+_caches: WeakKeyDictionary[Engine, dict[int, tuple[tuple, YearArrays]]] = WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def load_year_arrays(db: Session, year: int) -> YearArrays:
+    type_code = case(
+        *((Transaction.type == name, code) for name, code in TYPE_CODES.items()),
+        else_=-1,
+    )
+    rows = db.execute(
+        select(
+            Transaction.id,
+            cast(func.julianday(Transaction.date) - JULIAN_ORDINAL_OFFSET, Integer),
+            type_code,
+            Transaction.amount,
+            func.coalesce(Transaction.account_id, NO_REF),
+            func.coalesce(Transaction.category_id, NO_REF),
+        )
+        .where(Transaction.year == year)
+        .order_by(Transaction.date.asc(), Transaction.id.asc())
+    ).all()
+    return YearArrays(year, np.array(rows, dtype=np.int64).reshape(len(rows), 6))
+
+
+def get_year_arrays(db: Session, year: int) -> YearArrays:
+    engine = cache_engine(db.get_bind())
+    key = tuple(sorted(get_month_versions(db, year).items()))
+    cached = _caches.get(engine, {}).get(year)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    arrays = load_year_arrays(db, year)
+    with _caches_lock:
+        _caches.setdefault(engine, {})[year] = (key, arrays)
+    return arrays
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+from app.services.analytics.arrays import EXPENSE, INCOME, YearArrays
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+# 1.4826 * MAD estimates the standard deviation for normally distributed amounts.
+MAD_SCALE = 1.4826
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _last_day(year: int, today: date | None = None) -> date:
+    today = today or date.today()
+    return min(date(year, 12, 31), today)
+
+
+def _float_list(values: np.ndarray) -> list[float | None]:
+    return [None if np.isnan(value) else round(float(value), 2) for value in values]
+
+
+def daily_expenses(arrays: YearArrays, today: date | None = None) -> np.ndarray:
+    start = date(arrays.year, 1, 1).toordinal()
+    days = max(_last_day(arrays.year, today).toordinal() - start + 1, 0)
+    mask = (arrays.types == EXPENSE) & (arrays.ordinals - start < days)
+    return np.bincount(arrays.ordinals[mask] - start, weights=arrays.amounts[mask], minlength=days)[:days]
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    result = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    result[window - 1 :] = (sums[window:] - sums[:-window]) / window
+    return result
+
+
+def daily_spend(
+    arrays: YearArrays,
+    window: int = 7,
+    percentiles: tuple[int, ...] = DEFAULT_PERCENTILES,
+    today: date | None = None,
+) -> dict[str, Any]:
+    daily = daily_expenses(arrays, today)
+    return {
+        "year": arrays.year,
+        "start": date(arrays.year, 1, 1),
+        "end": date(arrays.year, 1, 1) + timedelta(days=max(len(daily) - 1, 0)),
+        "window": window,
+        "expense": daily.astype(np.int64).tolist(),
+        "rolling_mean": _float_list(rolling_mean(daily, window)),
+        "percentiles": {
+            f"p{q}": round(float(value), 2)
+            for q, value in zip(percentiles, np.percentile(daily, percentiles) if len(daily) else [0.0] * len(percentiles))
+        },
+        "mean": round(float(daily.mean()), 2) if len(daily) else 0.0,
+    }
+
+
+def monthly_deltas(arrays: YearArrays) -> dict[str, Any]:
+    month_index = (arrays.ordinals - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+    totals = {}
+    for name, code in (("income", INCOME), ("expense", EXPENSE)):
+        mask = arrays.types == code
+        totals[name] = np.bincount(month_index[mask], weights=arrays.amounts[mask], minlength=12).astype(np.int64)
+    expense = totals["expense"]
+    delta = np.concatenate(([0], np.diff(expense)))
+    previous = np.concatenate(([0], expense[:-1])).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.where(previous > 0, delta / previous * 100, np.nan)
+    change[0] = np.nan
+    return {
+        "year": arrays.year,
+        "months": list(range(1, 13)),
+        "income": totals["income"].tolist(),
+        "expense": expense.tolist(),
+        "net": (totals["income"] - expense).tolist(),
+        "expense_delta": delta.tolist(),
+        "expense_change_pct": _float_list(change),
+    }
+
+
+def expense_outliers(arrays: YearArrays, threshold: float = 3.5) -> list[dict[str, Any]]:
+    mask = arrays.types == EXPENSE
+    amounts = arrays.amounts[mask].astype(float)
+    if not len(amounts):
+        return []
+    categories = arrays.category_ids[mask]
+    unique, inverse = np.unique(categories, return_inverse=True)
+    medians = np.array([np.median(amounts[inverse == index]) for index in range(len(unique))])
+    deviations = np.abs(amounts - medians[inverse])
+    mads = np.array([np.median(deviations[inverse == index]) for index in range(len(unique))]) * MAD_SCALE
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(mads[inverse] > 0, deviations / mads[inverse], 0.0)
+    hits = np.flatnonzero(scores > threshold)
+    hits = hits[np.argsort(-scores[hits], kind="stable")]
+    ids, ordinals, category_ids = arrays.ids[mask], arrays.ordinals[mask], categories
+    return [
+        {
+            "id": int(ids[index]),
+            "date": date.fromordinal(int(ordinals[index])),
+            "amount": int(amounts[index]),
+            "category_id": int(category_ids[index]) or None,
+            "median": round(float(medians[inverse[index]]), 2),
+            "score": round(float(scores[index]), 2),
+        }
+        for index in hits
+    ]
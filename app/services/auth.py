@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
+import os
 import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 PBKDF2_NAME = "pbkdf2_sha256"
 PBKDF2_ITERATIONS = 120000
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "8"))
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
 
 
 def hash_password(password: str) -> str:
@@ -30,3 +40,29 @@ def verify_password(password: str, password_hash: str | None) -> bool:
 
     digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations)
     return hmac.compare_digest(digest.hex(), expected)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_size: int = PASSWORD_HASH_QUEUE) -> None:
+        self.capacity = workers + queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    def _release(self, _future: object) -> None:
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+    async def verify(self, password: str, password_hash: str | None) -> bool:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("password hasher is saturated")
+        with self._lock:
+            self.pending += 1
+        future = self._executor.submit(verify_password, password, password_hash)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+
+password_hasher = PasswordHasher()
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import csv
 import io
+import os
+from collections.abc import Iterator
 from datetime import date
+from typing import Any, BinaryIO
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, aliased
 
 from app.db.models import Account, Category, Transaction
+from app.services.month_locks import is_month_locked
+from app.services.monthly_totals import record_transaction_changes, snapshot_values
+from app.services.reference_data import invalidate_reference_data
 
 CSV_HEADERS = [
     "date",
@@ -20,97 +26,195 @@ CSV_HEADERS = [
     "description",
     "note",
 ]
-
-
-def _get_or_create_account(db: Session, name: str | None) -> Account | None:
-    if not name:
-        return None
-    account = db.scalar(select(Account).where(Account.name == name))
-    if account:
-        return account
-    account = Account(name=name, kind="other", is_active=True, user_id=1)
-    db.add(account)
-    db.flush()
-    return account
-
-
-def _get_or_create_category(db: Session, name: str | None) -> Category | None:
-    if not name:
-        return None
-    category = db.scalar(select(Category).where(Category.name == name))
-    if category:
-        return category
-    category = Category(name=name, is_fixed=False, is_active=True, user_id=1)
-    db.add(category)
-    db.flush()
-    return category
-
-
-def export_transactions_csv(db: Session, year: int | None = None, month: int | None = None) -> str:
-    query = select(Transaction).order_by(Transaction.date.desc(), Transaction.id.desc())
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = int(os.getenv("CSV_IMPORT_BATCH_SIZE", "1000"))
+
+
+def iter_transactions_csv(
+    db: Session,
+    year: int | None = None,
+    month: int | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    to_account = aliased(Account)
+    query = (
+        select(
+            Transaction.date,
+            Transaction.type,
+            Transaction.amount,
+            Account.name,
+            to_account.name,
+            Category.name,
+            Transaction.category_free,
+            Transaction.description,
+            Transaction.note,
+        )
+        .outerjoin(Account, Transaction.account_id == Account.id)
+        .outerjoin(to_account, Transaction.to_account_id == to_account.id)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
     if year is not None:
         query = query.where(Transaction.year == year)
     if month is not None:
         query = query.where(Transaction.month == month)
 
-    rows = db.scalars(query).all()
     out = io.StringIO()
     writer = csv.writer(out)
     writer.writerow(CSV_HEADERS)
-
-    for tx in rows:
-        writer.writerow(
-            [
-                tx.date.isoformat(),
-                tx.type,
-                tx.amount,
-                tx.account.name if tx.account else "",
-                tx.to_account.name if tx.to_account else "",
-                tx.category.name if tx.category else "",
-                tx.category_free or "",
-                tx.description or "",
-                tx.note or "",
-            ]
+    yield out.getvalue()
+
+    for partition in db.execute(query).partitions():
+        out.seek(0)
+        out.truncate(0)
+        writer.writerows(
+            (
+                tx_date.isoformat(),
+                tx_type,
+                amount,
+                account_name or "",
+                to_account_name or "",
+                category_name or "",
+                category_free or "",
+                description or "",
+                note or "",
+            )
+            for (
+                tx_date,
+                tx_type,
+                amount,
+                account_name,
+                to_account_name,
+                category_name,
+                category_free,
+                description,
+                note,
+            ) in partition
         )
-
-    return out.getvalue()
+        yield out.getvalue()
 
 
-def import_transactions_csv(db: Session, content: bytes) -> int:
-    text = content.decode("utf-8")
-    reader = csv.DictReader(io.StringIO(text))
-    required = set(CSV_HEADERS)
-    if set(reader.fieldnames or []) != required:
-        raise ValueError("invalid CSV header")
-
-    count = 0
-    for row in reader:
+def export_transactions_csv(db: Session, year: int | None = None, month: int | None = None) -> str:
+    return "".join(iter_transactions_csv(db, year=year, month=month))
+
+
+class MonthLockedError(ValueError):
+    def __init__(self, year: int, month: int) -> None:
+        super().__init__(f"month is locked: {year}-{month:02d}")
+        self.year = year
+        self.month = month
+
+
+def read_csv_rows(stream: BinaryIO) -> Iterator[tuple[int, dict[str, str]]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        reader = csv.DictReader(text)
+        if set(reader.fieldnames or []) != set(CSV_HEADERS):
+            raise ValueError("invalid CSV header")
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        text.detach()
+
+
+class TransactionImporter:
+    def __init__(self, db: Session, batch_size: int = IMPORT_BATCH_SIZE) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.count = 0
+        self.created_refs = False
+        self._account_ids = {name: id_ for name, id_ in db.execute(select(Account.name, Account.id)).all()}
+        self._category_ids = {name: id_ for name, id_ in db.execute(select(Category.name, Category.id)).all()}
+        self._month_locks: dict[tuple[int, int], bool] = {}
+        self._pending: list[dict[str, Any]] = []
+
+    def _account_id(self, name: str | None) -> int | None:
+        if not name:
+            return None
+        account_id = self._account_ids.get(name)
+        if account_id is None:
+            account = Account(name=name, kind="other", is_active=True, user_id=1)
+            self.db.add(account)
+            self.db.flush()
+            account_id = self._account_ids[name] = account.id
+            self.created_refs = True
+        return account_id
+
+    def _category_id(self, name: str | None) -> int | None:
+        if not name:
+            return None
+        category_id = self._category_ids.get(name)
+        if category_id is None:
+            category = Category(name=name, is_fixed=False, is_active=True, user_id=1)
+            self.db.add(category)
+            self.db.flush()
+            category_id = self._category_ids[name] = category.id
+            self.created_refs = True
+        return category_id
+
+    def check_month(self, year: int, month: int) -> None:
+        key = (year, month)
+        if key not in self._month_locks:
+            self._month_locks[key] = is_month_locked(self.db, year, month, fresh=True)
+        if self._month_locks[key]:
+            raise MonthLockedError(year, month)
+
+    def parse_row(self, row: dict[str, str]) -> dict[str, Any]:
         tx_date = date.fromisoformat((row.get("date") or "").strip())
         tx_type = (row.get("type") or "").strip()
         amount = int((row.get("amount") or "").strip())
         if amount <= 0:
             raise ValueError("amount must be positive")
+        self.check_month(tx_date.year, tx_date.month)
+
+        return {
+            "date": tx_date,
+            "year": tx_date.year,
+            "month": tx_date.month,
+            "type": tx_type,
+            "amount": amount,
+            "account_id": self._account_id((row.get("account") or "").strip() or None),
+            "to_account_id": self._account_id((row.get("to_account") or "").strip() or None),
+            "category_id": self._category_id((row.get("category") or "").strip() or None),
+            "category_free": (row.get("category_free") or "").strip() or None,
+            "description": (row.get("description") or "").strip() or None,
+            "note": (row.get("note") or "").strip() or None,
+            "user_id": 1,
+        }
+
+    def add(self, values: dict[str, Any]) -> bool:
+        self._pending.append(values)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        self.db.execute(insert(Transaction), self._pending)
+        record_transaction_changes(self.db, added=[snapshot_values(values) for values in self._pending])
+        self.count += len(self._pending)
+        self._pending = []
+
+
+def import_transactions_stream(db: Session, stream: BinaryIO, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    importer = TransactionImporter(db, batch_size=batch_size)
+    for line_num, row in read_csv_rows(stream):
+        try:
+            values = importer.parse_row(row)
+        except MonthLockedError:
+            raise
+        except ValueError as exc:
+            raise ValueError(f"line {line_num}: {exc}") from exc
+        importer.add(values)
+    importer.flush()
+    db.commit()
+    if importer.created_refs:
+        invalidate_reference_data(db)
+    return importer.count
 
-        account = _get_or_create_account(db, (row.get("account") or "").strip() or None)
-        to_account = _get_or_create_account(db, (row.get("to_account") or "").strip() or None)
-        category = _get_or_create_category(db, (row.get("category") or "").strip() or None)
-
-        tx = Transaction(
-            date=tx_date,
-            year=tx_date.year,
-            month=tx_date.month,
-            type=tx_type,
-            amount=amount,
-            account_id=account.id if account else None,
-            to_account_id=to_account.id if to_account else None,
-            category_id=category.id if category else None,
-            category_free=(row.get("category_free") or "").strip() or None,
-            description=(row.get("description") or "").strip() or None,
-            note=(row.get("note") or "").strip() or None,
-            user_id=1,
-        )
-        db.add(tx)
-        count += 1
 
-    db.commit()
-    return count
+def import_transactions_csv(db: Session, content: bytes) -> int:
+    return import_transactions_stream(db, io.BytesIO(content))
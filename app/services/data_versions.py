@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import MonthVersion
+
+
+def bump_month_versions(db: Session, months: Iterable[tuple[int, int]]) -> None:
+    rows = [{"year": year, "month": month, "version": 1} for year, month in sorted(set(months))]
+    if not rows:
+        return
+    stmt = insert(MonthVersion)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["year", "month"],
+        set_={"version": MonthVersion.version + 1},
+    )
+    db.execute(stmt, rows)
+
+
+def get_month_versions(db: Session, year: int | None = None, month: int | None = None) -> dict[tuple[int, int], int]:
+    query = select(MonthVersion.year, MonthVersion.month, MonthVersion.version)
+    if year is not None:
+        query = query.where(MonthVersion.year == year)
+    if month is not None:
+        query = query.where(MonthVersion.month == month)
+    return {(y, m): version for y, m, version in db.execute(query).all()}
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import SessionLocal
+from app.services.csv_io import TransactionImporter, read_csv_rows
+from app.services.reference_data import invalidate_reference_data
+
+IMPORT_JOB_DIR = Path(os.getenv("IMPORT_JOB_DIR", Path(tempfile.gettempdir()) / "kakeibo_import_jobs"))
+IMPORT_JOB_CHUNK_SIZE = int(os.getenv("IMPORT_JOB_CHUNK_SIZE", "5000"))
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "1"))
+MAX_RECORDED_ERRORS = 100
+MAX_FINISHED_JOBS = 50
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class ImportJob:
+    def __init__(self, job_id: str, filename: str, path: Path) -> None:
+        self.id = job_id
+        self.filename = filename
+        self.path = path
+        self.status = "queued"
+        self.rows_processed = 0
+        self.rows_imported = 0
+        self.error_count = 0
+        self.errors: list[dict[str, Any]] = []
+        self.detail: str | None = None
+        self.created_at = datetime.now(UTC).replace(tzinfo=None)
+        self.finished_at: datetime | None = None
+        self._started: float | None = None
+        self._finished: float | None = None
+        self._cancel = threading.Event()
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self._started is None:
+            return 0.0
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return round(self.rows_processed / elapsed, 1) if elapsed > 0 else 0.0
+
+    def record_error(self, line: int, detail: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_RECORDED_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "rows_processed": self.rows_processed,
+            "rows_imported": self.rows_imported,
+            "rows_per_sec": self.rows_per_sec,
+            "error_count": self.error_count,
+            "errors": list(self.errors),
+            "detail": self.detail,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_jobs: dict[str, ImportJob] = {}
+_jobs_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="csv-import")
+
+
+def _prune_finished() -> None:
+    finished = [job for job in _jobs.values() if job.status in FINISHED_STATUSES]
+    for job in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job.id]
+
+
+def create_import_job(stream: BinaryIO, filename: str | None = None) -> ImportJob:
+    IMPORT_JOB_DIR.mkdir(parents=True, exist_ok=True)
+    job_id = uuid.uuid4().hex
+    path = IMPORT_JOB_DIR / f"{job_id}.csv"
+    with path.open("wb") as out:
+        shutil.copyfileobj(stream, out)
+    job = ImportJob(job_id, filename or "upload.csv", path)
+    with _jobs_lock:
+        _prune_finished()
+        _jobs[job_id] = job
+    return job
+
+
+def submit_import_job(stream: BinaryIO, filename: str | None = None) -> ImportJob:
+    job = create_import_job(stream, filename)
+    _executor.submit(run_import_job, job)
+    return job
+
+
+def get_import_job(job_id: str) -> ImportJob | None:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def list_import_jobs() -> list[ImportJob]:
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+
+def cancel_import_job(job_id: str) -> ImportJob | None:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is not None and job.status not in FINISHED_STATUSES:
+        job._cancel.set()
+    return job
+
+
+def _finish(job: ImportJob, status: str) -> None:
+    job.status = status
+    job._finished = time.monotonic()
+    job.finished_at = datetime.now(UTC).replace(tzinfo=None)
+    job.path.unlink(missing_ok=True)
+
+
+def _import_rows(db: Session, job: ImportJob, chunk_size: int) -> None:
+    importer = TransactionImporter(db, batch_size=chunk_size)
+    with job.path.open("rb") as stream:
+        for line_num, row in read_csv_rows(stream):
+            if job._cancel.is_set():
+                break
+            job.rows_processed += 1
+            try:
+                values = importer.parse_row(row)
+            except ValueError as exc:
+                job.record_error(line_num, str(exc))
+                continue
+            if importer.add(values):
+                db.commit()
+                if importer.created_refs:
+                    invalidate_reference_data(db)
+                job.rows_imported = importer.count
+    importer.flush()
+    db.commit()
+    if importer.created_refs:
+        invalidate_reference_data(db)
+    job.rows_imported = importer.count
+
+
+def run_import_job(
+    job: ImportJob,
+    session_factory: sessionmaker[Session] = SessionLocal,
+    chunk_size: int = IMPORT_JOB_CHUNK_SIZE,
+) -> ImportJob:
+    if job._cancel.is_set():
+        _finish(job, "cancelled")
+        return job
+
+    job.status = "running"
+    job._started = time.monotonic()
+    with session_factory() as db:
+        try:
+            _import_rows(db, job, chunk_size)
+        except Exception as exc:
+            db.rollback()
+            job.detail = str(exc)
+            _finish(job, "failed")
+            return job
+
+    _finish(job, "cancelled" if job._cancel.is_set() else "completed")
+    return job
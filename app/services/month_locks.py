@@ -1,16 +1,82 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
+from weakref import WeakKeyDictionary
+
 from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from app.db.models import MonthlyLock
+from app.db.models import MonthLockVersion, MonthlyLock
+from app.db.session import cache_engine
+from app.services.data_versions import bump_month_versions
 
+MONTH_LOCK_CACHE_TTL = float(os.getenv("MONTH_LOCK_CACHE_TTL", "2"))
+LOCK_VERSION_ID = 1
+
+
+class _LockedMonths:
+    __slots__ = ("months", "version", "loaded_at")
+
+    def __init__(self, months: frozenset[tuple[int, int]], version: int, loaded_at: float | None = None) -> None:
+        self.months = months
+        self.version = version
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+
+
+_caches: WeakKeyDictionary[Engine, _LockedMonths] = WeakKeyDictionary()
+# Bumped by every write-through and invalidation, so a load that overlapped one is not stored.
+_generations: WeakKeyDictionary[Engine, int] = WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def _engine(db: Session) -> Engine:
+    return cache_engine(db.get_bind())
 
-def is_month_locked(db: Session, year: int, month: int) -> bool:
-    lock = db.scalar(
-        select(MonthlyLock).where(MonthlyLock.year == year, MonthlyLock.month == month)
-    )
-    return bool(lock and lock.is_locked)
+
+def _lock_version(db: Session) -> int:
+    return db.scalar(select(MonthLockVersion.version).where(MonthLockVersion.id == LOCK_VERSION_ID)) or 0
+
+
+def _load_locked_months(db: Session) -> _LockedMonths:
+    version = _lock_version(db)
+    rows = db.execute(select(MonthlyLock.year, MonthlyLock.month).where(MonthlyLock.is_locked.is_(True))).all()
+    return _LockedMonths(frozenset((year, month) for year, month in rows), version)
+
+
+def locked_months(db: Session, fresh: bool = False) -> frozenset[tuple[int, int]]:
+    engine = _engine(db)
+    cached = _caches.get(engine)
+    if cached is not None:
+        if fresh:
+            # Write paths must see locks set by other processes, so they check the marker instead of the TTL.
+            stale = _lock_version(db) != cached.version
+        else:
+            stale = time.monotonic() - cached.loaded_at > MONTH_LOCK_CACHE_TTL
+        if not stale:
+            return cached.months
+    with _caches_lock:
+        generation = _generations.get(engine, 0)
+    cached = _load_locked_months(db)
+    with _caches_lock:
+        if _generations.get(engine, 0) == generation:
+            _caches[engine] = cached
+    return cached.months
+
+
+def invalidate_month_locks(db: Session | None = None) -> None:
+    with _caches_lock:
+        engines = list(_caches.keys() | _generations.keys()) if db is None else [_engine(db)]
+        for engine in engines:
+            _caches.pop(engine, None)
+            _generations[engine] = _generations.get(engine, 0) + 1
+
+
+def is_month_locked(db: Session, year: int, month: int, fresh: bool = False) -> bool:
+    return (year, month) in locked_months(db, fresh)
 
 
 def set_month_lock(db: Session, year: int, month: int, is_locked: bool) -> MonthlyLock:
@@ -22,6 +88,20 @@ def set_month_lock(db: Session, year: int, month: int, is_locked: bool) -> Month
         db.add(lock)
     else:
         lock.is_locked = is_locked
+    bump_month_versions(db, [(year, month)])
+    stmt = insert(MonthLockVersion).values(id=LOCK_VERSION_ID, version=1)
+    stmt = stmt.on_conflict_do_update(index_elements=["id"], set_={"version": MonthLockVersion.version + 1})
+    version = db.scalar(stmt.returning(MonthLockVersion.version))
     db.commit()
     db.refresh(lock)
+
+    engine = _engine(db)
+    with _caches_lock:
+        _generations[engine] = _generations.get(engine, 0) + 1
+        cached = _caches.get(engine)
+        if cached is not None:
+            months = cached.months | {(year, month)} if is_locked else cached.months - {(year, month)}
+            # Another process may have changed locks since the cached load; only trust the cache if not.
+            current = version if cached.version == version - 1 else cached.version
+            _caches[engine] = _LockedMonths(months, current, cached.loaded_at)
     return lock
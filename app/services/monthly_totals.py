@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from typing import Any, NamedTuple
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import MonthlyTotal, Transaction
+from app.services.account_balances import drop_account_balances, record_balance_changes
+from app.services.data_versions import bump_month_versions
+
+NO_REF = 0
+
+
+class TxSnapshot(NamedTuple):
+    year: int
+    month: int
+    type: str
+    amount: int
+    account_id: int | None
+    to_account_id: int | None
+    category_id: int | None
+
+
+TotalsKey = tuple[int, int, str, int, int]
+
+
+def snapshot(tx: Any) -> TxSnapshot:
+    return TxSnapshot(
+        year=tx.year,
+        month=tx.month,
+        type=tx.type,
+        amount=tx.amount,
+        account_id=tx.account_id,
+        to_account_id=tx.to_account_id,
+        category_id=tx.category_id,
+    )
+
+
+def snapshot_values(values: dict[str, Any]) -> TxSnapshot:
+    return TxSnapshot(**{field: values.get(field) for field in TxSnapshot._fields})
+
+
+def _key(snap: TxSnapshot) -> TotalsKey:
+    return (snap.year, snap.month, snap.type, snap.account_id or NO_REF, snap.category_id or NO_REF)
+
+
+def _apply_deltas(db: Session, deltas: dict[TotalsKey, list[int]]) -> None:
+    rows = [
+        {
+            "year": year,
+            "month": month,
+            "type": tx_type,
+            "account_id": account_id,
+            "category_id": category_id,
+            "amount": amount,
+            "tx_count": count,
+        }
+        for (year, month, tx_type, account_id, category_id), (amount, count) in deltas.items()
+        if amount or count
+    ]
+    if not rows:
+        return
+
+    stmt = insert(MonthlyTotal)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["year", "month", "type", "account_id", "category_id"],
+        set_={
+            "amount": MonthlyTotal.amount + stmt.excluded.amount,
+            "tx_count": MonthlyTotal.tx_count + stmt.excluded.tx_count,
+        },
+    )
+    db.execute(stmt, rows)
+
+    months = {(row["year"], row["month"]) for row in rows}
+    db.execute(
+        delete(MonthlyTotal).where(
+            MonthlyTotal.tx_count <= 0,
+            tuple_(MonthlyTotal.year, MonthlyTotal.month).in_(months),
+        )
+    )
+
+
+def record_transaction_changes(
+    db: Session, removed: Iterable[TxSnapshot] = (), added: Iterable[TxSnapshot] = ()
+) -> None:
+    removed, added = list(removed), list(added)
+    deltas: dict[TotalsKey, list[int]] = {}
+    months: set[tuple[int, int]] = set()
+    for sign, snaps in ((-1, removed), (1, added)):
+        for snap in snaps:
+            delta = deltas.setdefault(_key(snap), [0, 0])
+            delta[0] += sign * snap.amount
+            delta[1] += sign
+            months.add((snap.year, snap.month))
+    _apply_deltas(db, deltas)
+    record_balance_changes(db, removed, added)
+    bump_month_versions(db, months)
+
+
+def _reassign(db: Session, column, ref_ids: Collection[int]) -> None:
+    rows = db.execute(
+        select(
+            MonthlyTotal.year,
+            MonthlyTotal.month,
+            MonthlyTotal.type,
+            MonthlyTotal.account_id,
+            MonthlyTotal.category_id,
+            MonthlyTotal.amount,
+            MonthlyTotal.tx_count,
+        ).where(column.in_(ref_ids))
+    ).all()
+    deltas: dict[TotalsKey, list[int]] = {}
+    for year, month, tx_type, account_id, category_id, amount, count in rows:
+        if column is MonthlyTotal.account_id:
+            target = (year, month, tx_type, NO_REF, category_id)
+        else:
+            target = (year, month, tx_type, account_id, NO_REF)
+        for item, sign in (((year, month, tx_type, account_id, category_id), -1), (target, 1)):
+            delta = deltas.setdefault(item, [0, 0])
+            delta[0] += sign * amount
+            delta[1] += sign * count
+    _apply_deltas(db, deltas)
+
+
+def detach_accounts(db: Session, account_ids: Collection[int]) -> None:
+    _reassign(db, MonthlyTotal.account_id, account_ids)
+    drop_account_balances(db, account_ids)
+
+
+def detach_categories(db: Session, category_ids: Collection[int]) -> None:
+    _reassign(db, MonthlyTotal.category_id, category_ids)
+
+
+def _expected_totals(db: Session) -> dict[TotalsKey, tuple[int, int]]:
+    db.flush()
+    account_key = func.coalesce(Transaction.account_id, NO_REF)
+    category_key = func.coalesce(Transaction.category_id, NO_REF)
+    rows = db.execute(
+        select(
+            Transaction.year,
+            Transaction.month,
+            Transaction.type,
+            account_key,
+            category_key,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+        ).group_by(Transaction.year, Transaction.month, Transaction.type, account_key, category_key)
+    ).all()
+    return {(y, m, t, a, c): (int(amount), int(count)) for y, m, t, a, c, amount, count in rows}
+
+
+def _stored_totals(db: Session) -> dict[TotalsKey, tuple[int, int]]:
+    rows = db.execute(
+        select(
+            MonthlyTotal.year,
+            MonthlyTotal.month,
+            MonthlyTotal.type,
+            MonthlyTotal.account_id,
+            MonthlyTotal.category_id,
+            MonthlyTotal.amount,
+            MonthlyTotal.tx_count,
+        )
+    ).all()
+    return {(y, m, t, a, c): (amount, count) for y, m, t, a, c, amount, count in rows if count}
+
+
+def verify_monthly_totals(db: Session) -> list[dict[str, Any]]:
+    expected = _expected_totals(db)
+    stored = _stored_totals(db)
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys()):
+        if expected.get(key) != stored.get(key):
+            year, month, tx_type, account_id, category_id = key
+            mismatches.append(
+                {
+                    "year": year,
+                    "month": month,
+                    "type": tx_type,
+                    "account_id": account_id,
+                    "category_id": category_id,
+                    "expected": expected.get(key, (0, 0)),
+                    "stored": stored.get(key, (0, 0)),
+                }
+            )
+    return mismatches
+
+
+def rebuild_monthly_totals(db: Session) -> int:
+    db.execute(delete(MonthlyTotal))
+    expected = _expected_totals(db)
+    if expected:
+        db.execute(
+            insert(MonthlyTotal),
+            [
+                {
+                    "year": year,
+                    "month": month,
+                    "type": tx_type,
+                    "account_id": account_id,
+                    "category_id": category_id,
+                    "amount": amount,
+                    "tx_count": count,
+                }
+                for (year, month, tx_type, account_id, category_id), (amount, count) in expected.items()
+            ],
+        )
+    return len(expected)
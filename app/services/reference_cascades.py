@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import delete, select, union, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Category, MonthlyBalance, Transaction
+from app.services.data_versions import bump_month_versions
+from app.services.monthly_totals import detach_accounts, detach_categories
+
+
+def _existing(db: Session, column, ids: Iterable[int]) -> list[int]:
+    ids = set(ids)
+    if not ids:
+        return []
+    return sorted(db.scalars(select(column).where(column.in_(ids))).all())
+
+
+def _months(db: Session, *queries) -> set[tuple[int, int]]:
+    query = union(*queries) if len(queries) > 1 else queries[0].distinct()
+    return {(year, month) for year, month in db.execute(query).all()}
+
+
+def delete_accounts(db: Session, account_ids: Iterable[int]) -> list[int]:
+    ids = _existing(db, Account.id, account_ids)
+    if not ids:
+        return []
+    months = _months(
+        db,
+        select(Transaction.year, Transaction.month).where(Transaction.account_id.in_(ids)),
+        select(Transaction.year, Transaction.month).where(Transaction.to_account_id.in_(ids)),
+        select(MonthlyBalance.year, MonthlyBalance.month).where(MonthlyBalance.account_id.in_(ids)),
+    )
+    db.execute(
+        update(Transaction).where(Transaction.account_id.in_(ids)).values(account_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(
+        update(Transaction).where(Transaction.to_account_id.in_(ids)).values(to_account_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(
+        delete(MonthlyBalance).where(MonthlyBalance.account_id.in_(ids)),
+        execution_options={"synchronize_session": False},
+    )
+    bump_month_versions(db, months)
+    detach_accounts(db, ids)
+    db.execute(delete(Account).where(Account.id.in_(ids)))
+    db.expire_all()
+    return ids
+
+
+def delete_categories(db: Session, category_ids: Iterable[int]) -> list[int]:
+    ids = _existing(db, Category.id, category_ids)
+    if not ids:
+        return []
+    months = _months(db, select(Transaction.year, Transaction.month).where(Transaction.category_id.in_(ids)))
+    db.execute(
+        update(Transaction).where(Transaction.category_id.in_(ids)).values(category_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    bump_month_versions(db, months)
+    detach_categories(db, ids)
+    db.execute(delete(Category).where(Category.id.in_(ids)))
+    db.expire_all()
+    return ids
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import NamedTuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Category, Liability
+from app.db.session import cache_engine
+
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "30"))
+
+
+class AccountRef(NamedTuple):
+    id: int
+    name: str
+    kind: str
+    is_active: bool
+    note: str | None
+
+
+class CategoryRef(NamedTuple):
+    id: int
+    name: str
+    is_fixed: bool
+    is_active: bool
+
+
+class LiabilityRef(NamedTuple):
+    id: int
+    name: str
+    balance: int
+    monthly_payment: int | None
+    payment_day: int | None
+    note: str | None
+    is_active: bool
+
+
+class ReferenceData:
+    def __init__(
+        self,
+        version: int,
+        accounts: list[AccountRef],
+        categories: list[CategoryRef],
+        liabilities: list[LiabilityRef],
+    ) -> None:
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.accounts = tuple(accounts)
+        self.categories = tuple(categories)
+        self.liabilities = tuple(liabilities)
+        self.active_accounts = tuple(a for a in accounts if a.is_active)
+        self.active_categories = tuple(c for c in categories if c.is_active)
+        self.active_liabilities = tuple(item for item in liabilities if item.is_active)
+        self.opening_accounts = tuple(a for a in self.active_accounts if a.kind != "card")
+        self.account_names = {a.id: a.name for a in accounts}
+        self.category_names = {c.id: c.name for c in categories}
+
+
+_versions: WeakKeyDictionary[Engine, int] = WeakKeyDictionary()
+_caches: WeakKeyDictionary[Engine, ReferenceData] = WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def _engine(db: Session) -> Engine:
+    return cache_engine(db.get_bind())
+
+
+def _load(db: Session, version: int) -> ReferenceData:
+    accounts = [
+        AccountRef(*row)
+        for row in db.execute(
+            select(Account.id, Account.name, Account.kind, Account.is_active, Account.note).order_by(Account.name.asc())
+        ).all()
+    ]
+    categories = [
+        CategoryRef(*row)
+        for row in db.execute(
+            select(Category.id, Category.name, Category.is_fixed, Category.is_active).order_by(Category.name.asc())
+        ).all()
+    ]
+    liabilities = [
+        LiabilityRef(*row)
+        for row in db.execute(
+            select(
+                Liability.id,
+                Liability.name,
+                Liability.balance,
+                Liability.monthly_payment,
+                Liability.payment_day,
+                Liability.note,
+                Liability.is_active,
+            ).order_by(Liability.name.asc())
+        ).all()
+    ]
+    return ReferenceData(version, accounts, categories, liabilities)
+
+
+def get_reference_data(db: Session) -> ReferenceData:
+    engine = _engine(db)
+    version = _versions.get(engine, 0)
+    cached = _caches.get(engine)
+    if cached is None or cached.version != version or time.monotonic() - cached.loaded_at > REFERENCE_CACHE_TTL:
+        cached = _load(db, version)
+        with _caches_lock:
+            if _versions.get(engine, 0) == version:
+                _caches[engine] = cached
+    return cached
+
+
+def invalidate_reference_data(db: Session) -> int:
+    engine = _engine(db)
+    with _caches_lock:
+        version = _versions[engine] = _versions.get(engine, 0) + 1
+        _caches.pop(engine, None)
+    return version
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import ColumnElement, column, exists, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from app.db.fts import FTS_TABLE
+from app.db.models import Transaction
+
+MIN_TRIGRAM_LENGTH = 3
+SEARCH_COLUMNS = ("description", "note", "category_free", "account_name", "category_name")
+
+transactions_fts = table(FTS_TABLE, column("rowid"), *(column(name) for name in SEARCH_COLUMNS))
+
+
+def _phrase(q: str) -> str:
+    return '"' + q.replace('"', '""') + '"'
+
+
+def _fts_condition(q: str) -> ColumnElement[bool]:
+    if len(q) >= MIN_TRIGRAM_LENGTH:
+        return literal_column(FTS_TABLE).op("MATCH")(_phrase(q))
+    like = f"%{q}%"
+    return or_(*(transactions_fts.c[name].like(like) for name in SEARCH_COLUMNS))
+
+
+def search_condition(q: str) -> ColumnElement[bool]:
+    if len(q) < MIN_TRIGRAM_LENGTH:
+        # LIKE cannot use the trigram index, so probe the already filtered rows by rowid instead of scanning it all.
+        return exists().where(transactions_fts.c.rowid == Transaction.id, _fts_condition(q))
+    matched = select(transactions_fts.c.rowid).where(_fts_condition(q))
+    return Transaction.id.in_(matched)
+
+
+def search_transactions(
+    db: Session,
+    q: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> list[tuple[Transaction, float | None]]:
+    ranked = len(q) >= MIN_TRIGRAM_LENGTH
+    score = literal_column(f"bm25({FTS_TABLE})") if ranked else literal_column("NULL")
+    query = (
+        select(Transaction, score.label("score"))
+        .join(transactions_fts, transactions_fts.c.rowid == Transaction.id)
+        .where(_fts_condition(q))
+    )
+    if date_from is not None:
+        query = query.where(Transaction.date >= date_from)
+    if date_to is not None:
+        query = query.where(Transaction.date <= date_to)
+    if ranked:
+        query = query.order_by(literal_column("score"), Transaction.date.desc(), Transaction.id.desc())
+    else:
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+    rows = db.execute(query.limit(limit).offset(offset)).all()
+    return [(tx, score) for tx, score in rows]
@@ -1,19 +1,72 @@
 from __future__ import annotations
 
-from sqlalchemy import and_, func, select
+import threading
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from app.db.models import MonthlyBalance, Transaction
+from app.db.models import MonthlyBalance, MonthlyTotal, Transaction
+from app.db.session import cache_engine
+from app.services.data_versions import get_month_versions
+from app.services.reference_data import get_reference_data
+
+SUMMARY_TYPES = ("income", "expense", "adjust")
+OPENING_KIND = "opening"
+UNCATEGORIZED_LABEL = "未分類"
+
+_matrix_caches: WeakKeyDictionary[Engine, dict[int, tuple[tuple, dict[str, Any]]]] = WeakKeyDictionary()
+_matrix_lock = threading.Lock()
+
 
+def _month_totals(db: Session, year: int, month: int | None = None) -> dict[int, dict[str, int]]:
+    tx_query = (
+        select(MonthlyTotal.month, MonthlyTotal.type.label("kind"), func.sum(MonthlyTotal.amount).label("total"))
+        .where(MonthlyTotal.year == year, MonthlyTotal.type.in_(SUMMARY_TYPES))
+        .group_by(MonthlyTotal.month, MonthlyTotal.type)
+    )
+    balance_query = (
+        select(
+            MonthlyBalance.month,
+            literal(OPENING_KIND).label("kind"),
+            func.sum(MonthlyBalance.opening_balance).label("total"),
+        )
+        .where(MonthlyBalance.year == year)
+        .group_by(MonthlyBalance.month)
+    )
+    if month is not None:
+        tx_query = tx_query.where(MonthlyTotal.month == month)
+        balance_query = balance_query.where(MonthlyBalance.month == month)
 
-def _sum_amount(db: Session, *conditions) -> int:
-    value = db.scalar(select(func.coalesce(func.sum(Transaction.amount), 0)).where(and_(*conditions)))
-    return int(value or 0)
+    totals: dict[int, dict[str, int]] = {}
+    for row_month, kind, total in db.execute(union_all(tx_query, balance_query)).all():
+        totals.setdefault(row_month, {})[kind] = int(total or 0)
+    return totals
+
+
+def _build_month_summary(totals: dict[str, int]) -> dict[str, int]:
+    income_total = totals.get("income", 0)
+    expense_total = totals.get("expense", 0)
+    return {
+        "income_total": income_total,
+        "expense_total": expense_total,
+        "net": income_total - expense_total,
+        "opening_balance": totals.get(OPENING_KIND, 0),
+        "adjust_total": totals.get("adjust", 0),
+    }
 
 
 def get_year_summary(db: Session, year: int) -> dict[str, int]:
-    income_total = _sum_amount(db, Transaction.year == year, Transaction.type == "income")
-    expense_total = _sum_amount(db, Transaction.year == year, Transaction.type == "expense")
+    rows = db.execute(
+        select(MonthlyTotal.type, func.sum(MonthlyTotal.amount))
+        .where(MonthlyTotal.year == year, MonthlyTotal.type.in_(("income", "expense")))
+        .group_by(MonthlyTotal.type)
+    ).all()
+    totals = {tx_type: int(total or 0) for tx_type, total in rows}
+    income_total = totals.get("income", 0)
+    expense_total = totals.get("expense", 0)
     return {
         "income_total": income_total,
         "expense_total": expense_total,
@@ -22,28 +75,61 @@ def get_year_summary(db: Session, year: int) -> dict[str, int]:
 
 
 def get_month_summary(db: Session, year: int, month: int) -> dict[str, int]:
-    income_total = _sum_amount(
-        db, Transaction.year == year, Transaction.month == month, Transaction.type == "income"
-    )
-    expense_total = _sum_amount(
-        db, Transaction.year == year, Transaction.month == month, Transaction.type == "expense"
-    )
-    adjust_total = _sum_amount(
-        db, Transaction.year == year, Transaction.month == month, Transaction.type == "adjust"
-    )
+    totals = _month_totals(db, year, month)
+    return _build_month_summary(totals.get(month, {}))
 
-    opening = db.scalar(
-        select(func.coalesce(func.sum(MonthlyBalance.opening_balance), 0)).where(
-            MonthlyBalance.year == year,
-            MonthlyBalance.month == month,
-        )
-    )
-    opening_balance = int(opening or 0)
 
+def get_year_month_summaries(db: Session, year: int) -> list[dict[str, int]]:
+    totals = _month_totals(db, year)
+    return [{"month": month, **_build_month_summary(totals.get(month, {}))} for month in range(1, 13)]
+
+
+def _column_order(key: tuple[int | None, str | None], order: dict[int, int]) -> tuple[int, int, int, str]:
+    category_id, category_free = key
+    if category_id is not None:
+        return (0, order.get(category_id, len(order)), category_id, "")
+    return (1, 0, 0, category_free) if category_free else (2, 0, 0, "")
+
+
+def _category_matrix(db: Session, year: int) -> dict[str, Any]:
+    rows = db.execute(
+        select(Transaction.month, Transaction.category_id, Transaction.category_free, func.sum(Transaction.amount))
+        .where(Transaction.year == year, Transaction.type == "expense")
+        .group_by(Transaction.month, Transaction.category_id, Transaction.category_free)
+    ).all()
+    cells: dict[tuple[int | None, str | None], list[int]] = {}
+    for month, category_id, category_free, total in rows:
+        key = (category_id, None) if category_id is not None else (None, category_free or None)
+        cells.setdefault(key, [0] * 12)[month - 1] += int(total or 0)
+
+    refs = get_reference_data(db)
+    order = {category.id: index for index, category in enumerate(refs.categories)}
+    keys = sorted(cells, key=lambda key: _column_order(key, order))
+    values = [cells[key] for key in keys]
     return {
-        "income_total": income_total,
-        "expense_total": expense_total,
-        "net": income_total - expense_total,
-        "opening_balance": opening_balance,
-        "adjust_total": adjust_total,
+        "year": year,
+        "months": list(range(1, 13)),
+        "category_ids": [category_id for category_id, _ in keys],
+        "category_frees": [category_free for _, category_free in keys],
+        "labels": [
+            refs.category_names.get(category_id, f"#{category_id}")
+            if category_id is not None
+            else category_free or UNCATEGORIZED_LABEL
+            for category_id, category_free in keys
+        ],
+        "values": values,
+        "month_totals": [sum(column[index] for column in values) for index in range(12)],
+        "column_totals": [sum(column) for column in values],
     }
+
+
+def get_year_category_matrix(db: Session, year: int) -> dict[str, Any]:
+    engine = cache_engine(db.get_bind())
+    key = (tuple(sorted(get_month_versions(db, year).items())), get_reference_data(db).version)
+    cached = _matrix_caches.get(engine, {}).get(year)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    matrix = _category_matrix(db, year)
+    with _matrix_lock:
+        _matrix_caches.setdefault(engine, {})[year] = (key, matrix)
+    return matrix
@@ -1,6 +1,25 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import os
+from datetime import date
+from typing import Any
+
+from pydantic import TypeAdapter
+from pydantic import ValidationError as SchemaValidationError
+from sqlalchemy import Select, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Category, Transaction
 from app.schemas.common import TransactionCreate, TransactionUpdate
+from app.services.month_locks import locked_months
+from app.services.monthly_totals import record_transaction_changes, snapshot_values
+from app.services.search import search_condition
+
+TRANSACTION_BATCH_LIMIT = int(os.getenv("TRANSACTION_BATCH_LIMIT", "5000"))
+
+_batch_adapter = TypeAdapter(list[TransactionCreate])
 
 
 class ValidationError(ValueError):
@@ -23,3 +42,150 @@ def validate_transaction_input(payload: TransactionCreate | TransactionUpdate) -
 
     if tx_type in {"income", "expense"} and to_account_id:
         raise ValidationError("to_account_id must be null for income/expense")
+
+
+def encode_cursor(tx_date: date, tx_id: int) -> str:
+    raw = f"{tx_date.isoformat()}|{tx_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        date_text, id_text = raw.split("|", 1)
+        return date.fromisoformat(date_text), int(id_text)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValidationError("invalid cursor") from exc
+
+
+def _apply_search(query: Select, q: str | None) -> Select:
+    if not q:
+        return query
+    return query.where(search_condition(q))
+
+
+def list_month_transactions(
+    db: Session, year: int, month: int, limit: int = 100, offset: int = 0, q: str | None = None
+) -> list[Transaction]:
+    query = select(Transaction).where(Transaction.year == year, Transaction.month == month)
+    query = _apply_search(query, q)
+    query = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit).offset(offset)
+    return list(db.scalars(query).all())
+
+
+def page_transactions(
+    db: Session,
+    year: int | None = None,
+    month: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+    q: str | None = None,
+) -> dict[str, Any]:
+    if month is not None and year is None:
+        raise ValidationError("month requires year")
+    if month is not None and not 1 <= month <= 12:
+        raise ValidationError("month must be 1-12")
+
+    query = select(Transaction)
+    if year is not None:
+        query = query.where(Transaction.year == year)
+    if month is not None:
+        query = query.where(Transaction.month == month)
+    if date_from is not None:
+        query = query.where(Transaction.date >= date_from)
+    if date_to is not None:
+        query = query.where(Transaction.date <= date_to)
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Transaction.date, Transaction.id) < tuple_(cursor_date, cursor_id))
+    query = _apply_search(query, q)
+
+    query = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1)
+    rows = db.scalars(query).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].date, items[-1].id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _parse_batch(items: list[Any], errors: dict[int, str]) -> dict[int, TransactionCreate]:
+    indexes = list(range(len(items)))
+    try:
+        return dict(zip(indexes, _batch_adapter.validate_python(items)))
+    except SchemaValidationError as exc:
+        for error in exc.errors(include_url=False):
+            index, *field = error["loc"]
+            errors.setdefault(int(index), f"{'.'.join(map(str, field)) or 'item'}: {error['msg']}")
+    indexes = [index for index in indexes if index not in errors]
+    return dict(zip(indexes, _batch_adapter.validate_python([items[index] for index in indexes])))
+
+
+def _existing_ids(db: Session, column, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))).all())
+
+
+def _find_missing_reference(payload: Any, accounts: set[int], categories: set[int]) -> str | None:
+    if payload.account_id and payload.account_id not in accounts:
+        return "account not found"
+    if payload.to_account_id and payload.to_account_id not in accounts:
+        return "to_account not found"
+    if payload.category_id and payload.category_id not in categories:
+        return "category not found"
+    return None
+
+
+def missing_reference(db: Session, payload: Any) -> str | None:
+    # Checked against the database, not the reference cache, which can lag writes from other workers.
+    accounts = _existing_ids(db, Account.id, {ref for ref in (payload.account_id, payload.to_account_id) if ref})
+    categories = _existing_ids(db, Category.id, {payload.category_id} if payload.category_id else set())
+    return _find_missing_reference(payload, accounts, categories)
+
+
+def validate_transaction_batch(
+    db: Session, items: list[Any], today: date | None = None
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    today = today or date.today()
+    errors: dict[int, str] = {}
+    payloads = _parse_batch(items, errors)
+
+    locked = locked_months(db, fresh=True)
+    for index, payload in payloads.items():
+        if payload.date > today:
+            errors[index] = "future date is not allowed"
+        elif (payload.date.year, payload.date.month) in locked:
+            errors[index] = "month is locked"
+        else:
+            try:
+                validate_transaction_input(payload)
+            except ValidationError as exc:
+                errors[index] = str(exc)
+
+    valid = {index: payload for index, payload in payloads.items() if index not in errors}
+    account_ids = {ref for p in valid.values() for ref in (p.account_id, p.to_account_id) if ref}
+    category_ids = {p.category_id for p in valid.values() if p.category_id}
+    accounts = _existing_ids(db, Account.id, account_ids)
+    categories = _existing_ids(db, Category.id, category_ids)
+    for index, payload in valid.items():
+        missing = _find_missing_reference(payload, accounts, categories)
+        if missing:
+            errors[index] = missing
+
+    rows = [
+        {**payload.model_dump(), "year": payload.date.year, "month": payload.date.month, "user_id": 1}
+        for index, payload in sorted(payloads.items())
+        if index not in errors
+    ]
+    return rows, [{"index": index, "detail": detail} for index, detail in sorted(errors.items())]
+
+
+def insert_transaction_batch(db: Session, rows: list[dict[str, Any]]) -> list[int]:
+    if not rows:
+        return []
+    # SQLite hands out increasing rowids in VALUES order inside one write transaction, so sorting the RETURNING
+    # ids restores item order without sort_by_parameter_order, which degrades to one INSERT per row here.
+    ids = sorted(db.scalars(insert(Transaction).returning(Transaction.id), rows).all())
+    record_transaction_changes(db, added=[snapshot_values(row) for row in rows])
+    return ids
@@ -2,23 +2,31 @@ from __future__ import annotations
 
 import calendar
 import json
+import time
 from datetime import date
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 
 from app.db.models import Account, Category, Liability, MonthlyBalance, Transaction, User
-from app.db.session import get_db
-from app.services.auth import verify_password
+from app import metrics, profiling
+from app.db.session import get_async_db, get_db
+from app.services.account_balances import get_account_balances, record_opening_changes
+from app.services.auth import PasswordHasherBusy, password_hasher
+from app.services.data_versions import bump_month_versions
 from app.services.month_locks import is_month_locked, set_month_lock
+from app.services.monthly_totals import record_transaction_changes, snapshot
+from app.services.reference_cascades import delete_accounts, delete_categories
+from app.services.reference_data import AccountRef, get_reference_data, invalidate_reference_data
 from app.services.summary import get_month_summary, get_year_summary
-from app.services.transactions import ValidationError, validate_transaction_input
+from app.services.transactions import ValidationError, missing_reference, validate_transaction_input
 from app.web.auth_cookie import AUTH_COOKIE_NAME
 
-router = APIRouter(tags=["web"])
+router = APIRouter(tags=["web"], route_class=profiling.ProfiledRoute)
 templates = Jinja2Templates(directory="app/web/templates")
 
 TX_TYPE_LABELS = {
@@ -67,12 +75,8 @@ def _is_safe_next(next_path: str | None) -> bool:
     return bool(next_path and next_path.startswith("/") and not next_path.startswith("//") and not next_path.startswith("/login"))
 
 
-def _active_accounts_for_opening(db: Session) -> list[Account]:
-    return db.scalars(
-        select(Account)
-        .where(Account.is_active.is_(True), Account.kind != "card")
-        .order_by(Account.name.asc())
-    ).all()
+def _active_accounts_for_opening(db: Session) -> tuple[AccountRef, ...]:
+    return get_reference_data(db).opening_accounts
 
 
 def _ensure_month_accessible(year: int, month: int) -> None:
@@ -83,41 +87,43 @@ def _ensure_month_accessible(year: int, month: int) -> None:
 
 
 def _ensure_month_unlocked(db: Session, year: int, month: int) -> None:
-    if is_month_locked(db, year, month):
+    if is_month_locked(db, year, month, fresh=True):
         raise HTTPException(status_code=423, detail="month is locked")
 
 
-def _delete_account(db: Session, account_id: int) -> None:
-    account = db.get(Account, account_id)
-    if not account:
-        return
-    for tx in db.scalars(select(Transaction).where(Transaction.account_id == account_id)).all():
-        tx.account_id = None
-    for tx in db.scalars(select(Transaction).where(Transaction.to_account_id == account_id)).all():
-        tx.to_account_id = None
-    for bal in db.scalars(select(MonthlyBalance).where(MonthlyBalance.account_id == account_id)).all():
-        db.delete(bal)
-    db.delete(account)
-
-
-def _delete_category(db: Session, category_id: int) -> None:
-    category = db.get(Category, category_id)
-    if not category:
-        return
-    for tx in db.scalars(select(Transaction).where(Transaction.category_id == category_id)).all():
-        tx.category_id = None
-    db.delete(category)
+def _form_ids(values: list) -> list[int]:
+    ids = []
+    for raw_id in values:
+        try:
+            ids.append(int(raw_id))
+        except ValueError:
+            continue
+    return ids
 
 
 def _month_context(db: Session, year: int, month: int) -> dict:
     summary = get_month_summary(db, year, month)
-    txs = db.scalars(
-        select(Transaction)
+    to_account = aliased(Account)
+    txs = db.execute(
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.category_free,
+            Transaction.description,
+            Transaction.note,
+            Account.name.label("account_name"),
+            to_account.name.label("to_account_name"),
+            Category.name.label("category_name"),
+        )
+        .outerjoin(Account, Transaction.account_id == Account.id)
+        .outerjoin(to_account, Transaction.to_account_id == to_account.id)
+        .outerjoin(Category, Transaction.category_id == Category.id)
         .where(Transaction.year == year, Transaction.month == month)
         .order_by(Transaction.date.desc(), Transaction.id.desc())
     ).all()
-    accounts = db.scalars(select(Account).where(Account.is_active.is_(True)).order_by(Account.name.asc())).all()
-    categories = db.scalars(select(Category).where(Category.is_active.is_(True)).order_by(Category.name.asc())).all()
+    refs = get_reference_data(db)
 
     is_locked = is_month_locked(db, year, month)
     max_day = calendar.monthrange(year, month)[1]
@@ -127,8 +133,8 @@ def _month_context(db: Session, year: int, month: int) -> dict:
     return {
         "summary": summary,
         "transactions": txs,
-        "accounts": accounts,
-        "categories": categories,
+        "accounts": refs.active_accounts,
+        "categories": refs.active_categories,
         "is_locked": is_locked,
         "max_day": max_day,
         "tx_type_labels": TX_TYPE_LABELS,
@@ -146,15 +152,31 @@ def login_page(request: Request) -> HTMLResponse:
 
 
 @router.post("/login", response_class=HTMLResponse)
-def login_submit(
+async def login_submit(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
     next_path: str = Form(default="/"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Response:
-    user = db.scalar(select(User).where(User.name == username))
-    if user is None or not verify_password(password, user.password_hash):
+    started = time.perf_counter()
+    user = await db.scalar(select(User).where(User.name == username))
+    try:
+        verified = user is not None and await password_hasher.verify(password, user.password_hash)
+    except PasswordHasherBusy:
+        metrics.record_login("rejected", time.perf_counter() - started)
+        return templates.TemplateResponse(
+            request,
+            "login.html",
+            {
+                "next_path": next_path if _is_safe_next(next_path) else "/",
+                "error": "ログインが混み合っています。しばらくしてから再度お試しください。",
+            },
+            status_code=503,
+            headers={"Retry-After": "1"},
+        )
+    metrics.record_login("success" if verified else "failure", time.perf_counter() - started)
+    if not verified:
         return templates.TemplateResponse(
             request,
             "login.html",
@@ -185,8 +207,8 @@ def logout() -> RedirectResponse:
 def index(request: Request, year: int | None = None, db: Session = Depends(get_db)) -> HTMLResponse:
     selected_year = _resolve_year(year)
     summary = get_year_summary(db, selected_year)
-    accounts = db.scalars(select(Account).where(Account.is_active.is_(True)).order_by(Account.name.asc())).all()
-    liabilities = db.scalars(select(Liability).where(Liability.is_active.is_(True)).order_by(Liability.name.asc())).all()
+    refs = get_reference_data(db)
+    balances = get_account_balances(db)
 
     max_month = _max_month_for_year(selected_year)
     months = list(range(1, max_month + 1))
@@ -197,8 +219,9 @@ def index(request: Request, year: int | None = None, db: Session = Depends(get_d
         {
             "year": selected_year,
             "summary": summary,
-            "accounts": accounts,
-            "liabilities": liabilities,
+            "accounts": refs.active_accounts,
+            "balances": balances,
+            "liabilities": refs.active_liabilities,
             "months": months,
             **_base_context(selected_year),
         },
@@ -284,10 +307,15 @@ def create_or_update_transaction(
     except ValidationError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
+    missing = missing_reference(db, payload)
+    if missing:
+        raise HTTPException(status_code=404, detail=missing)
+
     if tx_id:
         current = db.get(Transaction, tx_id)
         if not current:
             raise HTTPException(status_code=404, detail="transaction not found")
+        before = snapshot(current)
         for field in [
             "date",
             "type",
@@ -302,8 +330,10 @@ def create_or_update_transaction(
             "month",
         ]:
             setattr(current, field, getattr(payload, field))
+        record_transaction_changes(db, removed=[before], added=[snapshot(current)])
     else:
         db.add(payload)
+        record_transaction_changes(db, added=[snapshot(payload)])
 
     db.commit()
     return RedirectResponse(url=f"/month/{year}/{month}", status_code=303)
@@ -315,6 +345,7 @@ def delete_transaction_web(year: int, month: int, tx_id: int, db: Session = Depe
     _ensure_month_unlocked(db, year, month)
     tx = db.get(Transaction, tx_id)
     if tx:
+        record_transaction_changes(db, removed=[snapshot(tx)])
         db.delete(tx)
         db.commit()
     return RedirectResponse(url=f"/month/{year}/{month}", status_code=303)
@@ -394,6 +425,8 @@ async def save_opening_balances(
                 )
             )
 
+    record_opening_changes(db, [(account.id, year, month) for account in accounts])
+    bump_month_versions(db, [(year, month)])
     db.commit()
     return RedirectResponse(url=f"/month/{year}/{month}", status_code=303)
 
@@ -401,16 +434,14 @@ async def save_opening_balances(
 @router.get("/settings", response_class=HTMLResponse)
 def settings_page(request: Request, year: int | None = None, db: Session = Depends(get_db)) -> HTMLResponse:
     selected_year = _resolve_year(year)
-    accounts = db.scalars(select(Account).order_by(Account.name.asc())).all()
-    categories = db.scalars(select(Category).order_by(Category.name.asc())).all()
-    liabilities = db.scalars(select(Liability).order_by(Liability.name.asc())).all()
+    refs = get_reference_data(db)
     return templates.TemplateResponse(
         request,
         "settings.html",
         {
-            "accounts": accounts,
-            "categories": categories,
-            "liabilities": liabilities,
+            "accounts": refs.accounts,
+            "categories": refs.categories,
+            "liabilities": refs.liabilities,
             **_base_context(selected_year),
         },
     )
@@ -427,6 +458,7 @@ def create_account_web(
     selected_year = _resolve_year(year)
     db.add(Account(name=name, kind=kind, note=note, is_active=True, user_id=1))
     db.commit()
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
 
 
@@ -454,6 +486,7 @@ def import_accounts_json_web(
         db.commit()
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"invalid json: {exc}") from exc
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
 
 
@@ -463,12 +496,9 @@ async def delete_accounts_web(
 ) -> RedirectResponse:
     selected_year = _resolve_year(year)
     form = await request.form()
-    for raw_id in form.getlist("account_ids"):
-        try:
-            _delete_account(db, int(raw_id))
-        except ValueError:
-            continue
+    delete_accounts(db, _form_ids(form.getlist("account_ids")))
     db.commit()
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
 
 
@@ -481,6 +511,7 @@ def create_category_web(
     selected_year = _resolve_year(year)
     db.add(Category(name=name, is_fixed=False, is_active=True, user_id=1))
     db.commit()
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
 
 
@@ -490,12 +521,9 @@ async def delete_categories_web(
 ) -> RedirectResponse:
     selected_year = _resolve_year(year)
     form = await request.form()
-    for raw_id in form.getlist("category_ids"):
-        try:
-            _delete_category(db, int(raw_id))
-        except ValueError:
-            continue
+    delete_categories(db, _form_ids(form.getlist("category_ids")))
     db.commit()
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
 
 
@@ -522,6 +550,7 @@ def create_liability_web(
         )
     )
     db.commit()
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
 
 
@@ -539,4 +568,30 @@ async def delete_liabilities_web(
         if item:
             db.delete(item)
     db.commit()
+    invalidate_reference_data(db)
     return RedirectResponse(url=f"/settings?year={selected_year}", status_code=303)
+
+
+@router.get("/admin/profiles", response_class=HTMLResponse)
+def profiles_page(request: Request, year: int | None = None) -> HTMLResponse:
+    selected_year = _resolve_year(year)
+    return templates.TemplateResponse(
+        request,
+        "profiles.html",
+        {
+            "profiles": profiling.list_profiles(),
+            "enabled": profiling.REQUEST_PROFILING,
+            "profile_dir": profiling.PROFILE_DIR,
+            "header": profiling.PROFILE_HEADER,
+            "query_param": profiling.PROFILE_QUERY_PARAM,
+            **_base_context(selected_year),
+        },
+    )
+
+
+@router.get("/admin/profiles/{profile_id}.prof")
+def download_profile(profile_id: str) -> FileResponse:
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import Transaction, User
+from app.db.session import Base
+from app.db.storage import apply_storage_profile, engine_options, get_storage_profile
+from app.schemas import TransactionRead
+from app.services.monthly_totals import rebuild_monthly_totals
+from app.services.summary import get_month_summary
+from app.services.transactions import list_month_transactions
+
+
+def _build_app(path: Path, profile_name: str, pool_timeout: float) -> FastAPI:
+    profile = get_storage_profile(profile_name)
+    url = f"sqlite:///{path}"
+    async_url = f"sqlite+aiosqlite:///{path}"
+    engine = create_engine(url, future=True, pool_timeout=pool_timeout, **engine_options(url, profile))
+    async_engine = create_async_engine(async_url, pool_timeout=pool_timeout, **engine_options(async_url, profile))
+    apply_storage_profile(engine, profile)
+    apply_storage_profile(async_engine.sync_engine, profile)
+    session_factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_db():
+        with session_factory() as db:
+            yield db
+
+    async def get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    bench = FastAPI()
+
+    @bench.get("/sync/transactions/{year}/{month}", response_model=list[TransactionRead])
+    def sync_transactions(year: int, month: int, db: Session = Depends(get_db)):
+        return list_month_transactions(db, year, month, limit=50)
+
+    @bench.get("/async/transactions/{year}/{month}", response_model=list[TransactionRead])
+    async def async_transactions(year: int, month: int, db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(list_month_transactions, year, month, 50)
+
+    @bench.get("/sync/summary/{year}/{month}")
+    def sync_summary(year: int, month: int, db: Session = Depends(get_db)):
+        return get_month_summary(db, year, month)
+
+    @bench.get("/async/summary/{year}/{month}")
+    async def async_summary(year: int, month: int, db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(get_month_summary, year, month)
+
+    Base.metadata.create_all(bind=engine)
+    with session_factory() as db:
+        db.add(User(id=1, name="default"))
+        db.flush()
+        db.execute(
+            insert(Transaction),
+            [
+                {
+                    "date": date(2025, i % 12 + 1, i % 28 + 1),
+                    "year": 2025,
+                    "month": i % 12 + 1,
+                    "type": "income" if i % 10 == 0 else "expense",
+                    "amount": 100 + i % 5000,
+                    "description": f"item {i}",
+                    "user_id": 1,
+                }
+                for i in range(24000)
+            ],
+        )
+        rebuild_monthly_totals(db)
+        db.commit()
+    return bench
+
+
+async def _run(
+    bench: FastAPI, path: str, clients: int, requests_per_client: int, request_timeout: float
+) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    transport = httpx.ASGITransport(app=bench, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+
+        async def worker(index: int) -> None:
+            nonlocal errors
+            for n in range(requests_per_client):
+                month = (index + n) % 12 + 1
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(client.get(path.format(month=month)), request_timeout)
+                except TimeoutError:
+                    response = None
+                latencies.append(time.perf_counter() - started)
+                if response is None or response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "errors": errors,
+    }
+
+
+async def _run_all(bench: FastAPI, clients: int, requests_per_client: int, request_timeout: float) -> None:
+    print(f"{'endpoint':<32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for kind in ("transactions", "summary"):
+        for mode in ("sync", "async"):
+            path = f"/{mode}/{kind}/2025/{{month}}"
+            result = await _run(bench, path, clients, requests_per_client, request_timeout)
+            print(
+                f"{path:<32} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['errors']:>6}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the sync (threadpool) and async database paths.")
+    parser.add_argument("--clients", type=int, default=250)
+    parser.add_argument("--requests", type=int, default=8, help="requests per client")
+    parser.add_argument("--profile", default="balanced")
+    parser.add_argument("--request-timeout", type=float, default=10.0, help="client-side timeout per request")
+    parser.add_argument("--pool-timeout", type=float, default=5.0, help="seconds to wait for a pooled connection")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench = _build_app(Path(tmp) / "bench.db", args.profile, args.pool_timeout)
+        print(f"{args.clients} clients x {args.requests} requests, profile={args.profile}")
+        asyncio.run(_run_all(bench, args.clients, args.requests, args.request_timeout))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
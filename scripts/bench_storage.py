@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Account, Transaction, User
+from app.db.session import Base
+from app.db.storage import STORAGE_PROFILES, apply_storage_profile, engine_options
+
+
+def _make_engine(path: Path, profile_name: str):
+    url = f"sqlite:///{path}"
+    if profile_name == "none":
+        return create_engine(url, future=True, connect_args={"check_same_thread": False})
+    profile = STORAGE_PROFILES[profile_name]
+    engine = create_engine(url, future=True, **engine_options(url, profile))
+    apply_storage_profile(engine, profile)
+    return engine
+
+
+def _seed(session_factory, rows: int) -> int:
+    with session_factory() as db:
+        db.add(User(id=1, name="default"))
+        db.flush()
+        account = Account(name="現金", kind="cash", user_id=1)
+        db.add(account)
+        db.flush()
+        db.execute(
+            Transaction.__table__.insert(),
+            [
+                {
+                    "date": date(2025, i % 12 + 1, i % 28 + 1),
+                    "year": 2025,
+                    "month": i % 12 + 1,
+                    "type": "expense",
+                    "amount": 100 + i % 1000,
+                    "account_id": account.id,
+                    "user_id": 1,
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+        return account.id
+
+
+def _run_profile(profile_name: str, seconds: float, readers: int, writers: int, rows: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _make_engine(Path(tmp) / "bench.db", profile_name)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False, future=True)
+        account_id = _seed(session_factory, rows)
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        counts_lock = threading.Lock()
+        stop = threading.Event()
+
+        def bump(key: str) -> None:
+            with counts_lock:
+                counts[key] += 1
+
+        def reader(worker: int) -> None:
+            month = worker % 12 + 1
+            while not stop.is_set():
+                try:
+                    with session_factory() as db:
+                        db.execute(
+                            select(Transaction.type, func.sum(Transaction.amount))
+                            .where(Transaction.year == 2025, Transaction.month == month)
+                            .group_by(Transaction.type)
+                        ).all()
+                    bump("reads")
+                except OperationalError:
+                    bump("locked")
+
+        def writer(worker: int) -> None:
+            day = worker % 28 + 1
+            while not stop.is_set():
+                try:
+                    with session_factory() as db:
+                        db.add(
+                            Transaction(
+                                date=date(2025, 6, day),
+                                year=2025,
+                                month=6,
+                                type="expense",
+                                amount=500,
+                                account_id=account_id,
+                                user_id=1,
+                            )
+                        )
+                        db.commit()
+                    bump("writes")
+                except OperationalError:
+                    bump("locked")
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    return {
+        "reads_per_sec": counts["reads"] / elapsed,
+        "writes_per_sec": counts["writes"] / elapsed,
+        "locked_errors": counts["locked"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare read/write throughput of the SQLite storage profiles.")
+    parser.add_argument("--profile", action="append", choices=sorted(STORAGE_PROFILES), help="repeatable, default all")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--baseline", action="store_true", help="also run without any storage profile")
+    parser.add_argument("--rows", type=int, default=20000, help="transactions seeded before the run")
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10} {'locked':>8}")
+    names = (["none"] if args.baseline else []) + (args.profile or list(STORAGE_PROFILES))
+    for name in names:
+        result = _run_profile(name, args.seconds, args.readers, args.writers, args.rows)
+        print(
+            f"{name:<10} {result['reads_per_sec']:>10.1f} {result['writes_per_sec']:>10.1f} "
+            f"{result['locked_errors']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.bench import DatasetSpec, generate_dataset, run_suite
+from app.db.models import Transaction
+from app.db.session import Base
+from app.db.storage import STORAGE_PROFILES, apply_storage_profile, engine_options, get_storage_profile
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _prepare(path: Path, spec: DatasetSpec, profile_name: str):
+    profile = get_storage_profile(profile_name)
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, future=True, **engine_options(url, profile))
+    apply_storage_profile(engine, profile)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    with session_factory() as db:
+        existing = db.scalar(select(func.count()).select_from(Transaction))
+        if existing:
+            return engine, {"transactions": existing, "reused": True}
+        started = time.perf_counter()
+        stats = generate_dataset(db, spec)
+    stats["generate_seconds"] = round(time.perf_counter() - started, 3)
+    return engine, stats
+
+
+def _print(results: dict, baseline: dict | None) -> None:
+    header = f"{'case':<22} {'first':>10} {'median':>10} {'p95':>10}"
+    print(header + (f" {'vs base':>9}" if baseline else ""))
+    for name, row in results.items():
+        line = f"{name:<22} {row['first_ms']:>10.2f} {row['median_ms']:>10.2f} {row['p95_ms']:>10.2f}"
+        base = (baseline or {}).get(name)
+        if base and base["median_ms"]:
+            line += f" {row['median_ms'] / base['median_ms']:>8.2f}x"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time the hot service paths against a generated dataset.")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--per-month", type=int, default=100, help="transactions per account and month")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-year", type=int, default=None, help="default: last year")
+    parser.add_argument("--month", type=int, default=6, help="month used by the per-month cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--query", default=None, help="search term for the q cases")
+    parser.add_argument("--case", action="append", help="repeatable, default all")
+    parser.add_argument("--profile", choices=sorted(STORAGE_PROFILES), default="balanced")
+    parser.add_argument("--db", type=Path, help="reuse or create this database instead of a temporary one")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="earlier JSON result to compare medians against")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        years=args.years, accounts=args.accounts, per_month=args.per_month, seed=args.seed, end_year=args.end_year
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, dataset = _prepare(args.db or Path(tmp) / "bench.db", spec, args.profile)
+        options = {"only": args.case} if args.case else {}
+        if args.query:
+            options["query"] = args.query
+        results = run_suite(engine, spec.last_year, args.month, repeat=args.repeat, **options)
+        engine.dispose()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "profile": args.profile,
+            "spec": spec._asdict() | {"end_year": spec.last_year},
+            "dataset": dataset,
+            "year": spec.last_year,
+            "month": args.month,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"] if args.compare else None
+    _print(results, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
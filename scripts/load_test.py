@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _print(report: dict) -> None:
+    print(f"{'scenario':<20} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, row in [*report["routes"].items(), ("total", report["total"])]:
+        print(
+            f"{name:<20} {row['requests']:>8} {row['errors']:>6} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Drive app.main:app in-process with a weighted scenario mix.")
+    parser.add_argument("--mix", default="month_page=80,transaction_post=15,csv_export=5", help="name=weight,...")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="total requests across all workers")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--per-month", type=int, default=100, help="transactions per account and month")
+    parser.add_argument("--profile", default=None, help="DB_STORAGE_PROFILE for the app engines")
+    parser.add_argument("--db", type=Path, help="reuse or create this database instead of a temporary one")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or Path(tmp) / "load.db"
+        # app.db.session builds its engines from the environment at import time.
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+        if args.profile:
+            os.environ["DB_STORAGE_PROFILE"] = args.profile
+
+        from sqlalchemy import func, select
+
+        from app.bench import DatasetSpec, generate_dataset
+        from app.bench.load import load_targets, parse_mix, run_load
+        from app.db.init_db import ensure_seed_data
+        from app.db.models import Transaction
+        from app.db.session import Base, SessionLocal, async_engine, engine
+        from app.main import app
+
+        try:
+            mix = parse_mix(args.mix)
+        except ValueError as exc:
+            parser.error(str(exc))
+        spec = DatasetSpec(years=args.years, accounts=args.accounts, per_month=args.per_month, seed=args.seed)
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            ensure_seed_data(db)
+            if not db.scalar(select(func.count()).select_from(Transaction)):
+                started = time.perf_counter()
+                print(f"generated {generate_dataset(db, spec)} in {time.perf_counter() - started:.1f}s")
+            targets = load_targets(db, spec.last_year)
+
+        print(f"{args.concurrency} workers x {args.requests} requests, mix={mix}")
+        report = asyncio.run(
+            run_load(
+                app,
+                targets,
+                mix,
+                concurrency=args.concurrency,
+                requests=args.requests,
+                seed=args.seed,
+                request_timeout=args.request_timeout,
+            )
+        )
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+    _print(report)
+    if args.output:
+        report = {"meta": {"mix": mix, "concurrency": args.concurrency, "spec": spec._asdict()}, **report}
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
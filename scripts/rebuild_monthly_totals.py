@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from app.db.session import Base, SessionLocal, engine
+from app.services.account_balances import rebuild_account_balances, verify_account_balances
+from app.services.monthly_totals import rebuild_monthly_totals, verify_monthly_totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify and rebuild the monthly_totals and account_balances rollups.")
+    parser.add_argument("--check", action="store_true", help="only verify, do not rebuild")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        mismatches = verify_monthly_totals(db)
+        for item in mismatches:
+            print(
+                f"mismatch {item['year']}-{item['month']:02d} {item['type']} "
+                f"account={item['account_id']} category={item['category_id']} "
+                f"expected={item['expected']} stored={item['stored']}"
+            )
+        balance_mismatches = verify_account_balances(db)
+        for item in balance_mismatches:
+            print(
+                f"balance mismatch account={item['account_id']} {item['year']}-{item['month']:02d} "
+                f"expected={item['expected']} stored={item['stored']}"
+            )
+        mismatches += balance_mismatches
+        if args.check:
+            print(f"{len(mismatches)} mismatches")
+            return 1 if mismatches else 0
+
+        rows = rebuild_monthly_totals(db) + rebuild_account_balances(db)
+        remaining = verify_monthly_totals(db) + verify_account_balances(db)
+        if remaining:
+            db.rollback()
+            print(f"rebuild left {len(remaining)} mismatches, rolled back")
+            return 1
+        db.commit()
+        print(f"rebuilt {rows} rows ({len(mismatches)} mismatches fixed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from app.db.fts import rebuild_search_index
+from app.db.session import Base, engine
+
+
+def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        rows = rebuild_search_index(connection)
+    print(f"indexed {rows} transactions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import argparse
 from datetime import date
 
+from app.bench import DatasetSpec, generate_dataset
 from app.db.init_db import ensure_seed_data
 from app.db.models import Account, Transaction
 from app.db.session import Base, SessionLocal, engine
+from app.services.monthly_totals import record_transaction_changes, snapshot
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Insert sample data into the application database.")
+    parser.add_argument("--years", type=int, help="generate a synthetic dataset of this many years instead")
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--per-month", type=int, default=100, help="transactions per account and month")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
     Base.metadata.create_all(bind=engine)
     with SessionLocal() as db:
         ensure_seed_data(db)
+        if args.years:
+            spec = DatasetSpec(years=args.years, accounts=args.accounts, per_month=args.per_month, seed=args.seed)
+            print(generate_dataset(db, spec))
+            return
+
         cash = db.query(Account).filter_by(name="現金").first()
         if not cash:
             cash = Account(name="現金", kind="cash", user_id=1)
@@ -28,6 +43,7 @@ def main() -> None:
             user_id=1,
         )
         db.add(tx)
+        record_transaction_changes(db, added=[snapshot(tx)])
         db.commit()
 
 
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import pytest
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.db.session import Base
+from app.db.session import Base, create_engines, get_async_db, get_db
+from app.db.storage import get_storage_profile
+from app.main import app
+from app.web.auth_cookie import AUTH_COOKIE_NAME
 
 
 @pytest.fixture()
@@ -15,3 +20,36 @@ def db() -> Session:
     with TestingSessionLocal() as session:
         yield session
     Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def web_db(tmp_path) -> Session:
+    path = tmp_path / "web.db"
+    profile = get_storage_profile("balanced")
+    engine, async_engine = create_engines(f"sqlite:///{path}", f"sqlite+aiosqlite:///{path}", profile)
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        with TestingSessionLocal() as session:
+            yield session
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestingSessionLocal() as session:
+        yield session
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(web_db) -> TestClient:
+    client = TestClient(app)
+    client.cookies.set(AUTH_COOKIE_NAME, "1")
+    return client
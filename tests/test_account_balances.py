@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import importlib
+from datetime import date
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.api.routers.accounts import delete_account
+from app.api.routers.monthly_balances import upsert_monthly_balance
+from app.api.routers.transactions import create_transaction, delete_transaction, update_transaction
+from app.db.init_db import ensure_rollups
+from app.db.models import Account, AccountBalance, Transaction, User
+from app.schemas import MonthlyBalanceUpsert, TransactionCreate, TransactionUpdate
+from app.services.account_balances import get_account_balances, rebuild_account_balances, verify_account_balances
+
+
+def _accounts(db) -> tuple[Account, Account]:
+    db.add(User(id=1, name="default"))
+    db.flush()
+    cash = Account(name="現金", kind="cash", user_id=1)
+    bank = Account(name="銀行", kind="bank", user_id=1)
+    db.add_all([cash, bank])
+    db.commit()
+    return cash, bank
+
+
+def _balance(db, account_id: int, year: int | None = None, month: int | None = None) -> int:
+    return get_account_balances(db, year, month)[account_id].balance
+
+
+def test_write_paths_keep_closing_balances_in_sync(db):
+    cash, bank = _accounts(db)
+    upsert_monthly_balance(2025, 4, MonthlyBalanceUpsert(account_id=bank.id, opening_balance=100000), db=db)
+    salary = create_transaction(
+        TransactionCreate(date=date(2025, 4, 25), type="income", amount=300000, account_id=bank.id), db=db
+    )
+    create_transaction(
+        TransactionCreate(date=date(2025, 5, 2), type="transfer", amount=20000, account_id=bank.id, to_account_id=cash.id),
+        db=db,
+    )
+    lunch = create_transaction(
+        TransactionCreate(date=date(2025, 5, 3), type="expense", amount=1200, account_id=cash.id), db=db
+    )
+    create_transaction(TransactionCreate(date=date(2025, 5, 4), type="adjust", amount=999, account_id=cash.id), db=db)
+    assert verify_account_balances(db) == []
+    assert _balance(db, bank.id) == 380000
+    assert _balance(db, cash.id) == 18800
+    assert _balance(db, bank.id, 2025, 4) == 400000
+
+    update_transaction(lunch.id, TransactionUpdate(date=date(2025, 6, 1), amount=1500), db=db)
+    upsert_monthly_balance(2025, 5, MonthlyBalanceUpsert(account_id=bank.id, opening_balance=50000), db=db)
+    delete_transaction(salary.id, db=db)
+    assert verify_account_balances(db) == []
+    assert _balance(db, bank.id, 2025, 4) == 100000
+    assert _balance(db, bank.id) == 30000
+    assert _balance(db, cash.id, 2025, 5) == 20000
+    assert _balance(db, cash.id) == 18500
+
+    delete_account(bank.id, db=db)
+    assert verify_account_balances(db) == []
+    assert bank.id not in get_account_balances(db)
+    assert _balance(db, cash.id) == 18500
+
+
+def test_rebuild_repairs_drift(db):
+    cash, _ = _accounts(db)
+    db.add(
+        Transaction(date=date(2025, 1, 10), year=2025, month=1, type="income", amount=1000, account_id=cash.id, user_id=1)
+    )
+    db.commit()
+    assert len(verify_account_balances(db)) == 1
+
+    assert rebuild_account_balances(db) == 1
+    db.commit()
+    assert verify_account_balances(db) == []
+    assert db.query(AccountBalance).one().closing_balance == 1000
+
+
+def test_empty_snapshots_are_backfilled_by_startup_and_migration(db):
+    cash, bank = _accounts(db)
+    upsert_monthly_balance(2025, 4, MonthlyBalanceUpsert(account_id=bank.id, opening_balance=100000), db=db)
+    upsert_monthly_balance(2025, 6, MonthlyBalanceUpsert(account_id=bank.id, opening_balance=50000), db=db)
+    upsert_monthly_balance(2025, 2, MonthlyBalanceUpsert(account_id=cash.id, opening_balance=3000), db=db)
+    for day, tx_type, amount, to_account_id in [
+        (date(2025, 3, 1), "income", 300000, None),
+        (date(2025, 4, 25), "income", 300000, None),
+        (date(2025, 5, 2), "transfer", 20000, cash.id),
+        (date(2025, 6, 3), "expense", 1200, None),
+        (date(2025, 7, 3), "adjust", 999, None),
+    ]:
+        create_transaction(
+            TransactionCreate(date=day, type=tx_type, amount=amount, account_id=bank.id, to_account_id=to_account_id),
+            db=db,
+        )
+    expected = db.query(AccountBalance).count()
+
+    db.query(AccountBalance).delete()
+    db.commit()
+    ensure_rollups(db)
+    assert verify_account_balances(db) == []
+
+    db.query(AccountBalance).delete()
+    db.commit()
+    migration = importlib.import_module("app.db.migrations.versions.0010_account_balances")
+    with Operations.context(MigrationContext.configure(db.connection())):
+        migration.upgrade()
+    assert db.query(AccountBalance).count() == expected
+    assert verify_account_balances(db) == []
+    assert _balance(db, bank.id) == 48800
+    assert _balance(db, cash.id) == 23000
+
+
+def test_balances_api_and_index_page(client, web_db):
+    cash, bank = _accounts(web_db)
+    client.put("/api/monthly-balance/2025/3", json={"account_id": cash.id, "opening_balance": 5000})
+    client.post(
+        "/api/transactions",
+        json={"date": "2025-04-01", "type": "expense", "amount": 700, "account_id": cash.id},
+    )
+
+    body = client.get("/api/accounts/balances").json()
+    assert [(item["name"], item["balance"], item["as_of_month"]) for item in body] == [
+        ("現金", 4300, 4),
+        ("銀行", 0, None),
+    ]
+    assert client.get("/api/accounts/balances", params={"year": 2025, "month": 3}).json()[0]["balance"] == 5000
+    assert client.get("/api/accounts/balances", params={"month": 3}).status_code == 422
+    assert "4300 円" in client.get("/?year=2025").text
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+
+from app.db.models import Category, Transaction, User
+from app.services.analytics import (
+    TYPE_CODES,
+    daily_spend,
+    expense_outliers,
+    get_year_arrays,
+    monthly_deltas,
+    rolling_mean,
+)
+from app.services.data_versions import bump_month_versions
+
+
+def _tx(day: date, tx_type: str, amount: int, **extra) -> Transaction:
+    return Transaction(date=day, year=day.year, month=day.month, type=tx_type, amount=amount, user_id=1, **extra)
+
+
+def _seed(db) -> Category:
+    db.add(User(id=1, name="default"))
+    db.flush()
+    food = Category(name="食費", user_id=1)
+    db.add(food)
+    db.flush()
+    db.add_all(
+        [_tx(date(2025, 1, day), "expense", 1000 + day, category_id=food.id) for day in range(1, 11)]
+        + [
+            _tx(date(2025, 1, 11), "expense", 50000, category_id=food.id),
+            _tx(date(2025, 1, 25), "income", 300000),
+            _tx(date(2025, 2, 3), "expense", 2000),
+            _tx(date(2025, 2, 4), "transfer", 9999),
+        ]
+    )
+    db.commit()
+    return food
+
+
+def test_year_arrays_are_loaded_once_and_refreshed_on_write(db):
+    _seed(db)
+    arrays = get_year_arrays(db, 2025)
+    assert len(arrays) == 14
+    assert arrays.ordinals[0] == date(2025, 1, 1).toordinal()
+    assert arrays.types[-1] == TYPE_CODES["transfer"]
+    assert get_year_arrays(db, 2025) is arrays
+
+    db.add(_tx(date(2025, 3, 1), "expense", 10))
+    bump_month_versions(db, [(2025, 3)])
+    db.commit()
+    assert len(get_year_arrays(db, 2025)) == 15
+
+
+def test_vectorized_statistics(db):
+    food = _seed(db)
+    arrays = get_year_arrays(db, 2025)
+
+    daily = daily_spend(arrays, window=3, percentiles=(50, 100), today=date(2025, 2, 28))
+    assert daily["end"] == date(2025, 2, 28)
+    assert len(daily["expense"]) == 59
+    assert daily["expense"][:2] == [1001, 1002]
+    assert daily["rolling_mean"][:3] == [None, None, 1002.0]
+    assert daily["percentiles"]["p100"] == 50000
+
+    monthly = monthly_deltas(arrays)
+    assert monthly["income"][0] == 300000
+    assert monthly["expense"][:2] == [sum(1000 + day for day in range(1, 11)) + 50000, 2000]
+    assert monthly["expense_delta"][1] == 2000 - monthly["expense"][0]
+    assert monthly["expense_change_pct"][0] is None
+    assert monthly["expense_change_pct"][2] == -100.0
+
+    outliers = expense_outliers(arrays)
+    assert [(item["amount"], item["category_id"]) for item in outliers] == [(50000, food.id)]
+
+    assert np.allclose(rolling_mean(np.arange(5, dtype=float), 2)[1:], [0.5, 1.5, 2.5, 3.5])
+
+
+def test_analytics_endpoints(client, web_db):
+    _seed(web_db)
+    assert len(client.get("/api/analytics/2025/daily", params={"window": 30}).json()["expense"]) == 365
+    assert client.get("/api/analytics/2025/monthly").json()["net"][1] == -2000
+    assert [item["amount"] for item in client.get("/api/analytics/2025/outliers").json()] == [50000]
+    assert client.get("/api/analytics/2025/daily", params={"window": 0}).status_code == 422
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.db.models import Account, Category, Liability, Transaction, User
+from app.services.monthly_totals import rebuild_monthly_totals
+
+
+def test_async_read_endpoints(client, web_db):
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    cash = Account(name="現金", kind="cash", user_id=1)
+    web_db.add_all([cash, Category(name="食費", user_id=1), Liability(name="奨学金", balance=100000, user_id=1)])
+    web_db.flush()
+    web_db.add_all(
+        [
+            Transaction(
+                date=date(2025, 6, day),
+                year=2025,
+                month=6,
+                type="expense",
+                amount=100 * day,
+                account_id=cash.id,
+                description=f"ランチ{day}",
+                user_id=1,
+            )
+            for day in range(1, 6)
+        ]
+    )
+    rebuild_monthly_totals(web_db)
+    web_db.commit()
+
+    assert [a["name"] for a in client.get("/api/accounts").json()] == ["現金"]
+    assert [c["name"] for c in client.get("/api/categories").json()] == ["食費"]
+    assert [item["name"] for item in client.get("/api/liabilities").json()] == ["奨学金"]
+
+    response = client.get("/api/transactions", params={"year": 2025, "month": 6})
+    assert [tx["amount"] for tx in response.json()] == [500, 400, 300, 200, 100]
+    assert int(response.headers["X-Query-Count"]) > 0
+
+    page = client.get("/api/transactions/page", params={"year": 2025, "limit": 2}).json()
+    assert [tx["amount"] for tx in page["items"]] == [500, 400]
+    rest = client.get("/api/transactions/page", params={"year": 2025, "cursor": page["next_cursor"]}).json()
+    assert [tx["amount"] for tx in rest["items"]] == [300, 200, 100]
+    assert client.get("/api/transactions/page", params={"cursor": "garbage"}).status_code == 422
+    assert client.get("/api/transactions/page", params={"month": 6}).status_code == 422
+
+    hits = client.get("/api/transactions/search", params={"q": "ランチ3"}).json()
+    assert [hit["amount"] for hit in hits] == [300]
+
+    summary = client.get("/api/summary/month/2025/6").json()
+    assert summary["expense_total"] == 1500
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.bench import DatasetSpec, bench_cases, generate_dataset, run_suite
+from app.db.models import Transaction
+from app.db.session import Base
+from app.services.account_balances import verify_account_balances
+from app.services.monthly_totals import verify_monthly_totals
+
+SPEC = DatasetSpec(years=2, accounts=3, per_month=20, seed=7, end_year=2024)
+
+
+def _rows(db) -> list[tuple]:
+    return db.execute(
+        select(
+            Transaction.date,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.account_id,
+            Transaction.to_account_id,
+            Transaction.category_id,
+            Transaction.category_free,
+            Transaction.description,
+        ).order_by(Transaction.id)
+    ).all()
+
+
+def test_generator_is_deterministic_and_consistent(db):
+    stats = generate_dataset(db, SPEC)
+    assert stats["transactions"] == 2 * 12 * (3 * 20 + 2)
+    rows = _rows(db)
+    assert {row.date.year for row in rows} == {2023, 2024}
+    types = [row.type for row in rows]
+    assert types.count("expense") > len(rows) * 0.8
+    assert {"income", "transfer", "adjust"} <= set(types)
+    assert all(row.to_account_id not in (None, row.account_id) for row in rows if row.type == "transfer")
+    assert verify_monthly_totals(db) == []
+    assert verify_account_balances(db) == []
+
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine, future=True)() as other:
+        generate_dataset(other, SPEC)
+        assert _rows(other) == rows
+        generate_dataset(other, SPEC._replace(seed=8))
+        assert _rows(other)[: len(rows)] == rows
+        assert _rows(other)[len(rows) :] != rows
+
+
+def test_suite_times_every_case_and_rolls_back_the_import(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine, future=True)() as db:
+        generate_dataset(db, SPEC)
+        before = db.scalar(select(func.count()).select_from(Transaction))
+
+    cases = bench_cases(engine, 2024, 6)
+    assert len(cases["list_transactions_q"]()) > 0
+    assert cases["csv_import"]() == before // 2
+
+    results = run_suite(engine, 2024, 6, repeat=2)
+    assert set(results) == set(cases)
+    assert all(row["runs"] == 2 and row["min_ms"] <= row["median_ms"] for row in results.values())
+    with sessionmaker(bind=engine, future=True)() as db:
+        assert db.scalar(select(func.count()).select_from(Transaction)) == before
+    engine.dispose()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.db.models import Account, Category, User
+from app.services.month_locks import set_month_lock
+
+
+@pytest.fixture()
+def seeded(web_db):
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    web_db.add_all([Account(id=1, name="現金", kind="cash", user_id=1), Category(id=1, name="食費", user_id=1)])
+    web_db.commit()
+    return web_db
+
+
+def _add_expense(client, day: int, amount: int = 1000) -> dict:
+    response = client.post(
+        "/api/transactions",
+        json={"date": date(2025, 6, day).isoformat(), "type": "expense", "amount": amount, "account_id": 1},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/summary/year/2025",
+        "/api/summary/year/2025/months",
+        "/api/summary/year/2025/categories",
+        "/api/summary/month/2025/6",
+        "/api/transactions?year=2025&month=6",
+        "/api/csv/export?year=2025&month=6",
+    ],
+)
+def test_etag_revalidation_skips_transactions(client, seeded, path):
+    _add_expense(client, 1)
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert int(cached.headers["X-Query-Count"]) <= 2
+
+    _add_expense(client, 2)
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_month_versions_track_each_write_path(client, seeded):
+    tx = _add_expense(client, 1)
+    listing = "/api/transactions?year=2025&month=6"
+    etag = client.get(listing).headers["ETag"]
+    july = client.get("/api/summary/month/2025/7").headers["ETag"]
+    assert client.get(listing, headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/api/transactions/{tx['id']}", json={"description": "ランチ"})
+    updated = client.get(listing, headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()[0]["description"] == "ランチ"
+
+    etag = client.get("/api/summary/month/2025/6").headers["ETag"]
+    client.put("/api/monthly-balance/2025/6", json={"account_id": 1, "opening_balance": 5000})
+    assert client.get("/api/summary/month/2025/6", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/summary/month/2025/7", headers={"If-None-Match": july}).status_code == 304
+
+
+def test_locked_month_is_cacheable(client, seeded):
+    _add_expense(client, 1)
+    set_month_lock(seeded, 2025, 6, True)
+    response = client.get("/api/summary/month/2025/6")
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+    assert client.get("/api/summary/month/2025/5").headers["Cache-Control"] == "private, no-cache"
+
+
+def test_search_etag_changes_when_a_reference_is_renamed(client, seeded):
+    _add_expense(client, 1)
+    path = "/api/transactions?year=2025&month=6&q=財布"
+    first = client.get(path)
+    assert first.json() == []
+
+    assert client.put("/api/accounts/1", json={"name": "財布"}).status_code == 200
+    renamed = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert renamed.status_code == 200
+    assert len(renamed.json()) == 1
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import io
 from datetime import date
 
+import pytest
+from sqlalchemy import event
+
 from app.db.models import Account, Category, Transaction, User
-from app.services.csv_io import export_transactions_csv, import_transactions_csv
+from app.services.csv_io import (
+    MonthLockedError,
+    export_transactions_csv,
+    import_transactions_csv,
+    import_transactions_stream,
+    iter_transactions_csv,
+)
+from app.services.month_locks import set_month_lock
 
 
 def test_export_import_csv(db):
@@ -41,3 +52,65 @@ def test_export_import_csv(db):
 
     exported_after = export_transactions_csv(db, year=2026, month=2)
     assert "給与口座" in exported_after
+
+
+def test_export_streams_in_batches_with_single_query(db):
+    db.add(User(id=1, name="default"))
+    cash = Account(name="現金", kind="cash", user_id=1)
+    bank = Account(name="銀行", kind="bank", user_id=1)
+    db.add_all([cash, bank])
+    db.flush()
+    db.add_all(
+        [
+            Transaction(
+                date=date(2026, 1, day),
+                year=2026,
+                month=1,
+                type="transfer",
+                amount=100 * day,
+                account_id=bank.id,
+                to_account_id=cash.id,
+                user_id=1,
+            )
+            for day in range(1, 6)
+        ]
+    )
+    db.commit()
+
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        chunks = list(iter_transactions_csv(db, year=2026, batch_size=2))
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert len(chunks) == 4
+    assert chunks[0].startswith("date,type,amount")
+    assert chunks[1].startswith("2026-01-05,transfer,500,銀行,現金,")
+
+
+def test_import_stream_batches_and_rejects_locked_month(db):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    set_month_lock(db, 2025, 3, True)
+
+    header = "date,type,amount,account,to_account,category,category_free,description,note\n"
+    rows = "".join(f"2025-02-{day:02d},expense,{day * 10},現金,,食費,,,\n" for day in range(1, 8))
+    imported = import_transactions_stream(db, io.BytesIO((header + rows).encode("utf-8")), batch_size=3)
+    assert imported == 7
+    assert db.query(Account).filter_by(name="現金").count() == 1
+    assert db.query(Category).filter_by(name="食費").count() == 1
+
+    locked = header + "2025-02-20,income,1,現金,,,,,\n2025-03-01,income,1,現金,,,,,\n"
+    with pytest.raises(MonthLockedError):
+        import_transactions_stream(db, io.BytesIO(locked.encode("utf-8")), batch_size=1)
+    db.rollback()
+    assert db.query(Transaction).count() == 7
+
+    with pytest.raises(ValueError, match="line 2"):
+        import_transactions_stream(db, io.BytesIO((header + "2025-02-01,expense,-5,,,,,,\n").encode("utf-8")))
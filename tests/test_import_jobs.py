@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import io
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Transaction, User
+from app.services.import_jobs import cancel_import_job, create_import_job, get_import_job, run_import_job
+from app.services.month_locks import set_month_lock
+
+HEADER = "date,type,amount,account,to_account,category,category_free,description,note\n"
+
+
+def test_import_job_commits_chunks_and_records_errors(db):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    set_month_lock(db, 2025, 4, True)
+
+    rows = "".join(f"2025-03-{day:02d},expense,{day},現金,,,,,\n" for day in range(1, 11))
+    rows += "2025-03-15,expense,abc,現金,,,,,\n2025-04-01,expense,1,現金,,,,,\n"
+    job = create_import_job(io.BytesIO((HEADER + rows).encode("utf-8")), "bank.csv")
+    assert get_import_job(job.id) is job
+
+    run_import_job(job, sessionmaker(bind=db.get_bind()), chunk_size=3)
+
+    assert job.status == "completed"
+    assert job.rows_processed == 12
+    assert job.rows_imported == 10
+    assert job.error_count == 2
+    assert [error["line"] for error in job.errors] == [12, 13]
+    assert "locked" in job.errors[1]["detail"]
+    assert not job.path.exists()
+    assert db.query(Transaction).count() == 10
+
+
+def test_cancelled_job_does_not_import(db):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    job = create_import_job(io.BytesIO((HEADER + "2025-03-01,income,1,,,,,,\n").encode("utf-8")))
+    cancel_import_job(job.id)
+
+    run_import_job(job, sessionmaker(bind=db.get_bind()))
+
+    assert job.status == "cancelled"
+    assert job.to_dict()["rows_imported"] == 0
+    assert db.query(Transaction).count() == 0
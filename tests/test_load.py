@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.bench import DatasetSpec, generate_dataset
+from app.bench.load import load_targets, parse_mix, run_load
+from app.db.models import Transaction
+from app.main import app
+
+
+def test_parse_mix():
+    assert parse_mix("month_page=80, transaction_post=15,csv_export") == {
+        "month_page": 80,
+        "transaction_post": 15,
+        "csv_export": 1,
+    }
+    for value in ("month_page=x", "nope=1", "month_page=0", "month_page=-1"):
+        with pytest.raises(ValueError):
+            parse_mix(value)
+
+
+def test_run_load_reports_each_route(web_db):
+    generate_dataset(web_db, DatasetSpec(years=1, accounts=2, per_month=10, seed=3, end_year=2024))
+    before = web_db.query(Transaction).count()
+    targets = load_targets(web_db, 2024)
+
+    report = asyncio.run(
+        run_load(app, targets, {"month_page": 3, "transaction_post": 2, "csv_export": 1}, concurrency=4, requests=30)
+    )
+
+    assert report["total"]["requests"] == 30
+    assert report["total"]["errors"] == 0
+    routes = report["routes"]
+    assert sum(row["requests"] for row in routes.values()) == 30
+    assert routes["month_page"]["route"] == "/month/{year}/{month}"
+    assert all(row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] for row in routes.values())
+    web_db.expire_all()
+    assert web_db.query(Transaction).count() == before + routes["transaction_post"]["requests"]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.db.models import User
+from app.main import app
+from app.services import auth
+from app.services.auth import PasswordHasher, PasswordHasherBusy, hash_password
+from app.web import routes
+from app.web.auth_cookie import AUTH_COOKIE_NAME
+
+
+def _login(password: str):
+    client = TestClient(app)
+    return client.post(
+        "/login",
+        data={"username": "default", "password": password, "next_path": "/month/2025/6"},
+        follow_redirects=False,
+    )
+
+
+def test_login_verifies_password_off_the_threadpool(web_db):
+    web_db.add(User(id=1, name="default", password_hash=hash_password("secret")))
+    web_db.commit()
+    before = metrics.login_duration_seconds.count(outcome="success")
+
+    ok = _login("secret")
+    assert ok.status_code == 303
+    assert ok.headers["location"] == "/month/2025/6"
+    assert AUTH_COOKIE_NAME in ok.cookies
+
+    assert _login("wrong").status_code == 401
+    assert metrics.login_duration_seconds.count(outcome="success") == before + 1
+
+
+def test_login_is_rejected_while_hasher_is_saturated(web_db, monkeypatch):
+    web_db.add(User(id=1, name="default", password_hash=hash_password("secret")))
+    web_db.commit()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_verify(password: str, password_hash: str | None) -> bool:
+        started.set()
+        release.wait(5)
+        return False
+
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    monkeypatch.setattr(auth, "verify_password", blocking_verify)
+    monkeypatch.setattr(routes, "password_hasher", hasher)
+    holder = threading.Thread(target=lambda: asyncio.run(hasher.verify("x", "y")))
+    holder.start()
+    assert started.wait(5)
+    rejected = metrics.login_rejected_total.value()
+
+    try:
+        response = _login("secret")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert metrics.login_rejected_total.value() == rejected + 1
+    finally:
+        release.set()
+        holder.join(5)
+
+    assert hasher.pending == 0
+    try:
+        asyncio.run(hasher.verify("x", "y"))
+    except PasswordHasherBusy:
+        raise AssertionError("slot was not released")
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.models import User
+from app.db.query_counter import install_query_counter, track_queries
+from app.db.slow_queries import install_slow_query_log
+from app.main import app
+from app.metrics import Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(3, route="/a")
+
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{route="/a"} 3' in text
+
+
+def test_metrics_endpoint_reports_routes_and_sql(client, web_db):
+    web_db.add(User(id=1, name="default"))
+    web_db.commit()
+    assert client.get("/month/2025/6").status_code == 200
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'kakeibo_http_requests_total{method="GET",route="/month/{year}/{month}",status="200"}' in body
+    assert 'kakeibo_db_statements_per_request_count{route="/month/{year}/{month}"}' in body
+    assert "kakeibo_threadpool_max_threads" in body
+
+
+def test_failed_statements_do_not_leak_start_times():
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+    install_slow_query_log(engine)
+    with engine.connect() as conn, track_queries() as stats:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_started"] == []
+        assert conn.info["slow_query_started"] == []
+    assert stats.count == 4
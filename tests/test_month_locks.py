@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.api.routers.transactions import create_transaction
+from app.db.models import Account, MonthlyLock, User
+from app.db.session import Base
+from app.schemas import TransactionCreate
+from app.services import month_locks
+from app.services.month_locks import is_month_locked, set_month_lock
+
+
+def _count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_lock_checks_are_served_from_memory(db):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    set_month_lock(db, 2025, 3, True)
+
+    statements = _count_statements(db)
+    assert is_month_locked(db, 2025, 3)
+    loaded = len(statements)
+    for month in range(1, 13):
+        assert is_month_locked(db, 2025, month) is (month == 3)
+    assert len(statements) == loaded
+
+    set_month_lock(db, 2025, 3, False)
+    set_month_lock(db, 2025, 4, True)
+    statements.clear()
+    assert not is_month_locked(db, 2025, 3)
+    assert is_month_locked(db, 2025, 4)
+    assert statements == []
+
+
+def test_lock_changes_from_other_processes_are_picked_up(db, monkeypatch):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    assert not is_month_locked(db, 2025, 5)
+
+    with Session(bind=db.get_bind()) as other:
+        other.add(MonthlyLock(year=2025, month=5, is_locked=True, user_id=1))
+        other.commit()
+    assert not is_month_locked(db, 2025, 5)
+
+    monkeypatch.setattr(month_locks, "MONTH_LOCK_CACHE_TTL", 0.0)
+    assert is_month_locked(db, 2025, 5)
+
+
+def test_write_checks_see_locks_set_through_another_engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'locks.db'}"
+    engine, other_engine = create_engine(url), create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db, Session(other_engine) as other:
+        db.add(User(id=1, name="default"))
+        db.flush()
+        db.add(Account(id=1, name="現金", kind="cash", user_id=1))
+        db.commit()
+        assert not is_month_locked(db, 2025, 5)
+
+        set_month_lock(other, 2025, 5, True)
+        assert not is_month_locked(db, 2025, 5)
+        assert is_month_locked(db, 2025, 5, fresh=True)
+
+        set_month_lock(other, 2025, 5, False)
+        set_month_lock(other, 2025, 6, True)
+        payload = TransactionCreate(date=date(2025, 6, 1), type="expense", amount=100, account_id=1)
+        with pytest.raises(HTTPException) as exc:
+            create_transaction(payload, db=db)
+        assert exc.value.status_code == 423
+        assert not is_month_locked(db, 2025, 5)
+    engine.dispose()
+    other_engine.dispose()
+
+
+def test_load_overlapping_a_write_through_is_not_cached(db, monkeypatch):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    month_locks.invalidate_month_locks(db)
+    original = month_locks._load_locked_months
+
+    def racing_load(session):
+        loaded = original(session)
+        set_month_lock(session, 2025, 6, True)
+        return loaded
+
+    monkeypatch.setattr(month_locks, "_load_locked_months", racing_load)
+    assert not is_month_locked(db, 2025, 6)
+    monkeypatch.setattr(month_locks, "_load_locked_months", original)
+    assert is_month_locked(db, 2025, 6)
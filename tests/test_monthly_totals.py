@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib
+from datetime import date
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.api.routers.accounts import delete_account
+from app.api.routers.transactions import create_transaction, delete_transaction, update_transaction
+from app.db.init_db import ensure_rollups
+from app.db.models import Account, Category, MonthlyTotal, User
+from app.schemas import TransactionCreate, TransactionUpdate
+from app.services.csv_io import import_transactions_csv
+from app.services.monthly_totals import rebuild_monthly_totals, verify_monthly_totals
+from app.services.reference_cascades import delete_categories
+from app.services.summary import get_month_summary
+
+
+def test_write_paths_keep_rollup_in_sync(db):
+    db.add(User(id=1, name="default"))
+    cash = Account(name="現金", kind="cash", user_id=1)
+    bank = Account(name="銀行", kind="bank", user_id=1)
+    food = Category(name="食費", is_fixed=True, is_active=True, user_id=1)
+    db.add_all([cash, bank, food])
+    db.commit()
+
+    lunch = create_transaction(
+        TransactionCreate(date=date(2025, 5, 3), type="expense", amount=1200, account_id=cash.id, category_id=food.id),
+        db=db,
+    )
+    salary = create_transaction(
+        TransactionCreate(date=date(2025, 5, 25), type="income", amount=300000, account_id=bank.id),
+        db=db,
+    )
+    assert verify_monthly_totals(db) == []
+    assert get_month_summary(db, 2025, 5)["expense_total"] == 1200
+
+    update_transaction(lunch.id, TransactionUpdate(date=date(2025, 6, 1), amount=1500), db=db)
+    assert verify_monthly_totals(db) == []
+    assert get_month_summary(db, 2025, 5)["expense_total"] == 0
+    assert get_month_summary(db, 2025, 6)["expense_total"] == 1500
+
+    delete_transaction(salary.id, db=db)
+    assert verify_monthly_totals(db) == []
+    assert get_month_summary(db, 2025, 5)["income_total"] == 0
+
+    import_transactions_csv(
+        db,
+        (
+            "date,type,amount,account,to_account,category,category_free,description,note\n"
+            "2025-06-02,expense,800,現金,,食費,,,\n"
+            "2025-06-03,transfer,5000,銀行,現金,,,,\n"
+        ).encode("utf-8"),
+    )
+    assert verify_monthly_totals(db) == []
+    assert get_month_summary(db, 2025, 6)["expense_total"] == 2300
+
+    delete_categories(db, [food.id])
+    db.commit()
+    delete_account(cash.id, db=db)
+    assert verify_monthly_totals(db) == []
+    assert get_month_summary(db, 2025, 6)["expense_total"] == 2300
+
+
+def test_rebuild_repairs_drift(db):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    import_transactions_csv(
+        db,
+        (
+            "date,type,amount,account,to_account,category,category_free,description,note\n"
+            "2025-01-10,income,1000,,,,,,\n"
+        ).encode("utf-8"),
+    )
+    db.query(MonthlyTotal).update({MonthlyTotal.amount: 1})
+    db.commit()
+    assert len(verify_monthly_totals(db)) == 1
+
+    assert rebuild_monthly_totals(db) == 1
+    db.commit()
+    assert verify_monthly_totals(db) == []
+
+
+def test_empty_rollup_is_backfilled_by_startup_and_migration(db):
+    db.add(User(id=1, name="default"))
+    db.commit()
+    import_transactions_csv(
+        db,
+        (
+            "date,type,amount,account,to_account,category,category_free,description,note\n"
+            "2025-01-10,income,1000,,,,,,\n"
+            "2025-02-10,expense,300,,,,,,\n"
+        ).encode("utf-8"),
+    )
+    db.query(MonthlyTotal).delete()
+    db.commit()
+    ensure_rollups(db)
+    assert verify_monthly_totals(db) == []
+
+    db.query(MonthlyTotal).delete()
+    db.commit()
+    migration = importlib.import_module("app.db.migrations.versions.0006_monthly_totals")
+    with Operations.context(MigrationContext.configure(db.connection())):
+        migration.upgrade()
+    assert verify_monthly_totals(db) == []
+    assert get_month_summary(db, 2025, 2)["expense_total"] == 300
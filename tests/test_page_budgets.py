@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.db.models import Account, Category, Liability, Transaction, User
+from app.services.monthly_totals import rebuild_monthly_totals
+
+PAGE_QUERY_BUDGETS = {
+    "/?year=2025": 2,
+    "/month/2025/6": 2,
+    "/opening-balances/2025/6": 1,
+    "/settings": 0,
+}
+
+
+@pytest.fixture()
+def seeded(web_db):
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    accounts = [Account(name=f"口座{i}", kind="bank", is_active=i < 5, user_id=1) for i in range(10)]
+    categories = [Category(name=f"カテゴリ{i}", is_active=i < 5, user_id=1) for i in range(10)]
+    web_db.add_all([*accounts, *categories, Liability(name="住宅ローン", balance=1000000, user_id=1)])
+    web_db.flush()
+    web_db.add_all(
+        [
+            Transaction(
+                date=date(2025, 6, day % 28 + 1),
+                year=2025,
+                month=6,
+                type="transfer" if day % 3 == 0 else "expense",
+                amount=100 + day,
+                account_id=accounts[day % 10].id,
+                to_account_id=accounts[(day + 1) % 10].id if day % 3 == 0 else None,
+                category_id=None if day % 3 == 0 else categories[day % 10].id,
+                user_id=1,
+            )
+            for day in range(60)
+        ]
+    )
+    rebuild_monthly_totals(web_db)
+    web_db.commit()
+    return web_db
+
+
+@pytest.mark.parametrize("path", sorted(PAGE_QUERY_BUDGETS))
+def test_page_stays_within_query_budget(client, seeded, path):
+    client.get(path)
+    response = client.get(path)
+    assert response.status_code == 200
+    query_count = int(response.headers["X-Query-Count"])
+    assert query_count <= PAGE_QUERY_BUDGETS[path], f"{path} issued {query_count} queries"
+
+
+def test_month_page_renders_reference_names(client, seeded):
+    body = client.get("/month/2025/6").text
+    assert "口座7" in body
+    assert "カテゴリ8" in body
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import pstats
+from datetime import date
+
+import pytest
+
+from app import profiling
+from app.db.models import Account, Transaction, User
+from app.services.monthly_totals import rebuild_monthly_totals
+
+
+@pytest.fixture()
+def profiled(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "REQUEST_PROFILING", True)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path / "profiles")
+    return tmp_path / "profiles"
+
+
+def _seed(web_db) -> None:
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    cash = Account(name="現金", kind="cash", user_id=1)
+    web_db.add(cash)
+    web_db.flush()
+    web_db.add_all(
+        Transaction(
+            date=date(2025, 1, 1 + i % 28), year=2025, month=1, type="expense", amount=100 + i, account_id=cash.id
+        )
+        for i in range(50)
+    )
+    rebuild_monthly_totals(web_db)
+    web_db.commit()
+
+
+def test_profiling_is_opt_in(client, web_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path / "profiles")
+    _seed(web_db)
+    response = client.get("/month/2025/1", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_sync_page_profile_covers_threadpool_work(client, web_db, profiled):
+    _seed(web_db)
+    assert "X-Profile-Id" not in client.get("/month/2025/1").headers
+
+    response = client.get("/month/2025/1", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    record = json.loads((profiled / f"{profile_id}.json").read_text(encoding="utf-8"))
+    assert record["route"] == "/month/{year}/{month}"
+    assert record["sql_count"] == int(response.headers["X-Query-Count"]) > 0
+    assert 0 < record["sql_share"] <= 1
+    assert record["layers_ms"]["jinja"] > 0
+    assert record["top_functions"]
+    assert pstats.Stats(str(profiled / f"{profile_id}.prof")).total_calls > 0
+
+
+def test_async_and_streaming_responses_are_profiled(client, web_db, profiled, monkeypatch):
+    _seed(web_db)
+    monkeypatch.setattr(profiling, "PROFILE_KEEP", 2)
+    assert client.get("/api/summary/month/2025/1", params={"profile": "1"}).json()["expense_total"] > 0
+    response = client.get("/api/csv/export", params={"profile": "1"})
+    assert len(response.text.splitlines()) == 51
+    client.get("/api/transactions", params={"year": 2025, "month": 1, "profile": "1"})
+
+    profiles = profiling.list_profiles()
+    assert len(profiles) == 2
+    assert profiles[1]["id"] == response.headers["X-Profile-Id"]
+    assert profiles[1]["layers_ms"]["sqlalchemy"] > 0
+
+    page = client.get("/admin/profiles")
+    assert page.status_code == 200
+    assert profiles[0]["id"] in page.text
+    download = client.get(f"/admin/profiles/{profiles[0]['id']}.prof")
+    assert download.status_code == 200
+    assert client.get("/admin/profiles/..%2Fsecret.prof").status_code == 404
+
+
+def test_concurrent_profile_request_is_served_unprofiled(client, web_db, profiled):
+    _seed(web_db)
+    with profiling._loop_profile:
+        response = client.get("/month/2025/1", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Skipped"] == "busy"
+    assert "X-Profile-Id" not in response.headers
+    assert "X-Profile-Id" in client.get("/month/2025/1", headers={"X-Profile": "1"}).headers
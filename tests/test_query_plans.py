@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+
+from app.api.routers.accounts import delete_account
+from app.db.models import Account, Category, Transaction, User
+from app.services.account_balances import get_account_balances, rebuild_account_balances, record_opening_changes
+from app.services.csv_io import export_transactions_csv
+from app.services.monthly_totals import rebuild_monthly_totals
+from app.services.reference_cascades import delete_categories
+from app.services.summary import get_month_summary, get_year_summary
+from app.services.transactions import list_month_transactions, page_transactions
+from app.web.routes import _month_context
+
+
+@contextmanager
+def capture_statements(db):
+    engine = db.get_bind()
+    captured: list[tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def plan_steps(db, captured, table: str) -> list[str]:
+    raw = db.connection().connection.driver_connection
+    steps: list[str] = []
+    for statement, parameters in captured:
+        if table not in statement:
+            continue
+        for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall():
+            detail = row[-1]
+            if f" {table} " in f" {detail} ":
+                steps.append(detail)
+    return steps
+
+
+def assert_no_full_scan(db, captured, table: str = "transactions") -> None:
+    steps = plan_steps(db, captured, table)
+    assert steps
+    for detail in steps:
+        assert detail.startswith("SEARCH"), detail
+
+
+def seed(db) -> tuple[Account, Category]:
+    db.add(User(id=1, name="default"))
+    account = Account(name="現金", kind="cash", user_id=1)
+    category = Category(name="食費", is_fixed=True, is_active=True, user_id=1)
+    db.add_all([account, category])
+    db.flush()
+    db.add_all(
+        [
+            Transaction(
+                date=date(2026, 2, day),
+                year=2026,
+                month=2,
+                type="expense",
+                amount=1000 * day,
+                account_id=account.id,
+                category_id=category.id,
+                user_id=1,
+            )
+            for day in range(1, 6)
+        ]
+    )
+    rebuild_monthly_totals(db)
+    rebuild_account_balances(db)
+    db.commit()
+    return account, category
+
+
+def test_summary_queries_use_indexes(db):
+    seed(db)
+    with capture_statements(db) as captured:
+        get_month_summary(db, 2026, 2)
+        get_year_summary(db, 2026)
+    assert_no_full_scan(db, captured, table="monthly_totals")
+
+
+def test_month_listing_queries_use_indexes(db):
+    seed(db)
+    with capture_statements(db) as captured:
+        list_month_transactions(db, 2026, 2)
+        list_month_transactions(db, 2026, 2, q="食")
+        list_month_transactions(db, 2026, 2, q="食費")
+        _month_context(db, 2026, 2)
+        export_transactions_csv(db, year=2026, month=2)
+    assert_no_full_scan(db, captured)
+    fts_steps = plan_steps(db, captured, "transactions_fts")
+    assert len(fts_steps) == 2
+    for detail in fts_steps:
+        assert not detail.endswith("INDEX 0:"), detail
+
+
+def test_reference_cascades_use_indexes(db):
+    account, category = seed(db)
+    with capture_statements(db) as captured:
+        delete_categories(db, [category.id])
+        delete_account(account.id, db=db)
+    assert_no_full_scan(db, captured)
+
+
+def test_keyset_pages_seek_by_date_index(db):
+    seed(db)
+    first = page_transactions(year=None, month=None, date_from=None, date_to=None, cursor=None, limit=2, q=None, db=db)
+    with capture_statements(db) as captured:
+        page_transactions(
+            year=None, month=None, date_from=None, date_to=None, cursor=first["next_cursor"], limit=2, q=None, db=db
+        )
+        page_transactions(
+            year=None,
+            month=None,
+            date_from=date(2026, 1, 1),
+            date_to=date(2026, 12, 31),
+            cursor=first["next_cursor"],
+            limit=2,
+            q=None,
+            db=db,
+        )
+    assert_no_full_scan(db, captured)
+
+
+def test_account_balances_read_from_snapshot_index(db):
+    account, _ = seed(db)
+    with capture_statements(db) as captured:
+        get_account_balances(db)
+        get_account_balances(db, 2026, 1)
+        record_opening_changes(db, [(account.id, 2026, 1)])
+    steps = plan_steps(db, captured, "account_balances")
+    assert steps
+    for detail in steps:
+        assert "USING INDEX" in detail, detail
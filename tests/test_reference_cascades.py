@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import event
+
+from app.db.models import Account, AccountBalance, Category, MonthlyBalance, Transaction, User
+from app.services.account_balances import rebuild_account_balances, verify_account_balances
+from app.services.data_versions import get_month_versions
+from app.services.monthly_totals import rebuild_monthly_totals, verify_monthly_totals
+from app.services.reference_cascades import delete_accounts
+
+
+def _seed(db, rows: int, suffix: str = "") -> tuple[Account, Account, Account, Category]:
+    if db.get(User, 1) is None:
+        db.add(User(id=1, name="default"))
+        db.flush()
+    cash = Account(name=f"現金{suffix}", kind="cash", user_id=1)
+    card = Account(name=f"カード{suffix}", kind="card", user_id=1)
+    bank = Account(name=f"銀行{suffix}", kind="bank", user_id=1)
+    food = Category(name=f"食費{suffix}", user_id=1)
+    db.add_all([cash, card, bank, food])
+    db.flush()
+    db.add_all(
+        [
+            Transaction(
+                date=date(2025, 1 + i % 12, 1),
+                year=2025,
+                month=1 + i % 12,
+                type="expense",
+                amount=100 + i,
+                account_id=(cash, card)[i % 2].id,
+                category_id=food.id,
+                user_id=1,
+            )
+            for i in range(rows)
+        ]
+    )
+    db.add(
+        Transaction(
+            date=date(2025, 3, 9),
+            year=2025,
+            month=3,
+            type="transfer",
+            amount=500,
+            account_id=bank.id,
+            to_account_id=cash.id,
+            user_id=1,
+        )
+    )
+    db.add(MonthlyBalance(year=2025, month=1, account_id=cash.id, opening_balance=1000, user_id=1))
+    rebuild_monthly_totals(db)
+    rebuild_account_balances(db)
+    db.commit()
+    return cash, card, bank, food
+
+
+def test_account_cascade_statement_count_does_not_grow_with_rows(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    counts = []
+    for rows, suffix in ((10, "a"), (400, "b")):
+        cash, card, _, _ = _seed(db, rows, suffix)
+        statements.clear()
+        assert delete_accounts(db, [cash.id, card.id, 999]) == sorted([cash.id, card.id])
+        counts.append(len(statements))
+        db.commit()
+    assert counts[0] == counts[1]
+    assert verify_account_balances(db) == []
+
+
+def test_settings_multi_delete_detaches_everything_at_once(client, web_db):
+    cash, card, bank, food = _seed(web_db, 24)
+    before = get_month_versions(web_db, 2025)
+
+    response = client.post(
+        "/settings/accounts/delete",
+        data={"account_ids": [str(cash.id), str(card.id), "x"], "year": "2025"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    response = client.post(
+        "/settings/categories/delete", data={"category_ids": [str(food.id)], "year": "2025"}, follow_redirects=False
+    )
+    assert response.status_code == 303
+
+    web_db.expire_all()
+    assert {a.name for a in web_db.query(Account).all()} == {"銀行"}
+    assert web_db.query(Category).count() == 0
+    assert web_db.query(Transaction).filter(Transaction.account_id.is_not(None)).count() == 1
+    assert web_db.query(Transaction).filter(Transaction.to_account_id.is_not(None)).count() == 0
+    assert web_db.query(MonthlyBalance).count() == 0
+    assert {row.account_id for row in web_db.query(AccountBalance).all()} == {bank.id}
+    assert verify_monthly_totals(web_db) == []
+    assert verify_account_balances(web_db) == []
+    after = get_month_versions(web_db, 2025)
+    assert all(after[key] > before.get(key, 0) for key in before)
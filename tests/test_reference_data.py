@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.db.models import Account, Category, User
+from app.services.reference_data import get_reference_data, invalidate_reference_data
+
+
+def test_reference_data_is_cached_until_invalidated(db):
+    db.add(User(id=1, name="default"))
+    db.add_all([Account(name="銀行", kind="bank", user_id=1), Account(name="カード", kind="card", user_id=1)])
+    db.commit()
+
+    refs = get_reference_data(db)
+    assert [a.name for a in refs.active_accounts] == ["カード", "銀行"]
+    assert [a.name for a in refs.opening_accounts] == ["銀行"]
+
+    db.add(Account(name="現金", kind="cash", user_id=1))
+    db.commit()
+    assert get_reference_data(db) is refs
+
+    invalidate_reference_data(db)
+    refs = get_reference_data(db)
+    assert sorted(refs.account_names.values()) == ["カード", "現金", "銀行"]
+
+
+def test_routers_invalidate_reference_data(client, web_db):
+    web_db.add(User(id=1, name="default"))
+    web_db.commit()
+    assert "出張費" not in client.get("/month/2025/6").text
+
+    account = client.post("/api/accounts", json={"name": "財布", "kind": "cash"}).json()
+    category = client.post("/api/categories", json={"name": "出張費"}).json()
+    body = client.get("/month/2025/6").text
+    assert "財布" in body and "出張費" in body
+
+    response = client.post(
+        "/api/transactions",
+        json={
+            "date": date(2025, 6, 1).isoformat(),
+            "type": "expense",
+            "amount": 500,
+            "account_id": account["id"],
+            "category_id": category["id"],
+        },
+    )
+    assert response.status_code == 200
+
+    client.post("/settings/categories/delete", data={"category_ids": [str(category["id"])]})
+    assert "出張費" not in client.get("/settings").text
+    response = client.post(
+        "/api/transactions",
+        json={
+            "date": "2025-06-02",
+            "type": "expense",
+            "amount": 500,
+            "account_id": account["id"],
+            "category_id": category["id"],
+        },
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "category not found"
+
+
+def test_transaction_references_are_checked_against_the_database(client, web_db):
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    category = Category(name="食費", user_id=1)
+    web_db.add(category)
+    web_db.commit()
+    assert "食費" in client.get("/month/2025/6").text
+
+    # Written behind the cache's back, as another worker would.
+    account = Account(name="財布", kind="cash", user_id=1)
+    web_db.add(account)
+    web_db.delete(category)
+    web_db.commit()
+    payload = {"date": "2025-06-01", "type": "expense", "amount": 500, "account_id": account.id}
+    assert client.post("/api/transactions", json=payload).status_code == 200
+    response = client.post("/api/transactions", json={**payload, "category_id": category.id})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "category not found"
+    response = client.post(
+        "/month/2025/6/transactions",
+        data={"day": "2", "type": "expense", "amount": "300", "account_id": str(account.id)},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
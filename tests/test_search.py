@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.db.fts import rebuild_search_index
+from app.db.models import Account, Category, Transaction, User
+from app.services.search import search_transactions
+from app.services.transactions import list_month_transactions
+
+
+def seed(db) -> dict[str, Transaction]:
+    db.add(User(id=1, name="default"))
+    card = Account(name="楽天カード", kind="card", user_id=1)
+    food = Category(name="食費", is_fixed=True, is_active=True, user_id=1)
+    db.add_all([card, food])
+    db.flush()
+    txs = {
+        "conbini": Transaction(
+            date=date(2025, 6, 1),
+            year=2025,
+            month=6,
+            type="expense",
+            amount=480,
+            account_id=card.id,
+            category_id=food.id,
+            description="近所のコンビニで買い物",
+            user_id=1,
+        ),
+        "conbini_twice": Transaction(
+            date=date(2024, 1, 5),
+            year=2024,
+            month=1,
+            type="expense",
+            amount=300,
+            description="コンビニ コンビニ",
+            note="コンビニ",
+            user_id=1,
+        ),
+        "rent": Transaction(
+            date=date(2025, 6, 2),
+            year=2025,
+            month=6,
+            type="expense",
+            amount=80000,
+            description="家賃の支払い",
+            user_id=1,
+        ),
+    }
+    db.add_all(txs.values())
+    db.commit()
+    return txs
+
+
+def ids(hits) -> list[int]:
+    return [tx.id for tx, _ in hits]
+
+
+def test_trigram_search_matches_japanese_substrings_and_ranks(db):
+    txs = seed(db)
+    hits = search_transactions(db, "コンビニ")
+    assert ids(hits) == [txs["conbini_twice"].id, txs["conbini"].id]
+    assert all(score is not None for _, score in hits)
+
+    ranged = search_transactions(db, "コンビニ", date_from=date(2025, 1, 1), date_to=date(2025, 12, 31))
+    assert ids(ranged) == [txs["conbini"].id]
+
+    assert ids(search_transactions(db, "食費")) == [txs["conbini"].id]
+    assert ids(search_transactions(db, "楽天カ")) == [txs["conbini"].id]
+
+
+def test_index_follows_writes_and_renames(db):
+    txs = seed(db)
+    txs["rent"].description = "更新料"
+    db.commit()
+    assert search_transactions(db, "家賃") == []
+    assert ids(search_transactions(db, "更新料")) == [txs["rent"].id]
+
+    card = db.query(Account).filter_by(name="楽天カード").one()
+    card.name = "メインカード"
+    db.commit()
+    assert ids(search_transactions(db, "メインカード")) == [txs["conbini"].id]
+
+    db.delete(txs["conbini"])
+    db.commit()
+    assert ids(search_transactions(db, "メインカード")) == []
+
+    found = list_month_transactions(db, 2024, 1, q="コンビニ")
+    assert [tx.id for tx in found] == [txs["conbini_twice"].id]
+
+
+def test_rebuild_search_index(db):
+    txs = seed(db)
+    connection = db.connection()
+    connection.exec_driver_sql("DELETE FROM transactions_fts")
+    assert search_transactions(db, "家賃") == []
+
+    assert rebuild_search_index(connection) == 3
+    assert ids(search_transactions(db, "家賃")) == [txs["rent"].id]
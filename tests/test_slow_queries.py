@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.api.routers import debug as debug_router
+from app.db import slow_queries
+from app.db.models import Account, Transaction, User
+from app.db.slow_queries import SlowQueryLog, full_scans, install_slow_query_log, parameter_shapes
+
+
+@pytest.fixture()
+def slow_log(monkeypatch, web_db):
+    log = SlowQueryLog(0, "", 1024, 1, 10, logger_name="kakeibo.slow_queries.test")
+    monkeypatch.setattr(slow_queries, "slow_query_log", log)
+    monkeypatch.setattr(debug_router, "slow_query_log", log)
+    install_slow_query_log(web_db.get_bind())
+    return log
+
+
+def _seed(web_db) -> None:
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    cash = Account(name="現金", kind="cash", user_id=1)
+    web_db.add(cash)
+    web_db.flush()
+    web_db.add(
+        Transaction(date=date(2025, 1, 5), year=2025, month=1, type="expense", amount=100, note="x", account_id=cash.id)
+    )
+    web_db.commit()
+
+
+def test_parameter_shapes_and_full_scans():
+    assert parameter_shapes(("abc", 1, None, b"\x00\x01")) == ["str[3]", "int", "NoneType", "bytes[2]"]
+    assert parameter_shapes({"q": "コンビニ", "limit": 10}) == {"q": "str[4]", "limit": "int"}
+    assert parameter_shapes(list(range(25)))[-1] == "... 5 more"
+    plan = ["SCAN transactions", "SEARCH accounts USING INTEGER PRIMARY KEY (rowid=?)", "SCAN t USING INDEX ix"]
+    assert full_scans(plan) == ["transactions"]
+    fts = ["SCAN transactions_fts VIRTUAL TABLE INDEX 0:M5", "SCAN transactions_fts VIRTUAL TABLE INDEX 0:="]
+    assert full_scans(fts) == []
+    assert full_scans(["SCAN transactions_fts VIRTUAL TABLE INDEX 0:"]) == ["transactions_fts"]
+
+
+def test_slow_statements_are_recorded_with_route_and_plan(client, web_db, slow_log):
+    _seed(web_db)
+    slow_log.clear()
+    web_db.execute(text("SELECT id FROM transactions WHERE note = :note"), {"note": "x"}).all()
+    record = slow_log.recent(1)[0]
+    assert record["parameters"] == ["str[1]"]
+    assert record["route"] is None
+    assert record["plan"] == ["SCAN transactions"]
+    assert record["full_scans"] == ["transactions"]
+
+    slow_log.clear()
+    response = client.get("/month/2025/1")
+    assert response.status_code == 200
+    records = slow_log.recent()
+    assert len(records) == min(10, int(response.headers["X-Query-Count"]))
+    assert {record["route"] for record in records} == {"/month/{year}/{month}"}
+    assert all(record["method"] == "GET" for record in records)
+    assert any(record["plan"] for record in records)
+
+    body = client.get("/api/debug/slow-queries", params={"limit": 2}).json()
+    assert [item["statement"] for item in body] == [record["statement"] for record in records[:2]]
+    assert client.delete("/api/debug/slow-queries").json() == {"status": "ok"}
+    assert slow_log.recent() == []
+
+
+def test_threshold_and_rotating_file(tmp_path, web_db, monkeypatch):
+    path = tmp_path / "logs" / "slow.log"
+    log = SlowQueryLog(60_000, str(path), 200, 2, 10, logger_name="kakeibo.slow_queries.file_test")
+    monkeypatch.setattr(slow_queries, "slow_query_log", log)
+    install_slow_query_log(web_db.get_bind())
+    try:
+        web_db.execute(text("SELECT 1")).all()
+        assert log.recent() == []
+
+        log.threshold = 0
+        for _ in range(5):
+            web_db.execute(text("SELECT 1")).all()
+        assert len(log.recent()) == 5
+        assert (tmp_path / "logs" / "slow.log.1").exists()
+        assert json.loads(path.read_text(encoding="utf-8").splitlines()[-1])["statement"] == "SELECT 1"
+    finally:
+        for handler in logging.getLogger("kakeibo.slow_queries.file_test").handlers:
+            handler.close()
+
+
+def test_async_endpoints_are_explained_through_aiosqlite(client, web_db, slow_log):
+    _seed(web_db)
+    slow_log.clear()
+    response = client.get("/api/transactions", params={"year": 2025, "month": 1, "q": "xyz"})
+    assert response.status_code == 200
+    records = slow_log.recent()
+    assert len(records) == int(response.headers["X-Query-Count"]) > 0
+    assert {record["route"] for record in records} == {"/api/transactions"}
+    plans = [detail for record in records for detail in record["plan"] or []]
+    assert any("transactions_fts" in detail for detail in plans)
+    assert not any(detail.startswith("EXPLAIN failed") for detail in plans)
+    assert all("transactions_fts" not in record["full_scans"] for record in records)
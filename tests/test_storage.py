@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.db.storage import STORAGE_PROFILES, apply_storage_profile, engine_options, get_storage_profile
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+@pytest.mark.parametrize("name", sorted(STORAGE_PROFILES))
+def test_profile_pragmas_applied_on_every_connection(tmp_path, name):
+    url = f"sqlite:///{tmp_path / 'kakeibo.db'}"
+    profile = get_storage_profile(name)
+    engine = create_engine(url, future=True, **engine_options(url, profile))
+    apply_storage_profile(engine, profile)
+
+    pragmas = profile["pragmas"]
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "foreign_keys") == 1
+    assert _pragma(engine, "busy_timeout") == pragmas["busy_timeout"]
+    assert _pragma(engine, "cache_size") == pragmas["cache_size"]
+    assert engine.pool.size() == profile["pool_size"]
+
+    engine.pool.dispose()
+    assert _pragma(engine, "busy_timeout") == pragmas["busy_timeout"]
+    engine.dispose()
+
+
+def test_memory_database_skips_wal():
+    profile = get_storage_profile("balanced")
+    engine = create_engine("sqlite://", future=True, **engine_options("sqlite://", profile))
+    apply_storage_profile(engine, profile)
+    assert _pragma(engine, "journal_mode") == "memory"
+    assert _pragma(engine, "foreign_keys") == 1
+
+
+def test_unknown_profile_rejected():
+    assert get_storage_profile(None) is STORAGE_PROFILES["balanced"]
+    with pytest.raises(ValueError):
+        get_storage_profile("turbo")
@@ -2,8 +2,15 @@ from __future__ import annotations
 
 from datetime import date
 
-from app.db.models import Account, MonthlyBalance, Transaction, User
-from app.services.summary import get_month_summary, get_year_summary
+from app.db.models import Account, Category, MonthlyBalance, Transaction, User
+from app.services.data_versions import bump_month_versions
+from app.services.monthly_totals import rebuild_monthly_totals
+from app.services.summary import (
+    get_month_summary,
+    get_year_category_matrix,
+    get_year_month_summaries,
+    get_year_summary,
+)
 
 
 def test_summary_logic(db):
@@ -21,6 +28,7 @@ def test_summary_logic(db):
         ]
     )
     db.add(MonthlyBalance(year=2026, month=2, account_id=account.id, opening_balance=50000, user_id=1))
+    rebuild_monthly_totals(db)
     db.commit()
 
     year_summary = get_year_summary(db, 2026)
@@ -34,3 +42,79 @@ def test_summary_logic(db):
     assert month_summary["adjust_total"] == 5000
     assert month_summary["opening_balance"] == 50000
     assert month_summary["net"] == 180000
+
+
+def test_year_month_summaries(db):
+    db.add(User(id=1, name="default"))
+    account = Account(name="現金", kind="cash", user_id=1)
+    db.add(account)
+    db.flush()
+    db.add_all(
+        [
+            Transaction(date=date(2026, 1, 5), year=2026, month=1, type="income", amount=250000, user_id=1),
+            Transaction(date=date(2026, 1, 6), year=2026, month=1, type="expense", amount=80000, user_id=1),
+            Transaction(date=date(2026, 3, 1), year=2026, month=3, type="adjust", amount=700, user_id=1),
+            Transaction(date=date(2025, 12, 1), year=2025, month=12, type="income", amount=1, user_id=1),
+        ]
+    )
+    db.add(MonthlyBalance(year=2026, month=3, account_id=account.id, opening_balance=40000, user_id=1))
+    rebuild_monthly_totals(db)
+    db.commit()
+
+    months = get_year_month_summaries(db, 2026)
+    assert [item["month"] for item in months] == list(range(1, 13))
+    assert months[0] == {
+        "month": 1,
+        "income_total": 250000,
+        "expense_total": 80000,
+        "net": 170000,
+        "opening_balance": 0,
+        "adjust_total": 0,
+    }
+    assert months[2]["adjust_total"] == 700
+    assert months[2]["opening_balance"] == 40000
+    assert months[11]["income_total"] == 0
+    assert get_month_summary(db, 2026, 3) == {key: value for key, value in months[2].items() if key != "month"}
+
+
+def test_year_category_matrix_is_columnar_and_cached(db):
+    db.add(User(id=1, name="default"))
+    food = Category(name="食費", user_id=1)
+    rent = Category(name="家賃", user_id=1)
+    db.add_all([food, rent])
+    db.flush()
+
+    def expense(month: int, amount: int, **extra) -> Transaction:
+        return Transaction(
+            date=date(2025, month, 1), year=2025, month=month, type="expense", amount=amount, user_id=1, **extra
+        )
+
+    db.add_all(
+        [
+            expense(1, 1000, category_id=food.id),
+            expense(1, 500, category_id=food.id, category_free="ランチ"),
+            expense(3, 80000, category_id=rent.id),
+            expense(3, 700, category_free="ランチ"),
+            expense(12, 300),
+            Transaction(date=date(2025, 2, 1), year=2025, month=2, type="income", amount=9999, user_id=1),
+        ]
+    )
+    db.commit()
+
+    matrix = get_year_category_matrix(db, 2025)
+    assert matrix["months"] == list(range(1, 13))
+    assert matrix["labels"] == ["家賃", "食費", "ランチ", "未分類"]
+    assert matrix["category_ids"] == [rent.id, food.id, None, None]
+    assert matrix["category_frees"] == [None, None, "ランチ", None]
+    assert matrix["values"][1][:3] == [1500, 0, 0]
+    assert matrix["values"][3][11] == 300
+    assert matrix["month_totals"][2] == 80700
+    assert matrix["column_totals"] == [80000, 1500, 700, 300]
+    assert get_year_category_matrix(db, 2025) is matrix
+
+    db.add(expense(2, 200, category_id=food.id))
+    bump_month_versions(db, [(2025, 2)])
+    db.commit()
+    refreshed = get_year_category_matrix(db, 2025)
+    assert refreshed is not matrix
+    assert refreshed["values"][1][1] == 200
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from app.api.routers import transactions as transactions_router
+from app.db.models import Account, Category, Transaction, User
+from app.services.account_balances import verify_account_balances
+from app.services.month_locks import set_month_lock
+from app.services.monthly_totals import verify_monthly_totals
+
+
+def _seed(web_db) -> tuple[int, int, int]:
+    web_db.add(User(id=1, name="default"))
+    web_db.flush()
+    cash = Account(name="現金", kind="cash", user_id=1)
+    bank = Account(name="銀行", kind="bank", user_id=1)
+    food = Category(name="食費", user_id=1)
+    web_db.add_all([cash, bank, food])
+    web_db.commit()
+    return cash.id, bank.id, food.id
+
+
+def test_batch_inserts_all_items_in_one_commit(client, web_db):
+    cash, bank, food = _seed(web_db)
+    items = [
+        {
+            "date": date(2025, 1 + i % 12, 1 + i % 28).isoformat(),
+            "type": "expense",
+            "amount": 100 + i,
+            "account_id": cash,
+            "category_id": food,
+        }
+        for i in range(1000)
+    ]
+    items.append({"date": "2025-06-30", "type": "transfer", "amount": 5000, "account_id": bank, "to_account_id": cash})
+
+    response = client.post("/api/transactions/batch", json=items)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 1001
+    assert web_db.get(Transaction, body["ids"][0]).amount == 100
+    assert web_db.get(Transaction, body["ids"][-1]).type == "transfer"
+    assert int(response.headers["X-Query-Count"]) <= 20
+    assert verify_monthly_totals(web_db) == []
+    assert verify_account_balances(web_db) == []
+
+
+def test_batch_reports_item_errors_and_inserts_nothing(client, web_db):
+    cash, bank, food = _seed(web_db)
+    set_month_lock(web_db, 2025, 2, True)
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    items = [
+        {"date": "2025-01-05", "type": "expense", "amount": 100, "account_id": cash},
+        {"date": "2025-01-05", "type": "expense", "amount": 0, "account_id": cash},
+        {"date": tomorrow, "type": "expense", "amount": 100, "account_id": cash},
+        {"date": "2025-02-05", "type": "expense", "amount": 100, "account_id": cash},
+        {"date": "2025-01-05", "type": "transfer", "amount": 100, "account_id": cash, "to_account_id": cash},
+        {"date": "2025-01-05", "type": "expense", "amount": 100, "account_id": 999},
+        {"date": "2025-01-05", "type": "expense", "amount": 100, "account_id": bank, "category_id": 999},
+        {"date": "2025-01-05", "type": "transfer", "amount": 100, "account_id": cash, "to_account_id": 999},
+        {"date": "2025-01-05", "type": "bonus", "amount": 100},
+    ]
+
+    response = client.post("/api/transactions/batch", json=items)
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["rejected"] == 8
+    assert [(error["index"], error["detail"]) for error in detail["errors"]] == [
+        (1, "amount: Input should be greater than 0"),
+        (2, "future date is not allowed"),
+        (3, "month is locked"),
+        (4, "account_id and to_account_id must be different"),
+        (5, "account not found"),
+        (6, "category not found"),
+        (7, "to_account not found"),
+        (8, "type: Input should be 'income', 'expense', 'transfer' or 'adjust'"),
+    ]
+    for error in detail["errors"][4:7]:
+        single = client.post("/api/transactions", json=items[error["index"]])
+        assert (single.status_code, single.json()["detail"]) == (404, error["detail"])
+    assert web_db.query(Transaction).count() == 0
+
+
+def test_batch_size_is_limited(client, web_db, monkeypatch):
+    _seed(web_db)
+    monkeypatch.setattr(transactions_router, "TRANSACTION_BATCH_LIMIT", 2)
+    item = {"date": "2025-01-05", "type": "income", "amount": 100}
+    assert client.post("/api/transactions/batch", json=[item] * 3).status_code == 413
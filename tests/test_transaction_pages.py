@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from app.db.models import Transaction, User
+from app.services.transactions import ValidationError, page_transactions
+
+
+def seed(db) -> list[int]:
+    db.add(User(id=1, name="default"))
+    start = date(2024, 11, 25)
+    txs = []
+    for offset in range(20):
+        tx_date = start + timedelta(days=offset // 2)
+        txs.append(
+            Transaction(
+                date=tx_date,
+                year=tx_date.year,
+                month=tx_date.month,
+                type="expense",
+                amount=100 + offset,
+                description=f"item {offset}",
+                user_id=1,
+            )
+        )
+    db.add_all(txs)
+    db.commit()
+    return [tx.id for tx in sorted(txs, key=lambda tx: (tx.date, tx.id), reverse=True)]
+
+
+def walk(db, **filters) -> list[int]:
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = page_transactions(cursor=cursor, limit=3, q=None, db=db, **filters)
+        seen.extend(tx.id for tx in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_cursor_walks_full_range_without_gaps(db):
+    expected = seed(db)
+    assert walk(db, year=None, month=None, date_from=None, date_to=None) == expected
+
+
+def test_cursor_is_stable_under_concurrent_inserts(db):
+    expected = seed(db)
+    first = page_transactions(
+        year=None, month=None, date_from=date(2024, 12, 1), date_to=None, cursor=None, limit=3, q=None, db=db
+    )
+    db.add(Transaction(date=date(2024, 12, 31), year=2024, month=12, type="income", amount=1, user_id=1))
+    db.commit()
+    second = page_transactions(
+        year=None,
+        month=None,
+        date_from=date(2024, 12, 1),
+        date_to=None,
+        cursor=first["next_cursor"],
+        limit=3,
+        q=None,
+        db=db,
+    )
+    in_range = [tx_id for tx_id in expected if db.get(Transaction, tx_id).date >= date(2024, 12, 1)]
+    assert [tx.id for tx in first["items"] + second["items"]] == in_range[:6]
+
+
+def test_cursor_rejects_garbage(db):
+    seed(db)
+    with pytest.raises(ValidationError):
+        page_transactions(
+            year=2024, month=None, date_from=None, date_to=None, cursor="not-a-cursor", limit=3, q=None, db=db
+        )